@@ -1,6 +1,6 @@
 import Ajv from 'ajv'
 import addFormats from 'ajv-formats'
-import { readFileSync, mkdirSync, writeFileSync, renameSync, existsSync } from 'node:fs'
+import { readFileSync, mkdirSync, writeFileSync, renameSync, existsSync, statSync } from 'node:fs'
 import { dirname, join, resolve } from 'node:path'
 import { fileURLToPath } from 'node:url'
 
@@ -50,9 +50,24 @@ export function resolveDiskPath(docId, payload) {
   return join(base, `${stem}.json`)
 }
 
+function hasSameBytes(targetPath, data) {
+  try {
+    if (statSync(targetPath).size !== data.length) return false
+    return readFileSync(targetPath).equals(data)
+  } catch (e) {
+    if (e.code === 'ENOENT') return false
+    throw e
+  }
+}
+
+// Returns false (and leaves the file, its mtime and inode alone) when the
+// target already holds exactly these bytes.
 export function atomicWriteJson(targetPath, payload) {
+  const data = Buffer.from(JSON.stringify(payload, null, 2) + '\n', 'utf8')
+  if (hasSameBytes(targetPath, data)) return false
   mkdirSync(dirname(targetPath), { recursive: true })
   const tmp = `${targetPath}.tmp`
-  writeFileSync(tmp, JSON.stringify(payload, null, 2) + '\n', 'utf8')
+  writeFileSync(tmp, data)
   renameSync(tmp, targetPath)
+  return true
 }
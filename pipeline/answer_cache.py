@@ -0,0 +1,141 @@
+"""Persistent cache of NotebookLM answers, keyed by notebook sources and question.
+
+The collectors resume per raw file: a section is asked again unless the
+entry's file already holds it. Renaming a file (a new ``snake_case`` slug)
+or re-listing a plant under another scientific name therefore re-asks all
+five questions, although NotebookLM already answered exactly those. This
+cache remembers every answer under the SHA-256 of (notebook, normalized
+question), whichever entry asked it, so those questions are answered
+without calling NotebookLM. The "notebook" part stands for a set of
+sources: a pool of equivalent notebooks shares one key (see
+``collect_engine.Collection.cache_args``).
+
+Each entry stores the answer with the time it was asked and last used.
+Answers older than the TTL are dropped, and ``refresh_before`` makes
+lookups treat older answers as missing so they are asked again and
+replaced. Beyond ``max_entries`` the least recently used answers are
+evicted on save. Like the other files under ``data/.build/`` it is only a
+cache: deleting it just means asking again.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+CACHE_VERSION = 1
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_TTL_DAYS = 180
+
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+
+def parse_duration(text):
+    """Seconds in ``text``: a number with an optional s/m/h/d/w unit (``"30d"``, ``"12h"``, ``"90"``)."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smhdw]?)\s*", text.lower())
+    if not match:
+        raise ValueError(f"invalid duration {text!r} (expected e.g. 90s, 30m, 12h, 7d, 2w)")
+    return float(match.group(1)) * _DURATION_UNITS[match.group(2) or "s"]
+
+
+def normalize_question(question):
+    """Case and whitespace do not change what NotebookLM is asked."""
+    return " ".join(question.split()).casefold()
+
+
+def key_for(notebook_args, question):
+    notebook = " ".join(notebook_args)
+    payload = json.dumps([notebook, normalize_question(question)], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AnswerCache:
+    """The cache file, shared by every collector thread and saved once per run."""
+
+    def __init__(self, path, max_entries=DEFAULT_MAX_ENTRIES, ttl_days=DEFAULT_TTL_DAYS, refresh_before=None,
+                 clock=time.time):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl_days * 86400
+        self.refresh_before = refresh_before
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.entries = self._load()
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.expired = self._expire()
+        self.evicted = 0
+
+    def _load(self):
+        try:
+            with open(self.path, "r") as fh:
+                data = json.load(fh)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return {}
+        return data.get("entries") or {}
+
+    def _expire(self):
+        if not self.ttl:
+            return 0
+        cutoff = self._clock() - self.ttl
+        expired = [key for key, entry in self.entries.items() if entry["asked_at"] < cutoff]
+        for key in expired:
+            del self.entries[key]
+        return len(expired)
+
+    def stale(self, notebook_args, question):
+        """Whether a cached answer exists for this question but was asked before ``refresh_before``."""
+        if self.refresh_before is None:
+            return False
+        with self._lock:
+            entry = self.entries.get(key_for(notebook_args, question))
+        return entry is not None and entry["asked_at"] < self.refresh_before
+
+    def get(self, notebook_args, question):
+        """The cached answer, or None when there is none (or it is due for a refresh)."""
+        key = key_for(notebook_args, question)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None or (self.refresh_before is not None and entry["asked_at"] < self.refresh_before):
+                self.misses += 1
+                return None
+            self.hits += 1
+            entry["used_at"] = self._clock()
+            return entry["answer"]
+
+    def put(self, notebook_args, question, answer):
+        now = self._clock()
+        with self._lock:
+            self.entries[key_for(notebook_args, question)] = {
+                "notebook": " ".join(notebook_args),
+                "question": question,
+                "answer": answer,
+                "asked_at": now,
+                "used_at": now,
+            }
+            self.stored += 1
+
+    def save(self):
+        with self._lock:
+            excess = len(self.entries) - self.max_entries
+            if excess > 0:
+                oldest = sorted(self.entries, key=lambda key: (self.entries[key]["used_at"], key))[:excess]
+                for key in oldest:
+                    del self.entries[key]
+                self.evicted += excess
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            with open(tmp, "w") as fh:
+                json.dump({"version": CACHE_VERSION, "entries": self.entries}, fh, ensure_ascii=False, sort_keys=True)
+                fh.write("\n")
+            os.replace(tmp, self.path)
+
+    def summary(self):
+        return (
+            f"Answer cache: {self.hits} hits, {self.misses} misses, {self.stored} stored; "
+            f"{len(self.entries)} entries, {self.expired} expired, {self.evicted} evicted"
+        )
@@ -0,0 +1,245 @@
+"""
+bench_process.py — Benchmark process_plants on synthetic corpora.
+
+For each size, a fresh child process generates a synthetic raw corpus
+(``synth_corpus.py``) in a temp directory, then runs
+``process_engine.process_file`` over every file with stage profiling on.
+Running each size in its own process keeps the peak-RSS figure honest.
+
+Reported per size: files/sec end to end, peak RSS, and mean time per
+stage. Results are compared with the stored baseline
+(``bench/process_plants.baseline.json``); ``--save-baseline`` rewrites it,
+so a regression shows up as a diff of that file in review, and ``--check``
+exits non-zero when throughput dropped by more than ``--tolerance``.
+
+``--stress`` instead feeds 1-5 MB adversarial answers (long citation
+runs, blank-line runs, repeated labels...) to the plant parser
+with the parse guards off, and exits non-zero unless parse time grows
+linearly with input size.
+
+Usage:
+    python3 pipeline/bench_process.py                      # 1k and 10k
+    python3 pipeline/bench_process.py --sizes 1000,10000,100000
+    python3 pipeline/bench_process.py --sizes 1000 --save-baseline
+    python3 pipeline/bench_process.py --stress
+"""
+import argparse
+import contextlib
+import glob
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import profiling
+import synth_corpus
+from paths import PROCESS_PLANTS_BENCH_BASELINE
+
+BASELINE_VERSION = 1
+DEFAULT_SIZES = (1000, 10000)
+
+STRESS_MB = (1, 2, 5)
+# Allowed growth of seconds-per-MB from the smallest to the largest input;
+# a quadratic pattern would grow 5x here
+STRESS_MAX_GROWTH = 2.0
+
+# Adversarial answers of roughly ``n`` chars, each aimed at a pattern that
+# used to backtrack (or could) on a long run of the same characters
+STRESS_SHAPES = {
+    "citation_digits": lambda n: "Name" + "1," * (n // 2) + "x.",
+    "newline_run": lambda n: "Sources" + "\n" * n + "x",
+    "blank_line_run": lambda n: "Source x" + "\n \t" * (n // 3) + "x",
+    "numbered_items": lambda n: "".join(f"\n{i}. Name of the compound: A\n" for i in range(n // 30)),
+    "repeated_labels": lambda n: "Symptom name: " * (n // 14),
+    "non_word_run": lambda n: "a" + "!" * n + "a",
+    "family_phrases": lambda n: "belongs to the " * (n // 15),
+}
+
+
+def run_size(count, seed):
+    """Generate ``count`` files and time process_file over them (runs in the child)."""
+    import process_engine
+
+    category = process_engine.load_category("plant")
+    with tempfile.TemporaryDirectory(prefix="bench_plants_") as tmp:
+        raw_dir = os.path.join(tmp, "raw")
+        gen_start = time.perf_counter()
+        synth_corpus.generate(raw_dir, count, seed)
+        gen_seconds = time.perf_counter() - gen_start
+
+        category.input_dir = raw_dir
+        category.output_dir = os.path.join(tmp, "processed")
+        files = sorted(glob.glob(os.path.join(raw_dir, "*.json")))
+
+        profiling.enable()
+        passed = 0
+        start = time.perf_counter()
+        with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+            for f in files:
+                if process_engine.process_file(category, f):
+                    passed += 1
+        seconds = time.perf_counter() - start
+
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+    return {
+        "files": len(files),
+        "passed": passed,
+        "generate_seconds": round(gen_seconds, 3),
+        "seconds": round(seconds, 3),
+        "files_per_sec": round(len(files) / seconds, 1) if seconds else 0.0,
+        "peak_rss_mb": round(rss_mb, 1),
+        "stages": {
+            name: {"calls": calls, "mean_ms": round(total * 1000 / calls, 4)}
+            for name, (calls, total) in sorted(profiling.snapshot().items())
+        },
+    }
+
+
+def stress():
+    """Time parse_raw on each adversarial shape; return the shapes that grew super-linearly."""
+    import process_engine
+
+    failures = []
+    for shape, make in STRESS_SHAPES.items():
+        per_mb = []
+        for mb in STRESS_MB:
+            text = make(mb * 1024 * 1024)
+            data = {
+                "plant": {"common_name": "Stress", "scientific_name": "Stress testii"},
+                "raw_responses": {section: text for section in synth_corpus.SECTIONS},
+            }
+            start = time.perf_counter()
+            process_engine.parse_raw("plant", data)
+            per_mb.append((time.perf_counter() - start) / mb)
+        growth = per_mb[-1] / per_mb[0] if per_mb[0] else 0.0
+        timings = "  ".join(f"{mb} MB {seconds * mb:6.2f}s" for mb, seconds in zip(STRESS_MB, per_mb))
+        flag = "❌" if growth > STRESS_MAX_GROWTH else "✅"
+        print(f"{flag} {shape:<16} {timings}  (s/MB x{growth:.2f})")
+        if growth > STRESS_MAX_GROWTH:
+            failures.append(shape)
+    return failures
+
+
+def measure(count, seed):
+    """Run one size in a fresh interpreter and return its result dict."""
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", str(count), "--seed", str(seed)]
+    out = subprocess.run(cmd, check=True, capture_output=True, text=True)
+    return json.loads(out.stdout)
+
+
+def load_baseline(path):
+    try:
+        with open(path, "r") as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        return None
+    if baseline.get("version") != BASELINE_VERSION:
+        return None
+    return baseline
+
+
+def save_baseline(path, results, seed):
+    """Record ``results``; sizes not measured this run keep their old entries."""
+    previous = load_baseline(path)
+    sizes = dict(previous["sizes"]) if previous and previous.get("seed") == seed else {}
+    sizes.update((str(count), result) for count, result in results.items())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "version": BASELINE_VERSION,
+        "seed": seed,
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+        "sizes": sizes,
+    }
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def _change(now, before):
+    if not before:
+        return ""
+    return f" ({100.0 * (now - before) / before:+.1f}%)"
+
+
+def report(results, baseline, tolerance):
+    """Print the results next to the baseline; return the sizes that regressed."""
+    regressed = []
+    base_sizes = (baseline or {}).get("sizes", {})
+    for count, result in results.items():
+        base = base_sizes.get(str(count))
+        print(f"\n📊 {count} files")
+        fps = result["files_per_sec"]
+        print(f"  throughput: {fps:.1f} files/sec{_change(fps, base and base['files_per_sec'])}")
+        rss = result["peak_rss_mb"]
+        print(f"  peak RSS:   {rss:.1f} MB{_change(rss, base and base['peak_rss_mb'])}")
+        print(f"  total:      {result['seconds']:.2f}s ({result['passed']}/{result['files']} passed validation)")
+        base_stages = (base or {}).get("stages", {})
+        width = max((len(name) for name in result["stages"]), default=5)
+        for name, stage in sorted(result["stages"].items(), key=lambda item: -item[1]["mean_ms"]):
+            prev = base_stages.get(name, {}).get("mean_ms")
+            print(f"    {name:<{width}}  {stage['mean_ms']:>8.3f} ms{_change(stage['mean_ms'], prev)}")
+        if base and fps < base["files_per_sec"] * (1 - tolerance):
+            regressed.append(count)
+    return regressed
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark process_plants on synthetic corpora.")
+    parser.add_argument("--sizes", default=",".join(str(n) for n in DEFAULT_SIZES),
+                        help="Comma-separated corpus sizes (default: 1000,10000)")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed (default: 0)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help=f"Write results to {PROCESS_PLANTS_BENCH_BASELINE.name}")
+    parser.add_argument("--check", action="store_true",
+                        help="Exit non-zero if throughput regressed beyond --tolerance")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed throughput drop for --check (default: 0.25)")
+    parser.add_argument("--stress", action="store_true",
+                        help="Check that parse time grows linearly on 1-5 MB adversarial answers")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.child is not None:
+        print(json.dumps(run_size(args.child, args.seed)))
+        return
+    if args.stress:
+        failures = stress()
+        if failures:
+            print(f"\n❌ Parse time grew faster than linearly for: {', '.join(failures)}")
+            sys.exit(1)
+        return
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    results = {}
+    for count in sizes:
+        print(f"⏱️  Benchmarking {count} synthetic files...")
+        results[count] = measure(count, args.seed)
+
+    baseline = load_baseline(PROCESS_PLANTS_BENCH_BASELINE)
+    if baseline is not None and baseline.get("seed") != args.seed:
+        print(f"⚠️  Baseline was recorded with --seed {baseline.get('seed')}; comparison is approximate")
+    regressed = report(results, baseline, args.tolerance)
+
+    if args.save_baseline:
+        save_baseline(PROCESS_PLANTS_BENCH_BASELINE, results, args.seed)
+        print(f"\n✅ Baseline written to {PROCESS_PLANTS_BENCH_BASELINE}")
+    if regressed:
+        print(f"\n❌ Throughput regressed beyond {args.tolerance:.0%} at: {', '.join(map(str, regressed))}")
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
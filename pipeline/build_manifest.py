@@ -0,0 +1,123 @@
+"""Content-hash build manifest for the raw → processed stage.
+
+A manifest remembers, per input file, the SHA-256 of the raw JSON, the
+fingerprint of the parser that produced the output, the SHA-256 of the
+output file, and the validation outcome. A re-run only rebuilds inputs whose
+recorded state no longer matches; everything else is skipped.
+
+Manifests live under ``data/.build/`` and are a local cache — deleting one
+just forces a full rebuild.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+MANIFEST_VERSION = 1
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_file(path) -> Optional[str]:
+    try:
+        with open(path, "rb") as fh:
+            return sha256_bytes(fh.read())
+    except FileNotFoundError:
+        return None
+
+
+def sha256_json(payload: Any) -> str:
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return sha256_bytes(raw.encode("utf-8"))
+
+
+def fingerprint(sources: Iterable[Path], rules: Dict[str, Any], extra_files: Iterable[Path] = ()) -> Dict[str, str]:
+    """Fingerprint a parser by its source files, rule tables and any data files it reads."""
+    code = hashlib.sha256()
+    for path in sources:
+        code.update(Path(path).read_bytes())
+    extra = hashlib.sha256()
+    for path in extra_files:
+        extra.update((sha256_file(path) or "missing").encode("ascii"))
+    return {
+        "code": code.hexdigest(),
+        "rules": sha256_json(rules),
+        "data": extra.hexdigest(),
+    }
+
+
+def load_manifest(path: Path) -> Dict[str, Any]:
+    """Load a manifest; unreadable or foreign-version manifests start empty."""
+    try:
+        with open(path, "r") as fh:
+            manifest = json.load(fh)
+    except (FileNotFoundError, json.JSONDecodeError):
+        manifest = None
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        manifest = {"version": MANIFEST_VERSION, "files": {}}
+    return manifest
+
+
+def save_manifest(path: Path, manifest: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "w") as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+        fh.write("\n")
+    os.replace(tmp, path)
+
+
+def rebuild_reason(
+    manifest: Dict[str, Any],
+    name: str,
+    input_sha: str,
+    fp: Dict[str, str],
+    output_path,
+) -> Optional[str]:
+    """Return why ``name`` must be rebuilt, or None when its output is current."""
+    entry = manifest["files"].get(name)
+    if entry is None:
+        return "new input"
+    if entry.get("input_sha256") != input_sha:
+        return "input changed"
+    previous = entry.get("fingerprint") or {}
+    changed = [part for part, digest in fp.items() if previous.get(part) != digest]
+    if changed:
+        return f"parser changed ({', '.join(changed)})"
+    output_sha = sha256_file(output_path)
+    if output_sha is None:
+        return "output missing"
+    if output_sha != entry.get("output_sha256"):
+        return "output modified"
+    return None
+
+
+def record(
+    manifest: Dict[str, Any],
+    name: str,
+    input_sha: str,
+    fp: Dict[str, str],
+    output_path,
+    ok: bool,
+    warnings: Iterable[str],
+) -> None:
+    manifest["files"][name] = {
+        "input_sha256": input_sha,
+        "fingerprint": fp,
+        "output_sha256": sha256_file(output_path),
+        "ok": ok,
+        "warnings": list(warnings),
+    }
+
+
+def prune(manifest: Dict[str, Any], names: Iterable[str]) -> None:
+    """Drop entries for inputs that no longer exist."""
+    keep = set(names)
+    for name in list(manifest["files"]):
+        if name not in keep:
+            del manifest["files"][name]
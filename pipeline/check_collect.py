@@ -0,0 +1,236 @@
+"""
+check_collect.py — Offline checks of the collector and its NotebookLM workers, against stub backends.
+
+Nothing here talks to NotebookLM or touches ``data/`` (apart from the
+worker log under ``data/.build/``). Collections go to a temporary
+directory, through an in-process stub that takes a fixed time per question.
+
+* ``pool-scaling``: with a pool of N notebooks of equal latency, a
+  collection takes about 1/N of the wall-clock time of a single notebook.
+* ``task-crash``: a question whose bookkeeping raises fails the run loudly,
+  and its entry's other answers still reach the raw file.
+* ``journal-kept``: when an entry's raw file cannot be written (an I/O
+  error, or any other exception), the journal survives the run and the
+  next run replays it.
+* ``worker-respawn``: a stub worker that died between questions and fails
+  its first respawn is started once more, and the question is answered.
+
+Usage:
+    python3 pipeline/check_collect.py
+    python3 pipeline/check_collect.py --latency 0.2 --entries 12
+"""
+import argparse
+import contextlib
+import copy
+import os
+import sys
+import tempfile
+import time
+
+import batch_collect
+import collect_engine
+import notebooklm_worker
+
+# A pool of N notebooks must be at least this share of N times as fast as one
+SCALING_EFFICIENCY = 0.75
+
+
+def slow_stub(latency):
+    def ask(question, notebook_args, info=None):
+        time.sleep(latency)
+        return f"Stub answer from {notebook_args[-1]}: " + "x" * collect_engine.MIN_RESPONSE_LENGTH
+    return ask
+
+
+def entries(count):
+    return [
+        (number, {"common_name": f"Check plant {number}", "scientific_name": f"Checkus number{number}"})
+        for number in range(1, count + 1)
+    ]
+
+
+def scratch_collection(tmp, name):
+    collection = copy.copy(batch_collect.COLLECTION)
+    collection.output_dir = os.path.join(tmp, name)
+    collection.journal = os.path.join(tmp, name, "journal.jsonl")
+    return collection
+
+
+def timed_collect(tmp, name, notebooks, args):
+    collection = scratch_collection(tmp, name)
+    pool = [collect_engine.Notebook(["--notebook-id", f"nb{i}"], concurrency=args.concurrency) for i in range(notebooks)]
+    started = time.monotonic()
+    collect_engine.collect(collection, entries(args.entries), ask=slow_stub(args.latency), notebooks=pool)
+    return time.monotonic() - started
+
+
+def check_pool_scaling(tmp, args):
+    """(notes, failures) for pools of 2 and 4 notebooks against one."""
+    notes, failures = [], []
+    single = timed_collect(tmp, "pool1", 1, args)
+    for size in (2, 4):
+        elapsed = timed_collect(tmp, f"pool{size}", size, args)
+        speedup = single / elapsed
+        notes.append(f"{size} notebooks: {elapsed:.2f}s vs {single:.2f}s for one ({speedup:.1f}x)")
+        if speedup < SCALING_EFFICIENCY * size:
+            failures.append(f"{size} notebooks are only {speedup:.1f}x as fast as one")
+    return notes, failures
+
+
+class _FlakyState:
+    """A state store whose ``section_finished`` raises for one section of one file."""
+
+    def __init__(self, file, section):
+        self.file = file
+        self.section = section
+
+    def section_finished(self, category, file, section, *args):
+        if (file, section) == (self.file, self.section):
+            raise RuntimeError("state store unavailable")
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def check_task_crash(tmp, args):
+    """(notes, failures) for a run where one question's bookkeeping raises."""
+    collection = scratch_collection(tmp, "crash")
+    targets = entries(3)
+    broken = collection.filename(targets[1][1])
+    failures = []
+    try:
+        collect_engine.collect(collection, targets, ask=slow_stub(0), state=_FlakyState(broken, "toxins"))
+        failures.append("the run reported success")
+    except RuntimeError:
+        pass
+    for _number, entry in targets:
+        path = os.path.join(collection.output_dir, collection.filename(entry))
+        raw = collect_engine.load_raw_responses(path)
+        expected = set(collect_engine.SECTIONS) - ({"toxins"} if os.path.basename(path) == broken else set())
+        if set(raw) != expected:
+            failures.append(f"{os.path.basename(path)} holds {sorted(raw)}")
+    return [f"crash in {broken} (toxins)"], failures
+
+
+def check_journal_kept(tmp, args):
+    """(notes, failures) for runs that cannot write one raw file, each followed by a clean rerun."""
+    notes, failures = [], []
+    for error in (OSError, TypeError):
+        notes.append(f"{error.__name__} writing one raw file")
+        failures.extend(f"{error.__name__}: {line}" for line in _journal_kept(tmp, error))
+    return notes, failures
+
+
+def _journal_kept(tmp, error):
+    collection = scratch_collection(tmp, f"journal-{error.__name__}")
+    targets = entries(2)
+    broken = os.path.join(collection.output_dir, collection.filename(targets[0][1]))
+    write_raw = collect_engine.write_raw
+
+    def failing_write_raw(filepath, data):
+        if filepath == broken:
+            raise error("cannot write")
+        write_raw(filepath, data)
+
+    failures = []
+    collect_engine.write_raw = failing_write_raw
+    try:
+        collect_engine.collect(collection, targets, ask=slow_stub(0))
+    except RuntimeError:
+        pass
+    finally:
+        collect_engine.write_raw = write_raw
+    if not os.path.exists(collection.journal):
+        failures.append("the journal was cleared although an entry was not saved")
+    calls = []
+
+    def counting_stub(question, notebook_args, info=None):
+        calls.append(question)
+        return slow_stub(0)(question, notebook_args)
+
+    collect_engine.collect(collection, targets, ask=counting_stub)
+    if set(collect_engine.load_raw_responses(broken)) != set(collect_engine.SECTIONS):
+        failures.append("the rerun did not restore the unsaved entry from the journal")
+    if calls:
+        failures.append(f"the rerun asked {len(calls)} questions the journal already had")
+    if os.path.exists(collection.journal):
+        failures.append("the journal was kept after a clean run")
+    return failures
+
+
+class _FlakyRespawnWorker(notebooklm_worker.Worker):
+    """A stub worker whose first restart runs a command that exits before the health check."""
+
+    failing_restarts = 1
+
+    def start(self):
+        command = self.command
+        if self.restarts and self.failing_restarts:
+            self.failing_restarts -= 1
+            self.command = [sys.executable, "-c", "raise SystemExit(1)"]
+        try:
+            super().start()
+        finally:
+            self.command = command
+
+
+def check_worker_respawn(tmp, args):
+    """(notes, failures) for a question asked after the worker died, with one failed respawn."""
+    worker = _FlakyRespawnWorker(notebooklm_worker.worker_command("stub"), ping_timeout=30, ask_timeout=30)
+    failures = []
+    try:
+        worker.start()
+        if not worker.ask("First question?", ["--notebook-id", "stub"]):
+            failures.append("the first question got no answer")
+        # Dies between questions, so the next ask has to respawn it
+        worker._proc.kill()
+        worker._proc.wait()
+        try:
+            if not worker.ask("Second question?", ["--notebook-id", "stub"]):
+                failures.append("the question after the respawn got no answer")
+        except notebooklm_worker.WorkerError as exc:
+            failures.append(f"one failed respawn ended the question: {exc}")
+        if worker.failing_restarts:
+            failures.append("the failing respawn never ran")
+    finally:
+        worker.stop()
+    return [f"{worker.restarts} restarts"], failures
+
+
+CHECKS = {
+    "pool-scaling": check_pool_scaling,
+    "task-crash": check_task_crash,
+    "journal-kept": check_journal_kept,
+    "worker-respawn": check_worker_respawn,
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Offline checks of collect_engine against stub backends.")
+    parser.add_argument("--latency", type=float, default=0.1, help="Seconds per stub answer (default: 0.1)")
+    parser.add_argument("--entries", type=int, default=8, help="Entries per collection (default: 8)")
+    parser.add_argument("-c", "--concurrency", type=int, default=2, help="Workers per notebook (default: 2)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, check in CHECKS.items():
+            # The collector's own progress lines would drown the results
+            with open(os.devnull, "w") as quiet, contextlib.redirect_stdout(quiet), contextlib.redirect_stderr(quiet):
+                notes, failures = check(tmp, args)
+            print("\n".join(f"  {line}" for line in notes))
+            if failures:
+                failed = True
+                print(f"❌ {name}")
+                print("\n".join(f"  {line}" for line in failures))
+            else:
+                print(f"✅ {name}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
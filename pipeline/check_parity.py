@@ -0,0 +1,100 @@
+"""
+check_parity.py — Check that the processors still produce the recorded output.
+
+Every raw file in ``data/plants/`` and ``data/foods/`` is parsed in memory
+through ``process_engine.parse_raw`` and serialized exactly as
+``process_file`` writes it; the SHA-256 of each result is compared with
+``bench/process_outputs.golden.json`` (with ``PYTHONHASHSEED=0``, which
+the script sets for itself). A refactor that is meant to be
+behaviour-preserving should report no differences; an intended output
+change is recorded with ``--update`` so it shows up in review as a diff of
+the golden file.
+
+Usage:
+    python3 pipeline/check_parity.py            # exits non-zero on any difference
+    python3 pipeline/check_parity.py --update
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+
+import build_manifest
+import process_engine
+from paths import PROCESS_OUTPUTS_GOLDEN
+
+GOLDEN_VERSION = 1
+CATEGORIES = ("plant", "food")
+
+
+def digests(category_name):
+    """{raw file name: sha256 of the processed JSON} for one category."""
+    category = process_engine.load_category(category_name)
+    out = {}
+    for path in sorted(glob.glob(os.path.join(category.input_dir, "*.json"))):
+        with open(path, "r") as f:
+            data = json.load(f)
+        processed = process_engine.parse_raw(category, data)
+        out[os.path.basename(path)] = build_manifest.sha256_bytes(json.dumps(processed, indent=2).encode("utf-8"))
+    return out
+
+
+def compare(expected, actual):
+    """Lines describing every file whose digest is missing, new or different."""
+    lines = []
+    for name in sorted(expected.keys() | actual.keys()):
+        if name not in actual:
+            lines.append(f"  missing  {name}")
+        elif name not in expected:
+            lines.append(f"  new      {name}")
+        elif expected[name] != actual[name]:
+            lines.append(f"  changed  {name}")
+    return lines
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare processor output with the recorded golden digests.")
+    parser.add_argument("--update", action="store_true",
+                        help=f"Rewrite {PROCESS_OUTPUTS_GOLDEN.name} from the current output")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if os.environ.get("PYTHONHASHSEED") != "0":
+        # toxic_parts come out of a set, so their order follows the string
+        # hash seed; pin it or the digests change from run to run
+        os.execve(sys.executable, [sys.executable] + sys.argv, dict(os.environ, PYTHONHASHSEED="0"))
+    current = {name: digests(name) for name in CATEGORIES}
+
+    if args.update:
+        PROCESS_OUTPUTS_GOLDEN.parent.mkdir(parents=True, exist_ok=True)
+        tmp = PROCESS_OUTPUTS_GOLDEN.with_suffix(PROCESS_OUTPUTS_GOLDEN.suffix + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"version": GOLDEN_VERSION, "categories": current}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        os.replace(tmp, PROCESS_OUTPUTS_GOLDEN)
+        print(f"✅ Golden digests written to {PROCESS_OUTPUTS_GOLDEN}")
+        return
+
+    with open(PROCESS_OUTPUTS_GOLDEN, "r") as f:
+        golden = json.load(f)
+    if golden.get("version") != GOLDEN_VERSION:
+        sys.exit(f"{PROCESS_OUTPUTS_GOLDEN} has an unknown version; regenerate it with --update")
+
+    failed = False
+    for name in CATEGORIES:
+        diffs = compare(golden["categories"].get(name, {}), current[name])
+        if diffs:
+            failed = True
+            print(f"❌ {name}: {len(diffs)} of {len(current[name])} files differ")
+            print("\n".join(diffs))
+        else:
+            print(f"✅ {name}: {len(current[name])} files match")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+check_source_refs.py — Check the guarded source-reference stripping against the original passes.
+
+``source_refs.strip_source_refs`` skips passes that cannot match and uses
+linear-time rewrites of the slowest patterns. Both changes are meant to be
+invisible, so this script runs the plant and food rule lists next to the
+original ``re.sub`` chains (kept below, verbatim) on:
+
+* every string in the raw files under ``data/plants/`` and ``data/foods/``,
+  each of their lines, and each tail starting at a line break;
+* ``--samples`` strings stitched together from the fragments the passes
+  look for, including the characters ``re.IGNORECASE`` folds differently
+  from ``str.lower()`` ('İ', 'ı', 'ſ', the Kelvin sign).
+
+Run it after touching ``source_refs.py``; it exits non-zero on any difference.
+
+Usage:
+    python3 pipeline/check_source_refs.py
+    python3 pipeline/check_source_refs.py --samples 200000 --seed 7
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import re
+import sys
+
+import source_refs
+from paths import RAW_PLANTS_DIR, RAW_FOODS_DIR
+
+FRAGMENTS = [
+    "Sources:", "Source:", "SOURCES :", "source: ", "1,2,3", "1", "12", ",", ".", "...", " ", "  ", "\t",
+    "\n", "\r\n", "\n\n", "• ", "◦ ", "▪", "- ", "* ", "---", "-----",
+    "Would you like me to", "would you lİke me to", "WOULD YOU LIKE ME TO",
+    "The provided text does not contain", "the provıded text does not contain",
+    "Highest ", "Distribution", "Concentration", "ſource:", "İ", "ı", "K",
+    ")", "]", "text", "Leaves", "identified", "é", "٣",
+]
+
+
+def original_plant(text):
+    if not text:
+        return text
+    text = re.sub(r'[\n\r]\s*[•◦\u2022\u25e6\-\*\u25aa]?\s*Sources?\s*:\s*[\d,\s\.]+\s*$', '', text, flags=re.IGNORECASE)
+    text = re.sub(r'\s*Sources?\s*:\s*[\d,\s\.]+\s*$', '', text, flags=re.IGNORECASE)
+    text = re.sub(r'(?<=[a-zA-Z\)\]])[\d,]+\s*$', '', text)
+    text = re.sub(r'[\n\r]\s*[•◦\u2022\u25e6\u25aa\-\*]?\s*Sources?\s*:\s*[\d,\s\.]+', '', text, flags=re.IGNORECASE)
+    text = re.sub(r"Would you like me to.*", "", text, flags=re.IGNORECASE)
+    text = re.sub(r'[\n\r]\s*◦\s*(?:Highest |Distribution|Concentration).*$', '', text, flags=re.DOTALL)
+    text = re.sub(r'\n\s*-{3,}.*$', '', text, flags=re.DOTALL)
+    text = re.sub(r'[\d,]+\.+\s*$', '', text.rstrip())
+    text = re.sub(r'The provided text does not contain.*$', '', text, flags=re.IGNORECASE | re.DOTALL)
+    return text.strip()
+
+
+def original_food(text):
+    if not text:
+        return text
+    text = re.sub(r'[\n\r]\s*[•◦\-\*]?\s*Sources?\s*:\s*[\d,\s\.]+\s*$', '', text, flags=re.IGNORECASE)
+    text = re.sub(r'\s*Sources?\s*:\s*[\d,\s\.]+\s*$', '', text, flags=re.IGNORECASE)
+    text = re.sub(r'(?<=[a-zA-Z\)\]])[\d,]+\s*$', '', text)
+    text = re.sub(r"Would you like me to.*", "", text, flags=re.IGNORECASE)
+    text = re.sub(r'\n\s*-{3,}.*$', '', text, flags=re.DOTALL)
+    text = re.sub(r'[\n\r]\s*◦\s*(?:Highest |Distribution|Concentration).*$', '', text, flags=re.DOTALL)
+    text = re.sub(r'The provided text does not contain.*$', '', text, flags=re.IGNORECASE | re.DOTALL)
+    text = re.sub(r'[\d,]+\.+\s*$', '', text.rstrip())
+    return text.strip()
+
+
+CHECKS = (
+    ("plant", source_refs.PLANT_RULES, original_plant),
+    ("food", source_refs.FOOD_RULES, original_food),
+)
+
+
+def strings(value):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from strings(item)
+
+
+def corpus():
+    """Every raw string, its lines and its tails from each line break on."""
+    texts = set()
+    for directory in (RAW_PLANTS_DIR, RAW_FOODS_DIR):
+        for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+            with open(path, "r") as f:
+                data = json.load(f)
+            for text in strings(data):
+                texts.add(text)
+                texts.update(text.splitlines())
+                texts.update(text[match.start():] for match in re.finditer(r"[\n\r]", text))
+    return sorted(texts)
+
+
+def generated(samples, seed):
+    rng = random.Random(seed)
+    for _ in range(samples):
+        yield "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 12)))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare source_refs with the original stripping passes.")
+    parser.add_argument("--samples", type=int, default=20000, help="Generated strings to check (default: 20000)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the generated strings (default: 0)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    texts = corpus()
+    texts.extend(generated(args.samples, args.seed))
+    failed = False
+    for name, rules, original in CHECKS:
+        diffs = [text for text in texts if source_refs.strip_source_refs(text, rules) != original(text)]
+        if diffs:
+            failed = True
+            print(f"❌ {name}: {len(diffs)} of {len(texts)} strings differ")
+            for text in diffs[:10]:
+                print(f"  {text!r}")
+        else:
+            print(f"✅ {name}: {len(texts)} strings match")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,7 @@ Usage:
   python3 clean_plants.py --batch-size 5
   python3 clean_plants.py --status      # show progress only
   python3 clean_plants.py --retry-failed
+  python3 clean_plants.py --retries 2   # retry a failed or garbled API call, with backoff
 """
 
 import json
@@ -25,12 +26,14 @@ load_dotenv()
 
 from openai import OpenAI
 
+import rate_limiter
 from paths import PROCESSED_PLANTS_DIR, CLEANED_PLANTS_DIR, DATA_DIR
 
 PROCESSED_DIR = PROCESSED_PLANTS_DIR
 CLEANED_DIR = CLEANED_PLANTS_DIR
 PROGRESS_FILE = DATA_DIR / "clean_progress.json"
 DEFAULT_BATCH = 10
+DEFAULT_QPS = 0.2
 
 SYSTEM_PROMPT = """\
 You are a data cleaning assistant for a veterinary toxicology database.
@@ -106,9 +109,7 @@ def print_status(progress: dict):
             print(f"  {name}")
 
 
-def clean_batch(client: OpenAI, files: list[Path]) -> list[dict]:
-    records = [json.loads(f.read_text()) for f in files]
-
+def request_cleaning(client: OpenAI, records: list[dict]) -> list[dict]:
     response = client.chat.completions.create(
         model="gpt-4o",
         max_tokens=16000,
@@ -142,6 +143,15 @@ def clean_batch(client: OpenAI, files: list[Path]) -> list[dict]:
     return cleaned
 
 
+def clean_batch(client: OpenAI, files: list[Path], limiter: rate_limiter.RateLimiter | None = None,
+                retries: int = 0) -> list[dict]:
+    records = [json.loads(f.read_text()) for f in files]
+    if limiter is None:
+        return request_cleaning(client, records)
+    # A garbled answer (no array, wrong count) is retried like a failed call
+    return limiter.call(request_cleaning, client, records, retries=retries)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Clean processed plant JSON via OpenAI API")
     parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH,
@@ -150,6 +160,9 @@ def main():
                         help="Show progress and exit")
     parser.add_argument("--retry-failed", action="store_true",
                         help="Retry previously failed files")
+    parser.add_argument("--retries", type=int, default=0,
+                        help="Times to retry a failed API call, with backoff (default: 0)")
+    rate_limiter.add_arguments(parser, DEFAULT_QPS)
     args = parser.parse_args()
 
     CLEANED_DIR.mkdir(exist_ok=True)
@@ -178,9 +191,10 @@ def main():
     print()
 
     client = OpenAI()
+    limiter = rate_limiter.RateLimiter(args.qps, args.burst)
 
     try:
-        cleaned_records = clean_batch(client, batch)
+        cleaned_records = clean_batch(client, batch, limiter, args.retries)
     except Exception as e:
         print(f"ERROR during API call: {e}")
         for f in batch:
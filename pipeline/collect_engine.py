@@ -0,0 +1,754 @@
+"""Category-generic NotebookLM collector shared by the plant and food CLIs.
+
+``batch_collect.py`` and ``batch_collect_food.py`` each declare a
+``Collection``: the notebook to ask, the five questions for one entry, and
+where its raw files and journal live. ``collect`` does the rest.
+
+Every question is a blocking ``ask_question.py`` run that mostly waits on
+NotebookLM, so the questions of all target entries go through one thread
+pool of ``--concurrency`` workers. They are queued entry by entry, so
+earlier entries finish first and a concurrency of 1 asks in the old order.
+Answers are not written into the raw files one by one. Each is appended
+(and fsynced) to the collection's journal under ``data/.build/``, and an
+entry's raw file is rewritten once, atomically, when its last question is
+done. A run that crashes leaves the journal behind, and the next run
+replays it into the raw files before asking anything. The resume from the
+``raw_responses`` on disk then only asks what is still missing.
+
+Questions go to one long-lived ``notebooklm_worker`` per concurrency slot
+(``--backend worker``, the default). If the workers fail their health
+check the run falls back to one ``ask_question.py`` subprocess per
+question (``--backend subprocess``); ``--backend stub`` runs the workers
+on canned answers, for trying the collector offline.
+
+Every question first takes a token from a shared ``rate_limiter``
+(``--qps``, ``--burst``): failed questions back the whole pool off, and
+failed or too-short answers slow it down until NotebookLM recovers.
+
+Before anything is asked, the ``answer_cache`` is consulted: a question
+this notebook already answered for any entry (under another file name,
+say) is answered from it. ``--refresh-older-than`` re-asks cached answers
+older than that, including ones already in a raw file.
+
+``--combined`` asks all of an entry's missing questions in one delimited
+prompt instead (see ``combined_prompt``), falling back to single questions
+for sections that come back missing or too short.
+
+``--gaps`` re-collects the whole corpus's gaps in one run: it builds
+``verify_raw``'s work queue (``--queue FILE`` reads a saved one) and asks
+only the sections it lists, highest-priority entries first.
+
+Progress goes to the ``collection_state`` store instead of a completed
+log: each question's attempts, latency and last error, and each finished
+entry, which ``sync_status.py`` then ticks off in the status table. Every
+backend call is also logged to ``telemetry`` (``collect_report.py`` turns
+that into latency percentiles and throughput).
+
+A collection can be asked through a pool of equivalent notebooks (same
+sources; ``--notebook``, repeated). Each notebook gets its own executor of
+``--concurrency`` workers and its own rate limiter, and every worker takes
+the next question from one shared queue, so no notebook idles while
+another has a backlog. A question that fails on one notebook is retried on
+the next, while the failed notebook sits out a cooldown. Throughput then
+grows with the number of notebooks.
+"""
+import argparse
+import glob
+import json
+import os
+import queue
+import subprocess
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+import answer_cache
+import collection_state
+import combined_prompt
+import disk_writer
+import notebooklm_worker
+import rate_limiter
+import telemetry
+from notebooklm_worker import ANSWER_END_MARKER, SKILL_DIR
+from paths import COLLECT_TELEMETRY, COLLECTION_STATE, NOTEBOOKLM_ANSWER_CACHE
+import verify_raw
+from verify_raw import MIN_RESPONSE_LENGTH
+
+SECTIONS = ("basics", "toxic_parts", "toxins", "symptoms", "treatments")
+
+DEFAULT_CONCURRENCY = 1
+# The collectors used to sleep 2s after every entry; start no faster than that per question
+DEFAULT_QPS = 0.5
+# A notebook that failed is skipped for this long, doubling per consecutive failure
+FAILOVER_COOLDOWN = 60.0
+MAX_FAILOVER_COOLDOWN = 900.0
+BACKENDS = ("worker", "subprocess", "stub")
+
+
+class Collection:
+    """One kind of entry (plant, food) and everything the collector needs to interview NotebookLM.
+
+    ``name`` is also the entry's category in the state store.
+    ``notebook_args`` select the notebook on the ``ask_question.py`` command
+    line, and ``journal`` is where answers wait until their raw file is
+    written. ``sources`` names the notebook's set of sources for the answer
+    cache (see ``cache_args``); by default the notebook itself stands for
+    them.
+
+    ``questions(entry)`` maps each of ``SECTIONS`` to its question,
+    ``record(entry)`` is the ``{"plant": ...}`` header of a new raw file and
+    ``filename(entry)`` its name under ``output_dir``.
+    ``entry_from_record(plant)`` turns that header back into an entry, for
+    re-collecting from a work queue. ``label`` and ``emoji`` make up the
+    progress line.
+    """
+
+    def __init__(self, name, *, output_dir, journal, notebook_args, questions, record, filename,
+                 entry_from_record, label, emoji, sources=None):
+        self.name = name
+        self.output_dir = str(output_dir)
+        self.journal = str(journal)
+        self.notebook_args = list(notebook_args)
+        self.questions = questions
+        self.record = record
+        self.filename = filename
+        self.entry_from_record = entry_from_record
+        self.label = label
+        self.emoji = emoji
+        self.sources = sources
+
+    def cache_args(self, sources=None):
+        """The notebook identity answers are cached under.
+
+        Every notebook of a pool has the same sources, so they share one
+        cache key: the ``sources`` id when one is declared (or given with
+        ``--sources``), otherwise the collection's own ``notebook_args``,
+        which is what the cache has always been keyed by. It does not depend
+        on which notebooks are in the pool or which one answered.
+        """
+        sources = sources or self.sources
+        return ["--sources", sources] if sources else self.notebook_args
+
+
+def notebook_ref_args(ref):
+    """``ask_question.py`` arguments selecting the notebook ``ref`` (a URL or a library id)."""
+    if ref.startswith(("http://", "https://")):
+        return ["--notebook-url", ref]
+    return ["--notebook-id", ref]
+
+
+class Notebook:
+    """One notebook of a pool: how to select it, its rate limiter, concurrency slots and health."""
+
+    def __init__(self, args, limiter=None, concurrency=DEFAULT_CONCURRENCY):
+        self.args = list(args)
+        self.name = self.args[-1]
+        self.limiter = limiter
+        self.concurrency = concurrency
+        self.slots = threading.Semaphore(concurrency)
+        self.failures = 0
+        self.down_until = 0.0
+        self._lock = threading.Lock()
+
+    def healthy(self):
+        return time.monotonic() >= self.down_until
+
+    def succeeded(self):
+        with self._lock:
+            self.failures = 0
+            self.down_until = 0.0
+
+    def failed(self):
+        with self._lock:
+            self.failures += 1
+            cooldown = min(MAX_FAILOVER_COOLDOWN, FAILOVER_COOLDOWN * 2 ** (self.failures - 1))
+            self.down_until = time.monotonic() + cooldown
+
+
+def ask(question, notebook_args, info=None):
+    """Ask NotebookLM one question in a fresh ask_question.py; the answer text, or None if it failed.
+
+    ``info``, if given, receives the call's details for telemetry.
+    """
+    print(f"\n❓ Asking: {question[:60]}...")
+    cmd = ["python3", "scripts/run.py", "ask_question.py", "--question", question] + notebook_args
+    # Execute in the notebooklm skill directory
+    result = subprocess.run(cmd, cwd=SKILL_DIR, capture_output=True, text=True)
+    if info is not None:
+        info.update(backend="subprocess", retries=0, exit_code=result.returncode,
+                    marker_found=ANSWER_END_MARKER in result.stdout)
+
+    if result.returncode != 0:
+        if info is not None:
+            info["error"] = result.stderr.strip()[-500:]
+        # One print, so concurrent workers cannot interleave the two lines
+        print(f"❌ Error asking question:\n{result.stderr}")
+        return None
+
+    # The answer is followed by ask_question.py's follow-up prompt; cut it off
+    output = result.stdout
+    if ANSWER_END_MARKER in output:
+        output = output.split(ANSWER_END_MARKER)[0]
+    return output.strip()
+
+
+def load_raw_responses(filepath):
+    """The ``raw_responses`` already collected in ``filepath`` (empty if none or unreadable)."""
+    if not os.path.exists(filepath):
+        return {}
+    try:
+        with open(filepath, "r") as f:
+            existing = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Unreadable raw file {filepath} ({e}); asking its questions again")
+        return {}
+    if not isinstance(existing, dict):
+        return {}
+    return existing.get("raw_responses") or {}
+
+
+def write_raw(filepath, data):
+    """Atomically write one raw file, in the layout the collectors always used."""
+    disk_writer.write_text_if_changed(filepath, json.dumps(data, indent=2))
+
+
+class Journal:
+    """Append-only JSON-lines log of answers that are not yet in their raw files."""
+
+    def __init__(self, path):
+        self.path = path
+        self._fh = None
+        self._lock = threading.Lock()
+
+    def entries(self):
+        """Every complete line; a torn last line from a crash is skipped."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                lines = fh.readlines()
+        except FileNotFoundError:
+            return []
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+        return entries
+
+    def open(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._fh = open(self.path, "a", encoding="utf-8")
+
+    def append(self, filepath, record, section, answer):
+        line = json.dumps({"file": filepath, "record": record, "section": section, "answer": answer},
+                          ensure_ascii=False)
+        with self._lock:
+            self._fh.write(line + "\n")
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+
+    def close(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def replay_journal(journal):
+    """Write answers an interrupted run left in ``journal`` into their raw files; (answers, files)."""
+    pending = {}
+    entries = journal.entries()
+    for entry in entries:
+        data = pending.get(entry["file"])
+        if data is None:
+            data = pending[entry["file"]] = dict(entry["record"], raw_responses=load_raw_responses(entry["file"]))
+        data["raw_responses"][entry["section"]] = entry["answer"]
+    for filepath, data in pending.items():
+        write_raw(filepath, data)
+    journal.clear()
+    return len(entries), len(pending)
+
+
+class _Job:
+    """One entry being collected: its raw record, the questions still out, and the lock for its file.
+
+    A work queue names the entry's file and the ``sections`` to re-ask;
+    those are asked only if they are still missing or too short, and never
+    answered from the cache, which may hold the very answer that was short.
+    ``stale(question)`` tells whether the answer cache wants one re-asked.
+    """
+
+    def __init__(self, collection, number, entry, stale=None, filename=None, sections=None):
+        self.number = number
+        self.name = collection.record(entry)["plant"]["common_name"]
+        self.filepath = os.path.join(collection.output_dir, filename or collection.filename(entry))
+        self.file = os.path.basename(self.filepath)
+        # Queued entries are numbered by rank, not by their row in the list
+        self.listed = filename is None
+        self.data = dict(collection.record(entry), raw_responses=load_raw_responses(self.filepath))
+        raw = self.data["raw_responses"]
+        questions = collection.questions(entry)
+        if sections is None:
+            wanted = [s for s in SECTIONS if not raw.get(s)]
+        else:
+            gaps = verify_raw.missing_sections(raw)
+            wanted = [s for s in SECTIONS if s in sections and s in gaps]
+        self.uncached = set(wanted) if sections is not None else set()
+        self.missing = [
+            (s, questions[s]) for s in SECTIONS
+            if s in wanted or (stale is not None and stale(questions[s]))
+        ]
+        self.remaining = len(self.missing)
+        self.answered = 0
+        self.failed = False
+        self.finished = False
+        # Every answer it got is in its raw file, so its journal lines can go
+        self.saved = False
+        self.lock = threading.Lock()
+
+    def record(self):
+        return {key: value for key, value in self.data.items() if key != "raw_responses"}
+
+
+def _limited(ask, limiter):
+    """``ask`` paced by ``limiter``: no answer is a failure, a too-short one is noisy."""
+    def limited_ask(question, notebook_args, **kwargs):
+        limiter.acquire()
+        try:
+            answer = ask(question, notebook_args, **kwargs)
+        except Exception:
+            limiter.failure()
+            raise
+        if answer is None:
+            limiter.failure()
+        elif len(answer) < MIN_RESPONSE_LENGTH:
+            limiter.noisy()
+        else:
+            limiter.success()
+        return answer
+    return limited_ask
+
+
+def collect(collection, targets, concurrency=DEFAULT_CONCURRENCY, ask=ask, limiter=None, cache=None,
+            combined=False, state=None, telemetry=None, notebooks=None, sources=None):
+    """Ask every missing question of ``targets``, ``concurrency`` at a time.
+
+    ``targets`` are ``(number, entry)`` pairs, or ``(number, entry,
+    filename, sections)`` from a work queue (see ``queued_targets``).
+
+    ``ask(question, notebook_args)`` is the backend: the one-shot
+    subprocess by default, or a ``WorkerPool``'s ``ask``. With a
+    ``limiter`` every question goes through it; with a ``cache`` only the
+    questions it cannot answer do, and their answers are added to it. With
+    ``combined`` an entry missing several sections gets one combined prompt.
+    Progress is recorded in ``state``, a ``collection_state.StateStore``,
+    and every backend call in ``telemetry``, a ``telemetry.Telemetry``; the
+    backend then also gets an ``info`` dict to fill in.
+
+    ``notebooks`` is a pool of equivalent ``Notebook``s, each with its own
+    limiter and ``concurrency`` workers on a shared queue; by default it is the
+    collection's notebook, with ``limiter`` and ``concurrency``. Answers
+    are cached under ``collection.cache_args(sources)``, whichever notebook
+    gave them.
+    """
+    if notebooks is None:
+        notebooks = [Notebook(collection.notebook_args, limiter, concurrency)]
+    lanes = [(nb, _limited(ask, nb.limiter) if nb.limiter is not None else ask) for nb in notebooks]
+    cache_args = collection.cache_args(sources)
+    stale = (lambda question: cache.stale(cache_args, question)) if cache is not None else None
+    os.makedirs(collection.output_dir, exist_ok=True)
+    journal = Journal(collection.journal)
+    replayed, files = replay_journal(journal)
+    if replayed:
+        print(f"🩹 Replayed {replayed} journaled answers from an interrupted run into {files} raw files")
+    started = []
+    crashed = []
+    report = combined_prompt.LengthReport(SECTIONS) if combined else None
+    collected = set()
+    tasks = queue.Queue()
+    # The index in ``lanes`` of the notebook a worker thread belongs to
+    current = threading.local()
+
+    def finish(job):
+        job.finished = True
+        if job.answered:
+            try:
+                write_raw(job.filepath, job.data)
+            except OSError as e:
+                # Its answers stay in the journal for the next run to replay
+                print(f"❌ Failed saving #{job.number} to {job.filepath}: {e}")
+                return
+        job.saved = True
+        if job.failed:
+            return
+        print(f"✅ Saved to {job.filepath}")
+        track("entry_finished", job, job.number if job.listed else None, job.name)
+
+    def track(method, job, *args, **kwargs):
+        if state is not None:
+            getattr(state, method)(collection.name, job.file, *args, **kwargs)
+
+    def call(job, section, question, notebook, notebook_ask):
+        """One backend call, logged to ``telemetry``; ``section`` is a list for a combined prompt."""
+        with notebook.slots:
+            if telemetry is None:
+                return notebook_ask(question, notebook.args)
+            return logged_call(job, section, question, notebook, notebook_ask)
+
+    def logged_call(job, section, question, notebook, notebook_ask):
+        info = {}
+        start = time.time()
+        text = None
+        try:
+            text = notebook_ask(question, notebook.args, info=info)
+        except Exception as e:
+            info["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            end = time.time()
+            where = {"section": "combined", "sections": section} if isinstance(section, list) else {"section": section}
+            telemetry.record(
+                category=collection.name, entry=job.name, file=job.file, **where,
+                notebook=notebook.name, backend=info.get("backend"), start=round(start, 3), end=round(end, 3),
+                duration_ms=int((end - start) * 1000), ok=bool(text), answer_chars=len(text or ""),
+                retries=info.get("retries", 0), exit_code=info.get("exit_code"),
+                marker_found=info.get("marker_found"), error=info.get("error"),
+            )
+        return text
+
+    def failover_order(lane):
+        """The worker's own notebook first, then the others; notebooks cooling down only if all are."""
+        ordered = lanes[lane:] + lanes[:lane]
+        return [lane for lane in ordered if lane[0].healthy()] or ordered
+
+    def cached_answer(job, section, question):
+        if cache is None or section in job.uncached:
+            return None
+        cached = cache.get(cache_args, question)
+        if cached is None or len(cached) < MIN_RESPONSE_LENGTH:
+            return None
+        print(f"\n♻️ Cached answer: {question[:60]}...")
+        return cached
+
+    def remember(question, text):
+        if cache is not None and len(text) >= MIN_RESPONSE_LENGTH:
+            cache.put(cache_args, question, text)
+
+    def answer(job, section, question):
+        cached = cached_answer(job, section, question)
+        if cached is not None:
+            return cached
+        text = ask_pool(job, section, question)
+        if text:
+            remember(question, text)
+        return text
+
+    def ask_pool(job, section, question):
+        """``question`` through the worker's notebook, failing over to the others."""
+        error = None
+        for notebook, notebook_ask in failover_order(getattr(current, "lane", 0)):
+            try:
+                text = call(job, section, question, notebook, notebook_ask)
+            except Exception as e:
+                text, error = None, e
+            if text:
+                notebook.succeeded()
+                break
+            notebook.failed()
+            if len(lanes) > 1:
+                print(f"🔀 Notebook {notebook.name} failed for #{job.number}; trying the next one")
+        else:
+            if error is not None:
+                raise error
+            return None
+        return text
+
+    def store(job, section, text):
+        try:
+            journal.append(job.filepath, job.record(), section, text)
+            with job.lock:
+                job.data["raw_responses"][section] = text
+                job.answered += 1
+        except Exception as e:
+            print(f"❌ Failed processing #{job.number} ({section}): {e}")
+            job.failed = True
+
+    def section_done(job):
+        with job.lock:
+            job.remaining -= 1
+            done = job.remaining == 0
+        if done:
+            finish(job)
+
+    def ask_section(job, section, question):
+        track("section_started", job, section)
+        started = time.monotonic()
+        try:
+            text = answer(job, section, question)
+            error = None if text else "no answer"
+        except Exception as e:
+            print(f"❌ Failed processing #{job.number} ({section}): {e}")
+            job.failed = True
+            text, error = None, f"{type(e).__name__}: {e}"
+        track("section_finished", job, section, int((time.monotonic() - started) * 1000), error)
+        if text:
+            store(job, section, text)
+        section_done(job)
+
+    def ask_combined(job, questions):
+        # The combined reply is cached section by section, under each individual question
+        for section, question in list(questions.items()):
+            cached = cached_answer(job, section, question)
+            if cached is not None:
+                track("section_started", job, section)
+                track("section_finished", job, section, 0, None)
+                store(job, section, cached)
+                section_done(job)
+                del questions[section]
+        if len(questions) < 2:
+            for section, question in questions.items():
+                ask_section(job, section, question)
+            return
+        report.asked(len(questions))
+        for section in questions:
+            track("section_started", job, section)
+        started = time.monotonic()
+        try:
+            prompt = combined_prompt.build(questions)
+            parts = combined_prompt.split(ask_pool(job, list(questions), prompt) or "", questions)
+        except Exception as e:
+            print(f"❌ Combined prompt failed for #{job.number}: {e}; asking one question at a time")
+            parts = {}
+        latency_ms = int((time.monotonic() - started) * 1000)
+        fallbacks = []
+        for section, question in questions.items():
+            text = parts.get(section, "")
+            usable = len(text) >= MIN_RESPONSE_LENGTH
+            report.add(section, text, fallback=not usable)
+            track("section_finished", job, section, latency_ms,
+                  None if usable else f"combined reply: {len(text)} chars")
+            if usable:
+                remember(question, text)
+                store(job, section, text)
+                section_done(job)
+            else:
+                fallbacks.append((section, question))
+        # In this thread: the pool may already be shutting down to new submissions
+        for section, question in fallbacks:
+            ask_section(job, section, question)
+
+    def lane_worker(lane):
+        """Run queued questions on notebook ``lane`` until the end-of-queue marker."""
+        current.lane = lane
+        while True:
+            task = tasks.get()
+            if task is None:
+                return
+            fn, job, *args = task
+            try:
+                fn(job, *args)
+            except Exception as e:
+                # Never lose a task's error: the job is finalized after the run
+                print(f"❌ Collecting #{job.number} crashed: {type(e).__name__}: {e}")
+                traceback.print_exc()
+                job.failed = True
+                crashed.append(job)
+
+    journal.open()
+    executors = [ThreadPoolExecutor(max_workers=nb.concurrency) for nb in notebooks]
+    try:
+        workers = [
+            executor.submit(lane_worker, lane)
+            for lane, (executor, nb) in enumerate(zip(executors, notebooks))
+            for _ in range(nb.concurrency)
+        ]
+        try:
+            for number, entry, *gap in targets:
+                print(f"\n{collection.emoji} Processing #{number}: {collection.label(entry)}")
+                try:
+                    job = _Job(collection, number, entry, stale, *gap)
+                except Exception as e:
+                    print(f"❌ Failed processing #{number}: {e}")
+                    continue
+                collected.add(job.filepath)
+                if not job.missing:
+                    finish(job)
+                    continue
+                started.append(job)
+                if combined and len(job.missing) > 1:
+                    tasks.put((ask_combined, job, dict(job.missing)))
+                else:
+                    for section, question in job.missing:
+                        tasks.put((ask_section, job, section, question))
+        finally:
+            # Queued in order, so every worker drains the queue before it stops
+            for _ in workers:
+                tasks.put(None)
+        for worker in workers:
+            worker.result()
+        # A crashed task may have left its job short of its last section
+        for job in started:
+            if not job.finished:
+                finish(job)
+    finally:
+        for executor in executors:
+            executor.shutdown()
+        journal.close()
+    unsaved = [job for job in started if not job.saved]
+    if unsaved:
+        print(f"🩹 Keeping the journal for the next run: {len(unsaved)} entries were not saved")
+    else:
+        journal.clear()
+    if report is not None:
+        print(report.format(individual_lengths(collection.output_dir, exclude=collected)))
+    if crashed:
+        raise RuntimeError(f"{len(crashed)} collection tasks crashed (see above); "
+                           "their entries were saved as far as they got")
+
+
+def individual_lengths(output_dir, exclude=()):
+    """``{section: [answer lengths]}`` over the raw files in ``output_dir``, except ``exclude``."""
+    lengths = {section: [] for section in SECTIONS}
+    for filepath in sorted(glob.glob(os.path.join(output_dir, "*.json"))):
+        if filepath in exclude:
+            continue
+        for section, text in load_raw_responses(filepath).items():
+            if section in lengths and text:
+                lengths[section].append(len(text))
+    return lengths
+
+
+def listed_targets(entries, numbers):
+    """``(number, entry)`` targets for the 1-based rows ``numbers`` of ``entries``; all of them when empty."""
+    if not numbers:
+        return list(enumerate(entries, 1))
+    targets = []
+    for number in numbers:
+        if not 1 <= number <= len(entries):
+            print(f"⚠️ #{number} out of range (1-{len(entries)})")
+            continue
+        targets.append((number, entries[number - 1]))
+    return targets
+
+
+def queued_targets(collection, args):
+    """Targets for ``--gaps`` or ``--queue``, in queue (priority) order and numbered by rank."""
+    if args.gaps:
+        raw_dir, items = collection.output_dir, verify_raw.build_queue(collection.output_dir)
+        source = f"the gaps in {collection.output_dir}"
+    else:
+        raw_dir, items = verify_raw.load_queue(args.queue)
+        source = args.queue
+    if os.path.abspath(raw_dir) != os.path.abspath(collection.output_dir):
+        raise SystemExit(f"❌ {args.queue} lists files in {raw_dir}, not {collection.output_dir}")
+    if args.limit:
+        items = items[:args.limit]
+    sections = sum(len(item["missing"]) for item in items)
+    print(f"🎯 Re-collecting {sections} sections for {len(items)} {collection.name} entries from {source}")
+    return [
+        (rank, collection.entry_from_record(item["plant"]), item["file"], item["missing"])
+        for rank, item in enumerate(items, 1)
+    ]
+
+
+def open_workers(backend, size):
+    """A started WorkerPool for ``backend``, or None to ask through one subprocess per question."""
+    if backend == "subprocess":
+        return None
+    command = notebooklm_worker.worker_command("stub" if backend == "stub" else "skill")
+    pool = notebooklm_worker.WorkerPool(size, command)
+    try:
+        pool.start()
+    except notebooklm_worker.WorkerError as exc:
+        pool.close()
+        if backend == "stub":
+            raise
+        print(f"⚠️ NotebookLM worker unavailable ({exc}); asking through one subprocess per question")
+        return None
+    return pool
+
+
+def run(collection, targets, args):
+    """CLI entry point: collect ``targets`` with the backend, notebooks and concurrency from ``args``."""
+    refs = [notebook_ref_args(ref) for ref in args.notebook] if args.notebook else [collection.notebook_args]
+    notebooks = [
+        Notebook(selector, rate_limiter.RateLimiter(args.qps, args.burst), args.concurrency) for selector in refs
+    ]
+    pool = open_workers(args.backend, args.concurrency * len(notebooks))
+    state = collection_state.StateStore(COLLECTION_STATE)
+    calls = telemetry.Telemetry(COLLECT_TELEMETRY)
+    cache = None
+    if args.answer_cache_size:
+        refresh_before = time.time() - args.refresh_older_than if args.refresh_older_than is not None else None
+        cache = answer_cache.AnswerCache(
+            NOTEBOOKLM_ANSWER_CACHE, args.answer_cache_size, args.answer_cache_ttl, refresh_before
+        )
+    try:
+        collect(collection, targets, ask=pool.ask if pool is not None else ask, cache=cache,
+                combined=args.combined, state=state, telemetry=calls, notebooks=notebooks, sources=args.sources)
+    finally:
+        state.close()
+        calls.close()
+        if cache is not None:
+            cache.save()
+            print(f"♻️ {cache.summary()}")
+        for notebook in notebooks:
+            print(f"⏱️ {notebook.name + ': ' if len(notebooks) > 1 else ''}{notebook.limiter.summary()}")
+        if pool is not None:
+            pool.close()
+            if pool.restarts:
+                print(f"🔁 Restarted NotebookLM workers {pool.restarts} times")
+
+
+def parse_args(collection, argv=None, default_targets="every entry"):
+    parser = argparse.ArgumentParser(description=f"Collect raw NotebookLM answers for {collection.name} entries.")
+    parser.add_argument("numbers", nargs="*", type=int, metavar="N",
+                        help="Rows of the entry list to collect, numbered from 1 as in the status table "
+                             f"(default: {default_targets}; entries already complete are skipped)")
+    parser.add_argument("-c", "--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Questions in flight at once per notebook, across entries "
+                             f"(default: {DEFAULT_CONCURRENCY}, one at a time)")
+    parser.add_argument("--notebook", action="append", metavar="REF",
+                        help="Ask through this notebook (URL or library id) instead of the collection's own; "
+                             "repeat for a pool of notebooks with the same sources to spread questions across, "
+                             "each with its own --concurrency and --qps, failing over between them")
+    parser.add_argument("--sources", metavar="ID",
+                        help="Name of the notebooks' set of sources, which the answer cache is keyed by "
+                             "(default: the collection's own notebook); give a new one when --notebook "
+                             "points at notebooks with other sources")
+    parser.add_argument("--backend", choices=BACKENDS, default="worker",
+                        help="worker: one long-lived NotebookLM worker per concurrency slot (default); "
+                             "subprocess: one ask_question.py run per question; "
+                             "stub: workers with canned answers, for offline runs")
+    rate_limiter.add_arguments(parser, DEFAULT_QPS)
+    parser.add_argument("--answer-cache-size", type=int, default=answer_cache.DEFAULT_MAX_ENTRIES,
+                        help="Answers kept in data/.build/notebooklm_answers.json, least recently used "
+                             f"evicted first (default: {answer_cache.DEFAULT_MAX_ENTRIES}; 0 disables the cache)")
+    parser.add_argument("--answer-cache-ttl", type=float, default=answer_cache.DEFAULT_TTL_DAYS,
+                        help=f"Days a cached answer is kept (default: {answer_cache.DEFAULT_TTL_DAYS}; 0 keeps them forever)")
+    parser.add_argument("--refresh-older-than", type=answer_cache.parse_duration, metavar="AGE",
+                        help="Re-ask questions whose cached answer is older than AGE (e.g. 30d, 12h), "
+                             "even when the raw file already has it")
+    parser.add_argument("--combined", action="store_true",
+                        help="Ask an entry's missing questions in one delimited prompt; sections that come back "
+                             f"missing or under {MIN_RESPONSE_LENGTH} characters are asked one by one")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--gaps", action="store_true",
+                        help="Instead of the usual targets, re-ask every missing or too-short section in the raw "
+                             "files (verify_raw's work queue), highest priority first")
+    source.add_argument("--queue", metavar="FILE",
+                        help="Like --gaps, from a work queue written by verify_raw.py --queue")
+    parser.add_argument("--limit", type=int, default=0,
+                        help="With --gaps/--queue, only the N highest-priority entries (default: all)")
+    args = parser.parse_args(argv)
+    if args.numbers and (args.gaps or args.queue):
+        parser.error("entry numbers cannot be combined with --gaps or --queue")
+    if args.concurrency <= 0:
+        parser.error("--concurrency must be positive")
+    if args.qps <= 0 or args.burst < 1:
+        parser.error("--qps must be positive and --burst at least 1")
+    return args
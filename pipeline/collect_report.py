@@ -0,0 +1,161 @@
+"""
+collect_report.py — Summarize the collectors' NotebookLM call telemetry.
+
+Reads ``data/.build/collect_telemetry.jsonl`` (one line per backend call,
+see ``telemetry.py``) and prints:
+
+* per section: calls, failure rate, p50/p95/p99 latency, median answer
+  length and how many answers lacked the end marker;
+* throughput: answers per hour of wall-clock collection time;
+* per notebook, when a pool of notebooks was used (``--notebook``): calls,
+  failure rate, latency and answers/hour, to spot the one that fails;
+* per time window (``--window``, 1h by default): calls, answers/hour,
+  failure rate and p50/p95 latency, to spot a degrading backend.
+
+Use it to size ``--concurrency``/``--qps``: if p95 latency climbs with
+concurrency while answers/hour stays flat, the backend is the bottleneck.
+
+Usage:
+    python3 pipeline/collect_report.py
+    python3 pipeline/collect_report.py --category food --since 7d --window 6h
+"""
+import argparse
+import math
+import statistics
+import sys
+import time
+from datetime import datetime
+
+import telemetry
+from answer_cache import parse_duration
+from paths import COLLECT_TELEMETRY
+
+
+def percentile(values, p):
+    """Nearest-rank ``p``-th percentile of ``values`` (None when empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def seconds(ms):
+    return "-" if ms is None else f"{ms / 1000:.1f}s"
+
+
+def busy_hours(records):
+    """Hours during which at least one call was in flight (idle gaps between runs excluded)."""
+    busy = 0.0
+    current_start = current_end = None
+    for record in sorted(records, key=lambda r: r["start"]):
+        if current_end is None or record["start"] > current_end:
+            if current_end is not None:
+                busy += current_end - current_start
+            current_start, current_end = record["start"], record["end"]
+        else:
+            current_end = max(current_end, record["end"])
+    if current_end is not None:
+        busy += current_end - current_start
+    return busy / 3600
+
+
+def answers_per_hour(records):
+    hours = busy_hours(records)
+    answers = sum(1 for r in records if r["ok"])
+    return answers / hours if hours else 0.0
+
+
+def section_table(records):
+    lines = [f"  {'section':<12} {'calls':>6} {'failed':>7} {'p50':>7} {'p95':>7} {'p99':>7} {'chars':>6} {'no marker':>10}"]
+    by_section = {}
+    for record in records:
+        by_section.setdefault(record["section"], []).append(record)
+    for section, rows in sorted(by_section.items()):
+        durations = [r["duration_ms"] for r in rows]
+        failed = sum(1 for r in rows if not r["ok"])
+        chars = [r["answer_chars"] for r in rows if r["ok"]]
+        no_marker = sum(1 for r in rows if r["ok"] and r.get("marker_found") is False)
+        lines.append(
+            f"  {section:<12} {len(rows):>6} {100 * failed / len(rows):>6.0f}% "
+            f"{seconds(percentile(durations, 50)):>7} {seconds(percentile(durations, 95)):>7} "
+            f"{seconds(percentile(durations, 99)):>7} "
+            f"{(f'{statistics.median(chars):.0f}' if chars else '-'):>6} {no_marker:>10}"
+        )
+    return lines
+
+
+def notebook_table(records):
+    lines = [f"  {'notebook':<40} {'calls':>6} {'failed':>7} {'p50':>7} {'p95':>7} {'answers/h':>10}"]
+    by_notebook = {}
+    for record in records:
+        by_notebook.setdefault(record.get("notebook") or "-", []).append(record)
+    for notebook, rows in sorted(by_notebook.items()):
+        durations = [r["duration_ms"] for r in rows]
+        failed = sum(1 for r in rows if not r["ok"])
+        lines.append(
+            f"  {notebook[-40:]:<40} {len(rows):>6} {100 * failed / len(rows):>6.0f}% "
+            f"{seconds(percentile(durations, 50)):>7} {seconds(percentile(durations, 95)):>7} "
+            f"{answers_per_hour(rows):>10.1f}"
+        )
+    return lines
+
+
+def window_table(records, window):
+    lines = [f"  {'window start':<16} {'calls':>6} {'answers/h':>10} {'failed':>7} {'p50':>7} {'p95':>7} {'retries':>8}"]
+    windows = {}
+    for record in records:
+        windows.setdefault(int(record["start"] // window), []).append(record)
+    for slot, rows in sorted(windows.items()):
+        durations = [r["duration_ms"] for r in rows]
+        failed = sum(1 for r in rows if not r["ok"])
+        started = datetime.fromtimestamp(slot * window).strftime("%Y-%m-%d %H:%M")
+        lines.append(
+            f"  {started:<16} {len(rows):>6} {answers_per_hour(rows):>10.1f} {100 * failed / len(rows):>6.0f}% "
+            f"{seconds(percentile(durations, 50)):>7} {seconds(percentile(durations, 95)):>7} "
+            f"{sum(r.get('retries') or 0 for r in rows):>8}"
+        )
+    return lines
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Latency and throughput report for NotebookLM collection calls.")
+    parser.add_argument("--telemetry", default=str(COLLECT_TELEMETRY), help="Telemetry file to read")
+    parser.add_argument("--category", choices=("plant", "food"), help="Only this collection")
+    parser.add_argument("--backend", help="Only calls through this backend (worker, subprocess)")
+    parser.add_argument("--since", type=parse_duration, metavar="AGE", help="Only calls started within AGE (e.g. 24h, 7d)")
+    parser.add_argument("--window", type=parse_duration, default=3600.0, metavar="SPAN",
+                        help="Width of the time windows (default: 1h)")
+    args = parser.parse_args()
+    if args.window <= 0:
+        parser.error("--window must be positive")
+    return args
+
+
+def main():
+    args = parse_args()
+    records = telemetry.load(args.telemetry)
+    if args.category:
+        records = [r for r in records if r["category"] == args.category]
+    if args.backend:
+        records = [r for r in records if r.get("backend") == args.backend]
+    if args.since is not None:
+        cutoff = time.time() - args.since
+        records = [r for r in records if r["start"] >= cutoff]
+    if not records:
+        print(f"No calls recorded in {args.telemetry} for these filters.")
+        sys.exit(1)
+
+    answers = sum(1 for r in records if r["ok"])
+    print(f"📊 {len(records)} NotebookLM calls, {answers} answers, {len(records) - answers} failed")
+    print(f"   {answers_per_hour(records):.1f} answers/hour over {busy_hours(records):.2f} busy hours\n")
+    print("Per section:")
+    print("\n".join(section_table(records)))
+    if len({r.get("notebook") for r in records}) > 1:
+        print("\nPer notebook:")
+        print("\n".join(notebook_table(records)))
+    print(f"\nPer {args.window / 3600:g}h window:")
+    print("\n".join(window_table(records, args.window)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""SQLite store of collection progress, per entry and per section.
+
+Collection progress used to live in three places: the append-only
+``completed_log*.txt``, the ``collection_status*.md`` tables that
+``sync_status.py`` rebuilt by listing the raw directory and re-splitting
+every row, and the raw files themselves. This store replaces the log and
+feeds the tables. The collectors record every question they ask (status,
+attempts, last error, latency) and every entry they finish. The status
+scripts then patch only the rows of entries that changed since their last
+render.
+
+Entries are keyed by (category, raw file name). ``number`` is the row in
+the category's list when the collector knows it. Every change to an entry
+takes the next ``seq``, and ``renders`` remembers the last ``seq`` each
+category's status table shows. Like the other files under ``data/.build/``
+it can be rebuilt: ``sync_status.py --rebuild`` re-seeds it from the raw
+files.
+"""
+import sqlite3
+import threading
+import time
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    category TEXT NOT NULL,
+    file TEXT NOT NULL,
+    number INTEGER,
+    name TEXT,
+    done INTEGER NOT NULL DEFAULT 0,
+    seq INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (category, file)
+);
+CREATE INDEX IF NOT EXISTS entries_by_seq ON entries (category, seq);
+CREATE TABLE IF NOT EXISTS sections (
+    category TEXT NOT NULL,
+    file TEXT NOT NULL,
+    section TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    latency_ms INTEGER,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (category, file, section)
+);
+CREATE TABLE IF NOT EXISTS renders (
+    category TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL
+);
+"""
+
+
+class StateStore:
+    """One connection to the state database, safe to share between collector threads."""
+
+    def __init__(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._db:
+            if self._db.execute("PRAGMA user_version").fetchone()[0] not in (0, SCHEMA_VERSION):
+                raise RuntimeError(f"{path}: unsupported state schema; delete it and run sync_status.py --rebuild")
+            self._db.execute("PRAGMA journal_mode = WAL")
+            self._db.executescript(_SCHEMA)
+            self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        self._db.close()
+
+    def _touch_entry(self, category, file, number=None, name=None, done=None):
+        # Called with the lock held, inside a transaction
+        seq = self._db.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM entries WHERE category = ?",
+                               (category,)).fetchone()[0]
+        self._db.execute(
+            """INSERT INTO entries (category, file, number, name, done, seq, updated_at)
+               VALUES (?, ?, ?, ?, COALESCE(?, 0), ?, ?)
+               ON CONFLICT (category, file) DO UPDATE SET
+                   number = COALESCE(excluded.number, number),
+                   name = COALESCE(excluded.name, name),
+                   done = COALESCE(?, done),
+                   seq = excluded.seq,
+                   updated_at = excluded.updated_at""",
+            (category, file, number, name, done, seq, time.time(), done),
+        )
+
+    def section_started(self, category, file, section):
+        with self._lock, self._db:
+            self._db.execute(
+                """INSERT INTO sections (category, file, section, status, attempts, updated_at)
+                   VALUES (?, ?, ?, 'asking', 1, ?)
+                   ON CONFLICT (category, file, section) DO UPDATE SET
+                       status = 'asking', attempts = attempts + 1, updated_at = excluded.updated_at""",
+                (category, file, section, time.time()),
+            )
+
+    def section_finished(self, category, file, section, latency_ms=None, error=None):
+        """Record an answer (``error`` None) or a failure for one section."""
+        with self._lock, self._db:
+            self._db.execute(
+                """INSERT INTO sections (category, file, section, status, last_error, latency_ms, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (category, file, section) DO UPDATE SET
+                       status = excluded.status,
+                       last_error = COALESCE(excluded.last_error, last_error),
+                       latency_ms = COALESCE(excluded.latency_ms, latency_ms),
+                       updated_at = excluded.updated_at""",
+                (category, file, section, "failed" if error else "done", error, latency_ms, time.time()),
+            )
+
+    def entry_finished(self, category, file, number=None, name=None):
+        with self._lock, self._db:
+            self._touch_entry(category, file, number, name, done=1)
+
+    def has_entries(self, category):
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM entries WHERE category = ? LIMIT 1", (category,)).fetchone() is not None
+
+    def seed(self, category, finished):
+        """Replace the category's entries with ``finished`` ``(file, number, name)`` rows, in one transaction."""
+        with self._lock, self._db:
+            for table in ("entries", "sections", "renders"):
+                self._db.execute(f"DELETE FROM {table} WHERE category = ?", (category,))
+            now = time.time()
+            self._db.executemany(
+                "INSERT INTO entries (category, file, number, name, done, seq, updated_at) VALUES (?, ?, ?, ?, 1, ?, ?)",
+                [(category, file, number, name, seq, now) for seq, (file, number, name) in enumerate(finished, 1)],
+            )
+
+    def changed_entries(self, category):
+        """Entries changed since ``mark_rendered``, oldest change first."""
+        with self._lock:
+            row = self._db.execute("SELECT seq FROM renders WHERE category = ?", (category,)).fetchone()
+            return self._db.execute(
+                "SELECT * FROM entries WHERE category = ? AND seq > ? ORDER BY seq",
+                (category, row["seq"] if row else 0),
+            ).fetchall()
+
+    def mark_rendered(self, category, seq):
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO renders (category, seq) VALUES (?, ?) "
+                "ON CONFLICT (category) DO UPDATE SET seq = excluded.seq",
+                (category, seq),
+            )
+
+    def sections(self, category, file):
+        with self._lock:
+            return self._db.execute(
+                "SELECT * FROM sections WHERE category = ? AND file = ? ORDER BY section", (category, file)
+            ).fetchall()
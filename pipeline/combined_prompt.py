@@ -0,0 +1,95 @@
+"""One NotebookLM prompt for all of an entry's questions, and its splitter.
+
+Collecting an entry normally takes one NotebookLM round trip per section.
+With ``--combined`` the collector sends the missing questions as a single
+prompt that asks for each answer under a marker line::
+
+    === SECTION: toxins ===
+
+``split`` cuts the reply back into ``raw_responses`` sections at those
+markers, tolerating the Markdown NotebookLM likes to wrap them in. A
+section that comes back missing or shorter than
+``verify_raw.MIN_RESPONSE_LENGTH`` is asked on its own as before, so
+``--combined`` can only cost the one extra prompt.
+
+``LengthReport`` tallies the round trips and section lengths of a combined
+run, and prints them next to the lengths of the answers already on disk,
+which were collected one question at a time.
+"""
+import re
+import statistics
+import threading
+
+MARKER = "=== SECTION: {} ==="
+
+_MARKER_RE = re.compile(r"^[\s*_#>`]*={2,}\s*SECTION:\s*([A-Za-z_]+)\s*={2,}[\s*_`]*$", re.IGNORECASE | re.MULTILINE)
+
+
+def build(questions):
+    """``questions`` (``{section: question}``, in order) as one prompt asking for delimited answers."""
+    first = next(iter(questions))
+    parts = [
+        f"Answer each of the following {len(questions)} questions separately and completely. "
+        f'Start each answer with its marker line exactly as written (for example "{MARKER.format(first)}"), '
+        "keep the answers in the order given and write nothing before the first marker."
+    ]
+    for section, question in questions.items():
+        parts.append(f"{MARKER.format(section)}\n{question}")
+    return "\n\n".join(parts)
+
+
+def split(answer, sections=None):
+    """``{section: text}`` for every marker in ``answer`` that names one of ``sections`` (first one wins)."""
+    found = {}
+    matches = list(_MARKER_RE.finditer(answer))
+    for match, following in zip(matches, matches[1:] + [None]):
+        name = match.group(1).lower()
+        if (sections is not None and name not in sections) or name in found:
+            continue
+        end = following.start() if following is not None else len(answer)
+        found[name] = answer[match.end():end].strip()
+    return found
+
+
+class LengthReport:
+    """Round trips and per-section answer lengths of one combined run."""
+
+    def __init__(self, sections):
+        self.sections = tuple(sections)
+        self.lengths = {section: [] for section in self.sections}
+        self.fallbacks = {section: 0 for section in self.sections}
+        self.prompts = 0
+        self.questions = 0
+        self._lock = threading.Lock()
+
+    def add(self, section, text, fallback):
+        with self._lock:
+            if text:
+                self.lengths[section].append(len(text))
+            if fallback:
+                self.fallbacks[section] += 1
+
+    def asked(self, questions):
+        """One combined prompt standing in for ``questions`` individual ones."""
+        with self._lock:
+            self.prompts += 1
+            self.questions += questions
+
+    def format(self, individual):
+        """The report; ``individual`` maps each section to answer lengths collected one question at a time."""
+        fallbacks = sum(self.fallbacks.values())
+        lines = [
+            f"📏 Combined mode: {self.prompts} combined prompts + {fallbacks} single questions "
+            f"for {self.questions} sections (one question per section: {self.questions})",
+            f"   {'section':<12} {'combined':>9} {'individual':>11} {'fallbacks':>10}",
+        ]
+        for section in self.sections:
+            combined = _median(self.lengths[section])
+            single = _median(individual.get(section, []))
+            lines.append(f"   {section:<12} {combined:>9} {single:>11} {self.fallbacks[section]:>10}")
+        lines.append("   (median characters per answer; individual = raw files not collected in this run)")
+        return "\n".join(lines)
+
+
+def _median(values):
+    return f"{statistics.median(values):.0f}" if values else "-"
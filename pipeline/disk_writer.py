@@ -0,0 +1,57 @@
+"""Atomic file writes that leave identical files alone.
+
+Every writer in the pipeline used to write a temp file and rename it over
+the target, even when the bytes were the same as what was already there.
+A full-corpus run then bumped the mtime and inode of hundreds of unchanged
+files, which every mtime-based consumer (and ``git status``) has to look at
+again. ``write_text_if_changed`` compares first: if the target has the same
+size and the same bytes it is not touched.
+"""
+import os
+from pathlib import Path
+
+_counts = {"written": 0, "unchanged": 0}
+
+
+def _same_bytes(path, data):
+    try:
+        if os.stat(path).st_size != len(data):
+            return False
+        with open(path, "rb") as fh:
+            return fh.read() == data
+    except FileNotFoundError:
+        return False
+
+
+def write_text_if_changed(path, text):
+    """Atomically write ``text`` (UTF-8) to ``path`` unless it already holds it; True if written."""
+    data = text.encode("utf-8")
+    if _same_bytes(path, data):
+        _counts["unchanged"] += 1
+        return False
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(data)
+    os.replace(tmp, path)
+    _counts["written"] += 1
+    return True
+
+
+def snapshot():
+    return dict(_counts)
+
+
+def delta(after, before):
+    return {key: after[key] - before.get(key, 0) for key in after}
+
+
+def merge(total, part):
+    """Add the counts in ``part`` into ``total`` in place."""
+    for key, count in part.items():
+        total[key] = total.get(key, 0) + count
+    return total
+
+
+def format_counts(counts):
+    return f"{counts.get('written', 0)} written, {counts.get('unchanged', 0)} unchanged"
@@ -37,8 +37,9 @@ from paths import (
     DATA_DIR,
     PROCESSED_FOODS_DIR,
     PROCESSED_PLANTS_DIR,
-    TOXIN_DISK_SCHEMA,
 )
+import disk_writer
+import toxin_disk_validator
 
 FIRESTORE_ONLY_FIELDS = ("id", "imageUrls", "imageUrl", "hidden", "curatedList")
 COLLECTION = "toxins"
@@ -60,13 +61,9 @@ def resolve_output_path(doc_id: str, data: dict[str, Any]) -> Path:
     return base / f"{stem}.json"
 
 
-def atomic_write_json(target: Path, payload: dict[str, Any]) -> None:
-    target.parent.mkdir(parents=True, exist_ok=True)
-    tmp = target.with_suffix(target.suffix + ".tmp")
-    with open(tmp, "w") as fh:
-        json.dump(payload, fh, indent=2, ensure_ascii=False, sort_keys=True)
-        fh.write("\n")
-    os.replace(tmp, target)
+def atomic_write_json(target: Path, payload: dict[str, Any]) -> bool:
+    text = json.dumps(payload, indent=2, ensure_ascii=False, sort_keys=True) + "\n"
+    return disk_writer.write_text_if_changed(target, text)
 
 
 def strip_firestore_only(data: dict[str, Any]) -> dict[str, Any]:
@@ -102,19 +99,6 @@ def load_firestore_client(key_path: str):
     return firestore.client()
 
 
-def load_validator():
-    try:
-        from jsonschema import Draft7Validator
-    except ImportError:
-        print("jsonschema is not installed. `pip install jsonschema`", file=sys.stderr)
-        sys.exit(1)
-    if not TOXIN_DISK_SCHEMA.exists():
-        print(f"schema not found at {TOXIN_DISK_SCHEMA}", file=sys.stderr)
-        sys.exit(1)
-    with open(TOXIN_DISK_SCHEMA, "r") as fh:
-        return Draft7Validator(json.load(fh))
-
-
 def main() -> int:
     args = parse_args()
     key_path = args.key
@@ -126,11 +110,11 @@ def main() -> int:
         return 2
 
     db = load_firestore_client(key_path)
-    validator = load_validator()
 
     docs = list(db.collection(COLLECTION).stream())
     fetched = len(docs)
     written = 0
+    unchanged = 0
     validation_failures: list[tuple[str, str, str]] = []
     written_paths: set[Path] = set()
 
@@ -138,11 +122,11 @@ def main() -> int:
         raw = doc.to_dict() or {}
         disk_payload = strip_firestore_only(raw)
 
-        errors = sorted(validator.iter_errors(disk_payload), key=lambda e: list(e.absolute_path))
-        if errors:
-            first = errors[0]
-            loc = "/".join(str(p) for p in first.absolute_path) or "<root>"
-            validation_failures.append((doc.id, loc, first.message))
+        error = toxin_disk_validator.first_error(disk_payload)
+        if error is not None:
+            path, message = error
+            loc = "/".join(str(p) for p in path) or "<root>"
+            validation_failures.append((doc.id, loc, message))
             continue
 
         target = resolve_output_path(doc.id, raw)
@@ -158,13 +142,16 @@ def main() -> int:
             written_paths.add(target)
             continue
 
-        atomic_write_json(target, disk_payload)
-        written += 1
+        if atomic_write_json(target, disk_payload):
+            written += 1
+        else:
+            unchanged += 1
         written_paths.add(target)
 
     print()
     print(f"Firestore docs fetched:  {fetched}")
     print(f"JSON files written:      {written}{' (dry run)' if args.dry_run else ''}")
+    print(f"JSON files unchanged:    {unchanged}")
     print(f"Validation failures:     {len(validation_failures)}")
     for doc_id, loc, msg in validation_failures:
         print(f"  FAIL {doc_id}: {loc}: {msg[:120]}")
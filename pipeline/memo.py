@@ -0,0 +1,84 @@
+"""Bounded memoization for the processors' pure string normalizers.
+
+Fields like severity, body system, family and onset take a few hundred
+distinct values across the whole corpus but are normalized thousands of
+times. ``memoized`` puts an LRU cache in front of such a function and keeps
+enough bookkeeping to report hits, misses and roughly how much time the hits
+saved (hits × the average cost of a miss).
+
+Under ``--jobs`` every worker process has its own caches (see
+``process_engine.iter_process_results``).
+"""
+import functools
+import time
+
+DEFAULT_MAXSIZE = 4096
+
+
+def memoized(fn=None, *, maxsize=DEFAULT_MAXSIZE):
+    """Decorate a pure, hashable-argument function with a bounded LRU cache."""
+    if fn is None:
+        return functools.partial(memoized, maxsize=maxsize)
+
+    miss_seconds = [0.0]
+
+    @functools.lru_cache(maxsize=maxsize)
+    def compute(*args):
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            miss_seconds[0] += time.perf_counter() - start
+
+    @functools.wraps(fn)
+    def wrapper(*args):
+        return compute(*args)
+
+    def counters():
+        info = compute.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "miss_seconds": miss_seconds[0]}
+
+    def cache_clear():
+        compute.cache_clear()
+        miss_seconds[0] = 0.0
+
+    wrapper.counters = counters
+    wrapper.cache_clear = cache_clear
+    return wrapper
+
+
+def snapshot(functions):
+    """Current counters of each memoized function, keyed by name."""
+    return {fn.__name__: fn.counters() for fn in functions}
+
+
+def delta(after, before):
+    """Counters accumulated between two snapshots."""
+    return {
+        name: {key: value - before.get(name, {}).get(key, 0) for key, value in counts.items()}
+        for name, counts in after.items()
+    }
+
+
+def merge(total, part):
+    """Add the counters in ``part`` into ``total`` in place."""
+    for name, counts in part.items():
+        slot = total.setdefault(name, {key: 0 for key in counts})
+        for key, value in counts.items():
+            slot[key] += value
+    return total
+
+
+def format_stats(stats):
+    """Report lines for ``--cache-stats``."""
+    lines = ["Cache stats:"]
+    width = max((len(name) for name in stats), default=0)
+    for name, counts in stats.items():
+        hits, misses = counts["hits"], counts["misses"]
+        calls = hits + misses
+        rate = 100.0 * hits / calls if calls else 0.0
+        saved = hits * counts["miss_seconds"] / misses if misses else 0.0
+        lines.append(
+            f"  {name:<{width}}  {hits:>7} hits  {misses:>6} misses  {rate:5.1f}%  ~{saved * 1000:.1f} ms saved"
+        )
+    return lines
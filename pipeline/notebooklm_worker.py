@@ -0,0 +1,320 @@
+"""Long-lived NotebookLM worker and the client the collectors use to talk to it.
+
+Asking through ``python3 scripts/run.py ask_question.py`` costs an
+interpreter start, the skill's imports and its session set-up for every
+single question. A worker pays that once: the collector starts it, sends
+it questions over stdin and reads answers from stdout, one JSON object per
+line::
+
+    -> {"id": 1, "op": "ping"}
+    <- {"id": 1, "ok": true, "backend": "skill", "pid": 4242}
+    -> {"id": 2, "op": "ask", "question": "...", "notebook_args": ["--notebook-id", "..."]}
+    <- {"id": 2, "ok": true, "answer": "...", "marker": true}
+    <- {"id": 2, "ok": false, "error": "TimeoutError: ..."}
+
+The ``skill`` backend imports ``ask_question`` from the NotebookLM skill
+and runs under the skill's virtualenv; the ``stub`` backend answers every
+question with canned text and needs nothing, so the protocol, restarts
+and the collectors can be exercised offline.
+
+``Worker`` is one worker process seen from the collector: it is health
+checked with a ping when started and restarted (once per question) when
+it dies, hangs past its timeout or answers out of turn. ``WorkerPool``
+hands one worker to each concurrent caller.
+
+Usage (normally started by the collectors, see ``--backend``):
+    python3 pipeline/notebooklm_worker.py --backend stub
+"""
+import argparse
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+import combined_prompt
+from paths import NOTEBOOKLM_WORKER_LOG
+
+SKILL_DIR = "/Users/sweetp/.gemini/antigravity/skills/notebooklm"
+
+# ask_question.py appends this follow-up prompt to every answer
+ANSWER_END_MARKER = "EXTREMELY IMPORTANT: Is that ALL you need to know?"
+
+PING_TIMEOUT = 120.0
+ASK_TIMEOUT = 600.0
+
+
+class WorkerError(Exception):
+    """Raised when a worker cannot be started or stops answering."""
+
+
+# --- Worker side ---
+
+class SkillBackend:
+    """Asks through the NotebookLM skill's own ``ask_notebooklm``, imported once."""
+
+    name = "skill"
+
+    def __init__(self, skill_dir):
+        sys.path.insert(0, os.path.join(skill_dir, "scripts"))
+        os.chdir(skill_dir)
+        import ask_question
+        import notebook_manager
+        self._ask = ask_question.ask_notebooklm
+        self._library = notebook_manager.NotebookLibrary()
+
+    def _notebook_url(self, notebook_args):
+        options = dict(zip(notebook_args[::2], notebook_args[1::2]))
+        if "--notebook-url" in options:
+            return options["--notebook-url"]
+        notebook = self._library.get_notebook(options["--notebook-id"])
+        if not notebook:
+            raise ValueError(f"unknown notebook id {options['--notebook-id']!r}")
+        return notebook["url"]
+
+    def ask(self, question, notebook_args):
+        return self._ask(question, self._notebook_url(notebook_args))
+
+
+class StubBackend:
+    """Canned answers for offline runs; optionally slow, or dying after every N answers."""
+
+    name = "stub"
+
+    def __init__(self, delay=0.0, crash_every=0):
+        self.delay = delay
+        self.crash_every = crash_every
+        self.answered = 0
+
+    def ask(self, question, notebook_args):
+        if self.crash_every and self.answered >= self.crash_every:
+            os._exit(3)
+        time.sleep(self.delay)
+        self.answered += 1
+        # A combined prompt gets one marked answer per section, like NotebookLM gives
+        parts = combined_prompt.split(question)
+        if parts:
+            answer = "\n\n".join(
+                f"**{combined_prompt.MARKER.format(section)}**\n{self._answer(part, notebook_args)}"
+                for section, part in parts.items()
+            )
+        else:
+            answer = self._answer(question, notebook_args)
+        return f"{answer}\n{ANSWER_END_MARKER} (stub follow-up)"
+
+    def _answer(self, question, notebook_args):
+        return (
+            f"Stub answer ({' '.join(notebook_args)}).\n"
+            f"1. Name: Stub item\n2. Brief description: {question}"
+        )
+
+
+def serve(backend, requests, replies):
+    """Answer JSON-line ``requests`` on ``replies`` until stdin closes."""
+    def reply(message):
+        replies.write(json.dumps(message, ensure_ascii=False) + "\n")
+        replies.flush()
+
+    for line in requests:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+        except ValueError as exc:
+            reply({"id": None, "ok": False, "error": f"bad request: {exc}"})
+            continue
+        rid = request.get("id")
+        op = request.get("op")
+        if op == "ping":
+            reply({"id": rid, "ok": True, "backend": backend.name, "pid": os.getpid()})
+        elif op == "ask":
+            try:
+                answer = backend.ask(request["question"], request.get("notebook_args", []))
+            except Exception as exc:
+                reply({"id": rid, "ok": False, "error": f"{type(exc).__name__}: {exc}"})
+                continue
+            marker = ANSWER_END_MARKER in answer
+            if marker:
+                answer = answer.split(ANSWER_END_MARKER)[0]
+            reply({"id": rid, "ok": True, "answer": answer.strip(), "marker": marker})
+        else:
+            reply({"id": rid, "ok": False, "error": f"unknown op {op!r}"})
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Answer NotebookLM questions over a stdin/stdout JSON-lines protocol.")
+    parser.add_argument("--backend", choices=("skill", "stub"), default="skill")
+    parser.add_argument("--skill-dir", default=SKILL_DIR)
+    parser.add_argument("--stub-delay", type=float, default=0.0,
+                        help="Seconds the stub backend takes per answer")
+    parser.add_argument("--stub-crash-every", type=int, default=0,
+                        help="Make the stub backend exit after this many answers (restart testing)")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    # The protocol owns the real stdout; anything else printed (the skill's
+    # progress output, browser noise) goes to stderr
+    replies = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8")
+    sys.stdin.reconfigure(encoding="utf-8")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    if args.backend == "skill":
+        backend = SkillBackend(args.skill_dir)
+    else:
+        backend = StubBackend(args.stub_delay, args.stub_crash_every)
+    serve(backend, sys.stdin, replies)
+
+
+# --- Collector side ---
+
+def worker_command(backend, extra_args=()):
+    """The command line that starts a worker; skill workers run under the skill's virtualenv."""
+    python = sys.executable
+    if backend == "skill":
+        venv_python = os.path.join(SKILL_DIR, ".venv", "bin", "python")
+        python = venv_python if os.path.exists(venv_python) else "python3"
+    return [python, os.path.abspath(__file__), "--backend", backend] + list(extra_args)
+
+
+class Worker:
+    """One worker process, started on first use and restarted when it stops answering."""
+
+    def __init__(self, command, ping_timeout=PING_TIMEOUT, ask_timeout=ASK_TIMEOUT):
+        self.command = command
+        self.ping_timeout = ping_timeout
+        self.ask_timeout = ask_timeout
+        self.restarts = 0
+        self._proc = None
+        self._lines = None
+        self._next_id = 0
+
+    def _read_stdout(self, proc, lines):
+        for line in proc.stdout:
+            lines.put(line)
+        lines.put(None)
+
+    def _request(self, message, timeout):
+        self._next_id += 1
+        message = dict(message, id=self._next_id)
+        try:
+            self._proc.stdin.write(json.dumps(message, ensure_ascii=False) + "\n")
+            self._proc.stdin.flush()
+        except OSError as exc:
+            raise WorkerError(f"worker stdin closed: {exc}") from exc
+        try:
+            line = self._lines.get(timeout=timeout)
+        except queue.Empty:
+            raise WorkerError(f"no reply within {timeout:g}s") from None
+        if line is None:
+            raise WorkerError(f"worker exited with code {self._proc.wait()}")
+        reply = json.loads(line)
+        if reply.get("id") != message["id"]:
+            raise WorkerError(f"reply {reply.get('id')!r} out of turn (expected {message['id']})")
+        return reply
+
+    def start(self):
+        """Start the worker and check that it answers a ping."""
+        NOTEBOOKLM_WORKER_LOG.parent.mkdir(parents=True, exist_ok=True)
+        with open(NOTEBOOKLM_WORKER_LOG, "a") as log:
+            self._proc = subprocess.Popen(
+                self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=log,
+                text=True, encoding="utf-8", bufsize=1,
+            )
+        self._lines = queue.Queue()
+        threading.Thread(target=self._read_stdout, args=(self._proc, self._lines), daemon=True).start()
+        try:
+            reply = self._request({"op": "ping"}, self.ping_timeout)
+        except (WorkerError, ValueError) as exc:
+            self.stop(kill=True)
+            raise WorkerError(f"worker failed its health check: {exc}") from exc
+        if not reply.get("ok"):
+            self.stop()
+            raise WorkerError(f"worker failed its health check: {reply.get('error')}")
+
+    def stop(self, kill=False):
+        """Close the worker's stdin and let it exit; ``kill`` it when it is known to be stuck."""
+        if self._proc is None:
+            return
+        proc, self._proc = self._proc, None
+        try:
+            if kill:
+                proc.kill()
+            proc.stdin.close()
+            proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            proc.kill()
+            proc.wait()
+
+    def alive(self):
+        return self._proc is not None and self._proc.poll() is None
+
+    def ask(self, question, notebook_args, info=None):
+        """The answer text, or None if NotebookLM failed; raises WorkerError if the worker did twice.
+
+        ``info``, if given, receives the call's details for telemetry.
+        """
+        info = {} if info is None else info
+        info.update(backend="worker", retries=0)
+        for attempt in (1, 2):
+            try:
+                if not self.alive():
+                    if self._proc is not None:
+                        self.stop()
+                        self.restarts += 1
+                    self.start()
+                reply = self._request(
+                    {"op": "ask", "question": question, "notebook_args": notebook_args}, self.ask_timeout
+                )
+            except (WorkerError, ValueError, OSError) as exc:
+                # Hung, crashed, garbled or not coming back up: throw the
+                # process away and retry once on a fresh one
+                self.stop(kill=True)
+                self.restarts += 1
+                info["retries"] = attempt
+                if attempt == 2:
+                    raise WorkerError(str(exc)) from exc
+                continue
+            info.update(exit_code=0 if reply.get("ok") else 1, marker_found=reply.get("marker"))
+            if reply.get("ok"):
+                return reply["answer"]
+            info["error"] = reply.get("error")
+            print(f"❌ Error asking question:\n{reply.get('error')}")
+            return None
+
+
+class WorkerPool:
+    """``size`` workers, each used by one caller at a time."""
+
+    def __init__(self, size, command, **timeouts):
+        self._idle = queue.Queue()
+        self.workers = [Worker(command, **timeouts) for _ in range(size)]
+        for worker in self.workers:
+            self._idle.put(worker)
+
+    def start(self):
+        """Start every worker now, so a broken set-up shows before any question is asked."""
+        for worker in self.workers:
+            worker.start()
+
+    def ask(self, question, notebook_args, info=None):
+        print(f"\n❓ Asking: {question[:60]}...")
+        worker = self._idle.get()
+        try:
+            return worker.ask(question, notebook_args, info)
+        finally:
+            self._idle.put(worker)
+
+    def close(self):
+        for worker in self.workers:
+            worker.stop()
+
+    @property
+    def restarts(self):
+        return sum(worker.restarts for worker in self.workers)
+
+
+if __name__ == "__main__":
+    main()
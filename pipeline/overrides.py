@@ -0,0 +1,149 @@
+"""Manual override tables, looked up by normalized scientific name.
+
+Overrides (a family, description or toxic-parts list for plants whose
+NotebookLM answers are missing or poor) live in a versioned JSON file::
+
+    {"version": 1,
+     "families":     {"Crassula arborescens or Crassula": "Crassulaceae", ...},
+     "descriptions": {...},
+     "toxic_parts":  {...}}
+
+Keys are written the way the raw answers spell the plant, which is messy
+("Monstera deliciosa or Monstera adansonii", "Agapanthus africanus or A.
+orientalis", "Zamioculcas"). Every key and every lookup goes through
+``name_variants``: lowercased, quotes and parentheticals dropped, split on
+"or" / "," / "including" / "and", abbreviated genera expanded, and "spp." / "sp." /
+a bare genus all spelled "<genus> spp". A lookup tries the whole name, then
+each variant, then each variant's genus — a "<genus> spp" entry, or, for
+tables where a genus decides the value (families), any entry of that genus
+as long as they all agree.
+
+The file is read on first use, once per process.
+"""
+import json
+import re
+
+FORMAT_VERSION = 1
+
+_QUOTES_RE = re.compile(r"[\"'‘’“”]")
+_PAREN_RE = re.compile(r"\([^)]*\)")
+_SPLIT_RE = re.compile(r"\s+or\s+|\s*,\s*|\s+including\s+|\s+and\s+")
+_SPP_RE = re.compile(r"\s+(?:spp|sp|species)\.?$")
+_ABBREVIATED_GENUS_RE = re.compile(r"[a-z]\.?")
+
+
+def _clean(name):
+    name = _QUOTES_RE.sub("", name.lower().replace("×", "x"))
+    name = _PAREN_RE.sub(" ", name)
+    return " ".join(name.split()).rstrip(".")
+
+
+def _variant(part, genus):
+    words = part.split()
+    if not words:
+        return None
+    # "A. orientalis" after "Agapanthus africanus" -> "agapanthus orientalis"
+    if genus and _ABBREVIATED_GENUS_RE.fullmatch(words[0]):
+        words[0] = genus
+    part = _SPP_RE.sub(" spp", " ".join(words))
+    # A bare genus ("Zamioculcas") means the whole genus
+    return part if " " in part else part + " spp"
+
+
+def name_variants(name):
+    """``(whole, variants)``: the normalized name and each alternative it lists."""
+    if not name:
+        return "", []
+    whole = _clean(name)
+    variants = []
+    genus = None
+    for part in _SPLIT_RE.split(whole):
+        variant = _variant(part, genus)
+        if variant is None:
+            continue
+        genus = variant.split()[0]
+        if variant not in variants:
+            variants.append(variant)
+    return whole, variants
+
+
+class OverrideTable:
+    """One override table (name -> value) with its normalized indexes."""
+
+    def __init__(self, entries, genus_wide=False):
+        self.entries = entries
+        self.exact = {}
+        self.variants = {}
+        self.genus = {}
+        species = {}
+        for key in entries:
+            whole, variants = name_variants(key)
+            self.exact.setdefault(whole, key)
+            for variant in variants:
+                self.variants.setdefault(variant, key)
+                words = variant.split()
+                if len(words) != 2:
+                    continue
+                if words[1] == "spp":
+                    # A "<genus> spp" entry speaks for the whole genus
+                    self.genus.setdefault(words[0], key)
+                elif genus_wide:
+                    species.setdefault(words[0], []).append(key)
+        # Otherwise any species entry stands in for its genus, unless they disagree
+        for genus, keys in species.items():
+            if genus not in self.genus and len({json.dumps(entries[k]) for k in keys}) == 1:
+                self.genus[genus] = keys[0]
+
+    def resolve(self, name):
+        """The table key ``name`` resolves to, or None."""
+        whole, variants = name_variants(name)
+        if whole in self.exact:
+            return self.exact[whole]
+        for variant in variants:
+            if variant in self.variants:
+                return self.variants[variant]
+        for variant in variants:
+            genus = variant.split()[0]
+            if genus in self.genus:
+                return self.genus[genus]
+        return None
+
+    def get(self, name):
+        key = self.resolve(name)
+        return None if key is None else self.entries[key]
+
+
+class Overrides:
+    """The override tables in one JSON file, loaded on first use."""
+
+    def __init__(self, path, genus_wide=()):
+        self.path = path
+        self.genus_wide = set(genus_wide)
+        self._tables = None
+
+    def _load(self):
+        with open(self.path, "r") as f:
+            data = json.load(f)
+        if data.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{self.path}: unsupported overrides version {data.get('version')!r}")
+        self._tables = {
+            name: OverrideTable(entries, genus_wide=name in self.genus_wide)
+            for name, entries in data.items()
+            if name != "version"
+        }
+        return self._tables
+
+    def tables(self):
+        return self._tables if self._tables is not None else self._load()
+
+    def get(self, table, name):
+        """Override for ``name`` in ``table``, or None."""
+        return self.tables()[table].get(name)
+
+    def resolved(self, name):
+        """Every table's matching ``[key, value]`` for ``name`` (None where nothing matches)."""
+        out = {}
+        for table_name, table in self.tables().items():
+            key = table.resolve(name)
+            out[table_name] = None if key is None else [key, table.entries[key]]
+        return out
@@ -0,0 +1,76 @@
+"""Limits that keep one bad raw file from stalling a processing run.
+
+NotebookLM answers are normally a few KB. A runaway answer (megabytes of
+repeated citations or blank lines) can still make a parser slow, so each
+file is checked against two limits before its output is written:
+
+* every raw response field must be at most ``max_field_chars`` long;
+* parsing the file must finish within ``time_budget`` seconds (SIGALRM, so
+  it also interrupts a regex that is still matching).
+
+A file that breaks a limit, or that makes a parser raise, is quarantined:
+nothing is written for it, the run carries on, and the reason ends up in
+the quarantine report under ``data/.build/``.
+"""
+import contextlib
+import json
+import os
+import signal
+import threading
+
+DEFAULT_MAX_FIELD_CHARS = 256 * 1024
+DEFAULT_TIME_BUDGET = 10.0
+
+
+class Quarantined(Exception):
+    """Raised when a raw file has to be set aside instead of processed."""
+
+
+class ParseTimeout(Quarantined):
+    pass
+
+
+def check_field_sizes(raw, max_chars):
+    """Quarantine ``raw`` if any response field is longer than ``max_chars`` (0 = no limit)."""
+    if not max_chars:
+        return
+    for name, value in raw.items():
+        if isinstance(value, str) and len(value) > max_chars:
+            raise Quarantined(f"raw_responses.{name} is {len(value)} chars (limit {max_chars})")
+
+
+@contextlib.contextmanager
+def time_budget(seconds):
+    """Raise ParseTimeout if the block runs longer than ``seconds`` (0 = no limit).
+
+    Only enforced in the main thread of a process that has SIGALRM — which
+    covers both the serial run and ProcessPoolExecutor workers.
+    """
+    if (
+        not seconds
+        or not hasattr(signal, "SIGALRM")
+        or threading.current_thread() is not threading.main_thread()
+    ):
+        yield
+        return
+
+    def expire(signum, frame):
+        raise ParseTimeout(f"parsing took longer than {seconds:g}s")
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def write_report(path, entries):
+    """Write the quarantine report (a list of {"file", "reason"}) atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "w") as fh:
+        json.dump({"quarantined": entries}, fh, indent=2, ensure_ascii=False)
+        fh.write("\n")
+    os.replace(tmp, path)
@@ -12,6 +12,7 @@ PLANT_LIST = DATA_DIR / "plant_list.json"
 RAW_PLANTS_DIR = DATA_DIR / "plants"
 PROCESSED_PLANTS_DIR = DATA_DIR / "plants_processed"
 CLEANED_PLANTS_DIR = DATA_DIR / "plants_cleaned"
+PLANT_OVERRIDES = DATA_DIR / "plant_overrides.json"
 STATUS_FILE = DATA_DIR / "collection_status.md"
 COMPLETED_LOG = DATA_DIR / "completed_log.txt"
 
@@ -22,5 +23,25 @@ STATUS_FILE_FOOD = DATA_DIR / "collection_status_food.md"
 COMPLETED_LOG_FOOD = DATA_DIR / "completed_log_food.txt"
 VERIFICATION_REPORT_FOOD = DATA_DIR / "verification_report_food.json"
 
+BUILD_DIR = DATA_DIR / ".build"
+PROCESS_PLANTS_MANIFEST = BUILD_DIR / "process_plants.manifest.json"
+PROCESS_PLANTS_QUARANTINE = BUILD_DIR / "process_plants.quarantine.json"
+PROCESS_PLANTS_SECTIONS = BUILD_DIR / "process_plants.sections.json"
+PROCESS_FOODS_MANIFEST = BUILD_DIR / "process_foods.manifest.json"
+PROCESS_FOODS_QUARANTINE = BUILD_DIR / "process_foods.quarantine.json"
+PROCESS_FOODS_SECTIONS = BUILD_DIR / "process_foods.sections.json"
+NOTEBOOKLM_WORKER_LOG = BUILD_DIR / "notebooklm_worker.log"
+NOTEBOOKLM_ANSWER_CACHE = BUILD_DIR / "notebooklm_answers.json"
+COLLECT_PLANTS_JOURNAL = BUILD_DIR / "collect_plants.journal.jsonl"
+COLLECT_FOODS_JOURNAL = BUILD_DIR / "collect_foods.journal.jsonl"
+RECOLLECT_PLANTS_QUEUE = BUILD_DIR / "recollect_plants.queue.json"
+RECOLLECT_FOODS_QUEUE = BUILD_DIR / "recollect_foods.queue.json"
+COLLECTION_STATE = BUILD_DIR / "collection_state.sqlite"
+COLLECT_TELEMETRY = BUILD_DIR / "collect_telemetry.jsonl"
+
+BENCH_DIR = REPO_ROOT / "bench"
+PROCESS_PLANTS_BENCH_BASELINE = BENCH_DIR / "process_plants.baseline.json"
+PROCESS_OUTPUTS_GOLDEN = BENCH_DIR / "process_outputs.golden.json"
+
 SCHEMAS_DIR = REPO_ROOT / "schemas"
 TOXIN_DISK_SCHEMA = SCHEMAS_DIR / "toxin.disk.schema.json"
@@ -0,0 +1,498 @@
+"""Category-generic raw → processed engine shared by the plant and food CLIs.
+
+``process_plants.py`` and ``process_foods.py`` each declare a ``Category``:
+their vocabulary (toxic parts, body systems, source-ref rules), the parsers
+that turn one raw NotebookLM entry into a processed record, and where files
+live. Module-level tables and matchers are compiled once when the category
+module is imported. Everything else lives here, once:
+
+* the normalizers both categories share (severity, trailing punctuation,
+  name truncation, headers, body systems over a category's own map);
+* ``parse_raw(category, data)`` — just the parsers, no I/O;
+* ``process_record(category, data)`` — the library entry point: parse
+  guards, parsers and schema validation in memory, returning
+  ``(processed, validation_errors)``;
+* ``section`` — declares one raw response section for the section cache;
+* ``process_file`` — ``process_record`` between reading and writing a file;
+* the CLI driver ``run``: build manifest, ``--jobs`` pool, quarantine,
+  ``--cache-stats`` / ``--profile`` / ``--cprofile`` reporting.
+"""
+import argparse
+import contextlib
+import functools
+import glob
+import importlib
+import io
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import build_manifest
+import disk_writer
+import memo
+import parse_guard
+import profiling
+import section_cache
+import source_refs
+import toxin_disk_validator
+import vocab_matcher
+from vocab_matcher import SubstringMatcher
+
+VALID_SEVERITIES = {"mild", "moderate", "severe", "fatal"}
+
+# Severity ranking for picking the highest from ranges like "Mild to Severe"
+SEVERITY_RANK = {"mild": 1, "moderate": 2, "severe": 3, "fatal": 4}
+
+HEADER_SEPARATOR = "============================================================"
+
+# re.sub(r'[^\w)]+$', ...) entered only at the start of a non-word run, so a
+# long run that stops short of the end is scanned once, not once per character
+TRAILING_NON_WORD_RE = re.compile(r'(?<![^\w)])[^\w)]++$')
+
+# Category name -> module that declares it, for workers that have not imported it yet
+_CATEGORY_MODULES = {"plant": "process_plants", "food": "process_foods"}
+_categories = {}
+
+
+class Category:
+    """One kind of raw entry (plant, food) and everything the engine needs to process it.
+
+    ``parse_raw(data)`` turns a raw ``{"plant": ..., "raw_responses": ...}``
+    entry into the processed record. ``normalizers`` are the memoized
+    functions reported by ``--cache-stats``; ``rules`` and ``sources`` (the
+    category module's files) feed the build-manifest fingerprint.
+    ``section_cache`` is where parsed sections are cached between runs (see
+    ``section_cache.py``). ``overrides_for(data)``, if given, returns the manual overrides that
+    apply to one raw entry; they go into that file's fingerprint alone, so
+    editing an override only rebuilds the entries it matches.
+    """
+
+    def __init__(self, name, parse_raw, *, input_dir, output_dir, manifest_path, quarantine_report,
+                 section_cache=None, normalizers=(), rules=None, sources=(), overrides_for=None):
+        self.name = name
+        self.parse_raw = parse_raw
+        self.input_dir = str(input_dir)
+        self.output_dir = str(output_dir)
+        self.manifest_path = manifest_path
+        self.quarantine_report = quarantine_report
+        self.section_cache = section_cache
+        self.normalizers = tuple(normalizers)
+        self.rules = rules or {}
+        self.sources = list(sources)
+        self.overrides_for = overrides_for
+        _categories[name] = self
+
+
+def load_category(name):
+    """The registered Category called ``name``, importing its module if needed."""
+    if name not in _categories:
+        importlib.import_module(_CATEGORY_MODULES[name])
+    return _categories[name]
+
+
+# --- Shared normalizers ---
+
+def clean_text(text):
+    if not text:
+        return None
+    text = text.strip()
+    # Remove leading/trailing quotes
+    return re.sub(r'^["\']|["\']$', '', text)
+
+
+def strip_header(text):
+    if not text:
+        return ""
+    # Take the part after the last separator ask_question.py prints
+    if HEADER_SEPARATOR in text:
+        return text.split(HEADER_SEPARATOR)[-1].strip()
+    return text
+
+
+@memo.memoized
+def strip_trailing_period(val):
+    if not val:
+        return val
+    # Standardize ellipsis to dots
+    val = val.replace('…', '...').replace('．', '.')
+    # Strip citation refs again just in case
+    val = source_refs.strip_citation_tail(val.rstrip())
+    # Strip everything non-word at end except ')'
+    return TRAILING_NON_WORD_RE.sub('', val).strip()
+
+
+def clean_name(name, max_len=150):
+    """Truncate a name that exceeds max_len by cutting at a natural boundary."""
+    if not name or len(name) <= max_len:
+        return name
+    truncated = name[:max_len]
+    for sep in [' (', ', ', ' — ', ' - ']:
+        idx = truncated.rfind(sep)
+        if idx > 20:  # Don't truncate too aggressively
+            return truncated[:idx].rstrip()
+    return truncated.rstrip()
+
+
+@memo.memoized
+def normalize_severity(val):
+    """Normalize a severity value to one of: mild, moderate, severe, fatal.
+
+    Handles cases like 'Mild to Severe.', 'Moderate to Severe.', 'Potentially Severe.'
+    by extracting valid severity words and picking the highest.
+    """
+    if not val:
+        return None
+    cleaned = val.strip().lower().rstrip('.')
+    if cleaned in VALID_SEVERITIES:
+        return cleaned
+    found = [sev for sev in VALID_SEVERITIES if sev in cleaned]
+    if found:
+        return max(found, key=lambda s: SEVERITY_RANK[s])
+    return None  # Can't determine — will be flagged by verify
+
+
+def body_system_normalizer(body_system_map):
+    """Build a memoized normalize_body_system over one category's map."""
+    matcher = SubstringMatcher(body_system_map)
+
+    @memo.memoized
+    def normalize_body_system(val):
+        """Normalize body system to a recognized single value.
+
+        Handles compound values like 'Dermal (Skin).' or 'Gastrointestinal / Neuromuscular.'
+        by finding the first recognized system.
+        """
+        if not val:
+            return None
+        cleaned = val.strip().rstrip('.')
+        if cleaned.lower() in body_system_map:
+            return body_system_map[cleaned.lower()]
+        # Split on / and try each part
+        for part in re.split(r'[/,]', cleaned):
+            part_clean = re.sub(r'\(.*?\)', '', part.strip().lower()).strip()
+            if part_clean in body_system_map:
+                return body_system_map[part_clean]
+            key = matcher.first(part_clean)
+            if key is not None:
+                return body_system_map[key]
+        # Last resort: search the whole string for any known keyword
+        key = matcher.first(cleaned.lower())
+        if key is not None:
+            return body_system_map[key]
+        return cleaned  # Return as-is if nothing matches
+
+    return normalize_body_system
+
+
+SHARED_NORMALIZERS = (normalize_severity, strip_trailing_period)
+
+
+def section(name, parse, code=(), rules=None):
+    """A section_cache.Section whose fingerprint also covers the shared text helpers."""
+    return section_cache.Section(
+        name, parse,
+        code=(strip_header, clean_text) + tuple(code),
+        rules=dict(rules or {}, HEADER_SEPARATOR=HEADER_SEPARATOR),
+    )
+
+
+# --- Processing ---
+
+def parse_raw(category, data):
+    """Parse one raw entry of ``category`` (a Category or its name) into the processed record."""
+    if isinstance(category, str):
+        category = load_category(category)
+    return category.parse_raw(data)
+
+
+def _atomic_write_json(target_path: str, payload: dict) -> bool:
+    return disk_writer.write_text_if_changed(target_path, json.dumps(payload, indent=2))
+
+
+def process_record(category, data, max_field_chars=0, time_budget=0):
+    """Parse and validate one raw entry in memory: ``(processed, validation_errors)``.
+
+    ``category`` is a Category or its name; ``data`` is a raw
+    ``{"plant": ..., "raw_responses": ...}`` dict and is left unmodified.
+    ``validation_errors`` lists every ``(path, message)`` schema violation
+    (validation is advisory; legacy output pre-dates the Firestore-shaped
+    schema, so failures are expected until PR 6 aligns). Raises
+    parse_guard.Quarantined when a response field is longer than
+    ``max_field_chars``, parsing runs past ``time_budget`` seconds, or a
+    parser fails. A limit of 0 disables it.
+    """
+    if isinstance(category, str):
+        category = load_category(category)
+    # The parsers fill in the plant dict in place; give them their own
+    data = dict(data, plant=dict(data.get("plant") or {}))
+
+    parse_guard.check_field_sizes(data.get("raw_responses", {}), max_field_chars)
+    try:
+        with parse_guard.time_budget(time_budget):
+            processed = category.parse_raw(data)
+    except parse_guard.Quarantined:
+        raise
+    except Exception as exc:
+        raise parse_guard.Quarantined(f"parser failed: {type(exc).__name__}: {exc}") from exc
+
+    with profiling.stage("validate"):
+        errors = list(toxin_disk_validator.iter_errors(processed))
+    return processed, errors
+
+
+def format_error(error):
+    """``"loc: message"`` for one ``(path, message)`` validation error."""
+    path, message = error
+    return f"{'/'.join(str(p) for p in path) or '<root>'}: {message}"
+
+
+def process_file(category, filepath, max_field_chars=0, time_budget=0):
+    """Load one raw file, run it through process_record and write the result.
+
+    True if the output passed validation. A quarantined file raises
+    parse_guard.Quarantined and nothing is written for it.
+    """
+    with profiling.stage("json.load"):
+        with open(filepath, "r") as f:
+            data = json.load(f)
+
+    processed, errors = process_record(category, data, max_field_chars, time_budget)
+
+    os.makedirs(category.output_dir, exist_ok=True)
+    out_name = os.path.basename(filepath)
+    out_path = os.path.join(category.output_dir, out_name)
+
+    with profiling.stage("_atomic_write_json"):
+        _atomic_write_json(out_path, processed)
+    print(f"Processed {out_name}")
+
+    if errors:
+        print(f"  WARN {out_name}: {format_error(errors[0])}")
+        return False
+    return True
+
+
+def _process_file_captured(category_name, filepath, max_field_chars=0, time_budget=0,
+                           section_cache_path=None, refresh_sections=False):
+    """Pool worker: run process_file and hand its console output back to the parent.
+
+    The normalizer cache counters, stage timings, write counts and section
+    cache entries accumulated by this file come back too, so the parent can
+    report (and save) them even when every worker has its own. A quarantined file comes back as not
+    ok with its reason in ``stats["quarantine"]``.
+    """
+    category = load_category(category_name)
+    section_cache.activate(section_cache_path, refresh_sections)
+    normalizers = SHARED_NORMALIZERS + category.normalizers
+    cache_before = memo.snapshot(normalizers)
+    stages_before = profiling.snapshot()
+    writes_before = disk_writer.snapshot()
+    sections_before = section_cache.snapshot()
+    start = time.perf_counter()
+    buf = io.StringIO()
+    quarantine = None
+    with contextlib.redirect_stdout(buf):
+        try:
+            ok = process_file(category, filepath, max_field_chars, time_budget)
+        except parse_guard.Quarantined as exc:
+            ok = False
+            quarantine = str(exc)
+    stats = {
+        "seconds": time.perf_counter() - start,
+        "cache": memo.delta(memo.snapshot(normalizers), cache_before),
+        "stages": profiling.delta(profiling.snapshot(), stages_before),
+        "writes": disk_writer.delta(disk_writer.snapshot(), writes_before),
+        "sections": section_cache.take(sections_before),
+        "quarantine": quarantine,
+    }
+    return ok, buf.getvalue(), stats
+
+
+def iter_process_results(category, files, jobs=1, profile=False, max_field_chars=0, time_budget=0,
+                         section_cache_path=None, refresh_sections=False):
+    """Yield (ok, output, stats) per file, in the order of ``files``.
+
+    With jobs > 1 the files fan out to a process pool; tasks carry only the
+    category name, and every worker compiles its own regexes on first use.
+
+    The memo counters, stage timings, write counts and section-cache
+    lookups are plain module state, so each worker keeps its own. Rather
+    than share them across processes, ``_process_file_captured`` snapshots
+    them around every file and returns the deltas in its stats, which the
+    parent adds up for the summary. The serial path takes the same route.
+    """
+    if profile:
+        profiling.enable()
+    worker = functools.partial(
+        _process_file_captured, category.name, max_field_chars=max_field_chars, time_budget=time_budget,
+        section_cache_path=section_cache_path, refresh_sections=refresh_sections,
+    )
+    if jobs <= 1:
+        for f in files:
+            yield worker(f)
+        return
+    initializer = profiling.enable if profile else None
+    with ProcessPoolExecutor(max_workers=jobs, initializer=initializer) as pool:
+        yield from pool.map(worker, files, chunksize=max(1, len(files) // (jobs * 8)))
+
+
+def parser_fingerprint(category):
+    """Fingerprint of everything that decides a processed file of ``category``."""
+    rules = dict(category.rules, VALID_SEVERITIES=sorted(VALID_SEVERITIES), SEVERITY_RANK=SEVERITY_RANK)
+    # The schema validator decides the recorded pass/fail, so it is part of the key too;
+    # memo and section_cache sit between the parsers and the output they produce
+    sources = [
+        __file__, source_refs.__file__, vocab_matcher.__file__, memo.__file__, section_cache.__file__,
+        toxin_disk_validator.__file__,
+    ]
+    return build_manifest.fingerprint(sources + category.sources, rules)
+
+
+def file_fingerprint(category, fingerprint, raw_bytes):
+    """``fingerprint`` plus the digest of the overrides that apply to one raw file."""
+    if category.overrides_for is None:
+        return fingerprint
+    try:
+        data = json.loads(raw_bytes)
+    except ValueError:
+        # Unreadable input: the worker quarantines it, no overrides apply
+        data = None
+    applied = category.overrides_for(data) if isinstance(data, dict) else None
+    return dict(fingerprint, overrides=build_manifest.sha256_json(applied))
+
+
+# --- CLI ---
+
+def parse_args(category, argv=None):
+    parser = argparse.ArgumentParser(
+        description=f"Parse raw NotebookLM {category.name} answers into processed JSON."
+    )
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Worker processes to fan files out to (default: 1, serial)")
+    parser.add_argument("--force", action="store_true",
+                        help="Rebuild every file, ignoring the build manifest and the section cache")
+    parser.add_argument("--section-cache-size", type=int, default=section_cache.DEFAULT_MAX_ENTRIES,
+                        help="Parsed sections to keep cached between runs "
+                             f"(default: {section_cache.DEFAULT_MAX_ENTRIES}, 0 = no cache)")
+    parser.add_argument("--cache-stats", action="store_true",
+                        help="Report hit/miss counts of the memoized normalizers")
+    parser.add_argument("--profile", action="store_true",
+                        help="Report wall time and call counts per stage, and the ten slowest files")
+    parser.add_argument("--cprofile", metavar="OUT.prof",
+                        help="Write a cProfile dump of the whole run (parent process only with --jobs > 1)")
+    parser.add_argument("--max-field-chars", type=int, default=parse_guard.DEFAULT_MAX_FIELD_CHARS,
+                        help="Quarantine files with a longer raw response field "
+                             f"(default: {parse_guard.DEFAULT_MAX_FIELD_CHARS}, 0 = no limit)")
+    parser.add_argument("--time-budget", type=float, default=parse_guard.DEFAULT_TIME_BUDGET,
+                        help="Quarantine files that take longer to parse, in seconds "
+                             f"(default: {parse_guard.DEFAULT_TIME_BUDGET:g}, 0 = no limit)")
+    return parser.parse_args(argv)
+
+
+def run(category, argv=None):
+    """CLI entry point: process every raw file of ``category`` that needs it."""
+    args = parse_args(category, argv)
+    if args.jobs <= 0:
+        print("--jobs must be positive", file=sys.stderr)
+        sys.exit(2)
+    if args.section_cache_size < 0:
+        print("--section-cache-size must not be negative", file=sys.stderr)
+        sys.exit(2)
+    profiler = profiling.start_cprofile() if args.cprofile else None
+
+    files = sorted(glob.glob(os.path.join(category.input_dir, "*.json")))
+    manifest = build_manifest.load_manifest(category.manifest_path)
+    fingerprint = parser_fingerprint(category)
+    build_manifest.prune(manifest, (os.path.basename(f) for f in files))
+
+    passed = 0
+    failed = 0
+    skipped = 0
+    reasons = {}
+    todo = []
+    for f in files:
+        name = os.path.basename(f)
+        with open(f, "rb") as fh:
+            raw_bytes = fh.read()
+        input_sha = build_manifest.sha256_bytes(raw_bytes)
+        file_fp = file_fingerprint(category, fingerprint, raw_bytes)
+        if args.force:
+            reason = "forced"
+        else:
+            reason = build_manifest.rebuild_reason(
+                manifest, name, input_sha, file_fp, os.path.join(category.output_dir, name)
+            )
+        if reason is None:
+            entry = manifest["files"][name]
+            for warning in entry.get("warnings", []):
+                print(warning)
+            skipped += 1
+            if entry.get("ok"):
+                passed += 1
+            else:
+                failed += 1
+            continue
+        todo.append((f, input_sha, file_fp, reason))
+
+    cache_stats = {}
+    stage_stats = {}
+    write_stats = {}
+    sections = None
+    if category.section_cache is not None and args.section_cache_size:
+        sections = section_cache.Store(category.section_cache, args.section_cache_size)
+    file_seconds = []
+    quarantined = []
+    results = iter_process_results(
+        category, [f for f, _sha, _fp, _reason in todo], args.jobs, args.profile,
+        args.max_field_chars, args.time_budget,
+        section_cache_path=sections.path if sections is not None else None, refresh_sections=args.force,
+    )
+    for (f, input_sha, file_fp, reason), (ok, output, stats) in zip(todo, results):
+        sys.stdout.write(output)
+        memo.merge(cache_stats, stats["cache"])
+        profiling.merge(stage_stats, stats["stages"])
+        disk_writer.merge(write_stats, stats["writes"])
+        if sections is not None:
+            sections.merge(stats["sections"])
+        file_seconds.append((stats["seconds"], os.path.basename(f)))
+        name = os.path.basename(f)
+        if stats["quarantine"]:
+            # Dropped from the manifest, so the file is retried on the next run
+            manifest["files"].pop(name, None)
+            print(f"  QUARANTINE {name}: {stats['quarantine']}")
+            quarantined.append({"file": name, "reason": stats["quarantine"]})
+            failed += 1
+            continue
+        print(f"  rebuilt: {reason}")
+        reasons[reason] = reasons.get(reason, 0) + 1
+        warnings = [line for line in output.splitlines() if line.lstrip().startswith("WARN")]
+        build_manifest.record(
+            manifest, name, input_sha, file_fp, os.path.join(category.output_dir, name), ok, warnings
+        )
+        if ok:
+            passed += 1
+        else:
+            failed += 1
+    build_manifest.save_manifest(category.manifest_path, manifest)
+    parse_guard.write_report(category.quarantine_report, quarantined)
+    if sections is not None:
+        sections.save()
+
+    print(f"\nSummary: {passed} passed validation, {failed} failed")
+    rebuilt = ", ".join(f"{count} {reason}" for reason, count in sorted(reasons.items())) or "none"
+    print(f"Rebuilt {len(todo) - len(quarantined)} ({rebuilt}); skipped {skipped} unchanged")
+    print(f"Output files: {disk_writer.format_counts(write_stats)}")
+    if sections is not None:
+        print(sections.summary())
+    if quarantined:
+        print(f"Quarantined {len(quarantined)} (see {category.quarantine_report})")
+    if args.cache_stats:
+        print("\n".join(memo.format_stats(cache_stats)))
+    if args.profile:
+        print("\n".join(profiling.format_report(stage_stats, file_seconds)))
+    if profiler is not None:
+        profiling.dump_cprofile(profiler, args.cprofile)
+        print(f"cProfile stats written to {args.cprofile}")
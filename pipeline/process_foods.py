@@ -1,42 +1,21 @@
-import json
-import os
-import re
-import glob
-import sys
-
-try:
-    from jsonschema import Draft7Validator
-except ImportError:
-    Draft7Validator = None
-
-from paths import RAW_FOODS_DIR, PROCESSED_FOODS_DIR, TOXIN_DISK_SCHEMA
-
-INPUT_DIR = str(RAW_FOODS_DIR)
-OUTPUT_DIR = str(PROCESSED_FOODS_DIR)
-
-_schema_validator = None
-
-
-def _get_validator():
-    global _schema_validator
-    if _schema_validator is not None:
-        return _schema_validator
-    if Draft7Validator is None:
-        print("jsonschema not installed; validation disabled. pip install jsonschema", file=sys.stderr)
-        return None
-    if not TOXIN_DISK_SCHEMA.exists():
-        print(f"schema not found at {TOXIN_DISK_SCHEMA}; validation disabled", file=sys.stderr)
-        return None
-    with open(TOXIN_DISK_SCHEMA, "r") as fh:
-        _schema_validator = Draft7Validator(json.load(fh))
-    return _schema_validator
+"""Food category for the processing engine: vocabulary and parsers.
 
+Run it to process ``data/foods/`` into ``data/foods_processed/``; see
+``process_engine.py`` for the shared driver and its flags.
+"""
+import re
 
-def _atomic_write_json(target_path: str, payload: dict) -> None:
-    tmp_path = target_path + ".tmp"
-    with open(tmp_path, "w") as fh:
-        json.dump(payload, fh, indent=2)
-    os.replace(tmp_path, target_path)
+import memo
+import process_engine
+import profiling
+import section_cache
+import source_refs
+import vocab_matcher
+from process_engine import clean_name, clean_text, normalize_severity, strip_header, strip_trailing_period
+from vocab_matcher import SubstringMatcher
+from paths import (
+    RAW_FOODS_DIR, PROCESSED_FOODS_DIR, PROCESS_FOODS_MANIFEST, PROCESS_FOODS_QUARANTINE, PROCESS_FOODS_SECTIONS,
+)
 
 KNOWN_PARTS = [
     "leaf", "leaves", "bulb", "bulbs", "flower", "flowers", "pollen", 
@@ -46,9 +25,6 @@ KNOWN_PARTS = [
     "flesh", "juice", "peel"
 ]
 
-VALID_SEVERITIES = {"mild", "moderate", "severe", "fatal"}
-SEVERITY_RANK = {"mild": 1, "moderate": 2, "severe": 3, "fatal": 4}
-
 BODY_SYSTEM_MAP = {
     "gastrointestinal": "Gastrointestinal",
     "gi": "Gastrointestinal",
@@ -71,30 +47,11 @@ BODY_SYSTEM_MAP = {
     "musculoskeletal": "Musculoskeletal"
 }
 
-def clean_text(text):
-    if not text:
-        return None
-    return re.sub(r'^["\']|["\']$', '', text.strip())
-
-def strip_header(text):
-    if not text:
-        return ""
-    if "============================================================" in text:
-        return text.split("============================================================")[-1].strip()
-    return text
+TOXIC_PART_MATCHER = SubstringMatcher(KNOWN_PARTS)
+normalize_body_system = process_engine.body_system_normalizer(BODY_SYSTEM_MAP)
 
 def strip_source_refs(text):
-    if not text:
-        return text
-    text = re.sub(r'[\n\r]\s*[•◦\-\*]?\s*Sources?\s*:\s*[\d,\s\.]+\s*$', '', text, flags=re.IGNORECASE)
-    text = re.sub(r'\s*Sources?\s*:\s*[\d,\s\.]+\s*$', '', text, flags=re.IGNORECASE)
-    text = re.sub(r'(?<=[a-zA-Z\)\]])[\d,]+\s*$', '', text)
-    text = re.sub(r"Would you like me to.*", "", text, flags=re.IGNORECASE)
-    text = re.sub(r'\n\s*-{3,}.*$', '', text, flags=re.DOTALL)
-    text = re.sub(r'[\n\r]\s*◦\s*(?:Highest |Distribution|Concentration).*$', '', text, flags=re.DOTALL)
-    text = re.sub(r'The provided text does not contain.*$', '', text, flags=re.IGNORECASE | re.DOTALL)
-    text = re.sub(r'[\d,]+\.+\s*$', '', text.rstrip())
-    return text.strip()
+    return source_refs.strip_source_refs(text, source_refs.FOOD_RULES)
 
 def clean_toxin_name(val):
     if not val:
@@ -109,51 +66,7 @@ def clean_concentration_notes(val):
     val = re.sub(r'\n\d+\.\s.*$', '', val, flags=re.DOTALL)
     return strip_source_refs(val)
 
-def strip_trailing_period(val):
-    if not val:
-        return val
-    val = val.replace('…', '...').replace('．', '.')
-    val = re.sub(r'[\d,]+\.+\s*$', '', val.rstrip())
-    return re.sub(r'[^\w)]+$', '', val).strip()
-
-def clean_name(name, max_len=150):
-    if not name or len(name) <= max_len:
-        return name
-    truncated = name[:max_len]
-    for sep in [' (', ', ', ' — ', ' - ']:
-        idx = truncated.rfind(sep)
-        if idx > 20: return truncated[:idx].rstrip()
-    return truncated.rstrip()
-
-def normalize_severity(val):
-    if not val:
-        return None
-    cleaned = val.strip().lower().rstrip('.')
-    if cleaned in VALID_SEVERITIES:
-        return cleaned
-    found = [sev for sev in VALID_SEVERITIES if sev in cleaned]
-    if found:
-        return max(found, key=lambda s: SEVERITY_RANK[s])
-    return None
-
-def normalize_body_system(val):
-    if not val:
-        return None
-    cleaned = val.strip().rstrip('.')
-    if cleaned.lower() in BODY_SYSTEM_MAP:
-        return BODY_SYSTEM_MAP[cleaned.lower()]
-    for part in re.split(r'[/,]', cleaned):
-        part_clean = re.sub(r'\(.*?\)', '', part.strip().lower()).strip()
-        if part_clean in BODY_SYSTEM_MAP:
-            return BODY_SYSTEM_MAP[part_clean]
-        for key, canonical in BODY_SYSTEM_MAP.items():
-            if key in part_clean:
-                return canonical
-    for key, canonical in BODY_SYSTEM_MAP.items():
-        if key in cleaned.lower():
-            return canonical
-    return cleaned
-
+@memo.memoized
 def clean_family(val):
     if not val:
         return None
@@ -174,6 +87,7 @@ def clean_chemical_formula(val):
         return None
     return cleaned
 
+@memo.memoized
 def clean_onset(val):
     if not val: return val
     val = re.sub(r'\n\d+\.\s.*$', '', val, flags=re.DOTALL)
@@ -204,9 +118,8 @@ def parse_toxic_parts(text):
     text = strip_header(text)
     parts = set()
     lower_text = text.lower()
-    for known in KNOWN_PARTS:
-        if known in lower_text:
-            parts.add(known.capitalize())
+    for known in TOXIC_PART_MATCHER.matches(lower_text):
+        parts.add(known.capitalize())
             
     # For foods, maybe some arbitrary list is provided by NotebookLM
     # If the standard ones aren't found, try to extract comma-separated values if short
@@ -307,73 +220,88 @@ def parse_treatments(text):
             treatments.append(t)
     return treatments
 
-def main():
-    if not os.path.exists(OUTPUT_DIR):
-        os.makedirs(OUTPUT_DIR)
-
-    files = glob.glob(os.path.join(INPUT_DIR, "*.json"))
-    print(f"🔄 Processing {len(files)} generated responses...")
-
-    validator = _get_validator()
-    passed = 0
-    failed = 0
-
-    for fp in files:
-        with open(fp, "r") as f:
-            data = json.load(f)
-
-        raw = data.get("raw_responses", {})
-        processed = {
-            "plant": data.get("plant", {}),
-            "sources": []
-        }
+def postprocess(processed, data):
+    processed["plant"]["family"] = clean_family(processed.get("family", data["plant"].get("family")))
+    if "family" in processed: del processed["family"]
+    processed["plant"]["description"] = processed.get("description", strip_source_refs(processed.get("plant", {}).get("description")))
+    if "description" in processed: del processed["description"]
+
+    for t in processed["toxins"]:
+        t["name"] = strip_trailing_period(clean_name(clean_toxin_name(t.get("name")), 150))
+        t["chemical_formula"] = clean_chemical_formula(t.get("chemical_formula"))
+        t["description"] = strip_source_refs(t.get("description"))
+        t["concentration_notes"] = clean_concentration_notes(t.get("concentration_notes"))
+
+    for s in processed["symptoms"]:
+        s["name"] = clean_name(strip_trailing_period(strip_source_refs(s.get("name"))), 150)
+        s["severity"] = normalize_severity(s.get("severity")) or "moderate"
+        s["body_system"] = s.get("body_system", "Metabolic")
+        s["onset"] = clean_onset(s.get("onset"))
+        s["notes"] = strip_source_refs(s.get("notes"))
+
+    for t in processed["treatments"]:
+        t["name"] = clean_name(strip_trailing_period(strip_source_refs(t.get("name"))), 200)
+        t["description"] = strip_source_refs(t.get("description"))
+        t["notes"] = strip_source_refs(t.get("notes"))
+    return processed
+
+# Raw response sections, each cached on its own parser's fingerprint
+BASICS = process_engine.section("basics", parse_basics)
+TOXIC_PARTS = process_engine.section(
+    "toxic_parts", parse_toxic_parts, code=(vocab_matcher,), rules={"KNOWN_PARTS": KNOWN_PARTS}
+)
+TOXINS = process_engine.section(
+    "toxins", parse_toxins,
+    code=(clean_name, strip_trailing_period, strip_source_refs, source_refs),
+    rules={"TRAILING_NON_WORD_RE": process_engine.TRAILING_NON_WORD_RE.pattern},
+)
+SYMPTOMS = process_engine.section(
+    "symptoms", parse_symptoms,
+    code=(process_engine.body_system_normalizer, vocab_matcher), rules={"BODY_SYSTEM_MAP": BODY_SYSTEM_MAP},
+)
+TREATMENTS = process_engine.section("treatments", parse_treatments)
+
+def parse_raw(data):
+    """Parse one raw NotebookLM entry into the processed record (no I/O)."""
+    raw = data.get("raw_responses", {})
+    processed = {
+        "plant": data.get("plant", {}),
+        "sources": []
+    }
+
+    with profiling.stage("parse_basics"):
+        processed.update(section_cache.parse(BASICS, raw.get("basics", "")))
+    with profiling.stage("parse_toxic_parts"):
+        processed["toxic_parts"] = section_cache.parse(TOXIC_PARTS, raw.get("toxic_parts", ""))
+    with profiling.stage("parse_toxins"):
+        processed["toxins"] = section_cache.parse(TOXINS, raw.get("toxins", ""))
+    with profiling.stage("parse_symptoms"):
+        processed["symptoms"] = section_cache.parse(SYMPTOMS, raw.get("symptoms", ""))
+    with profiling.stage("parse_treatments"):
+        processed["treatments"] = section_cache.parse(TREATMENTS, raw.get("treatments", ""))
+
+    with profiling.stage("postprocess"):
+        return postprocess(processed, data)
+
+CATEGORY = process_engine.Category(
+    "food",
+    parse_raw,
+    input_dir=RAW_FOODS_DIR,
+    output_dir=PROCESSED_FOODS_DIR,
+    manifest_path=PROCESS_FOODS_MANIFEST,
+    quarantine_report=PROCESS_FOODS_QUARANTINE,
+    section_cache=PROCESS_FOODS_SECTIONS,
+    normalizers=(normalize_body_system, clean_family, clean_onset),
+    rules={"KNOWN_PARTS": KNOWN_PARTS, "BODY_SYSTEM_MAP": BODY_SYSTEM_MAP},
+    sources=[__file__],
+)
+
+def process_record(data, max_field_chars=0, time_budget=0):
+    """Parse and validate one raw entry in memory; see process_engine.process_record."""
+    return process_engine.process_record(CATEGORY, data, max_field_chars, time_budget)
 
-        processed.update(parse_basics(raw.get("basics", "")))
-        processed["toxic_parts"] = parse_toxic_parts(raw.get("toxic_parts", ""))
-        processed["toxins"] = parse_toxins(raw.get("toxins", ""))
-        processed["symptoms"] = parse_symptoms(raw.get("symptoms", ""))
-        processed["treatments"] = parse_treatments(raw.get("treatments", ""))
-
-        processed["plant"]["family"] = clean_family(processed.get("family", data["plant"].get("family")))
-        if "family" in processed: del processed["family"]
-        processed["plant"]["description"] = processed.get("description", strip_source_refs(processed.get("plant", {}).get("description")))
-        if "description" in processed: del processed["description"]
-
-        for t in processed["toxins"]:
-            t["name"] = strip_trailing_period(clean_name(clean_toxin_name(t.get("name")), 150))
-            t["chemical_formula"] = clean_chemical_formula(t.get("chemical_formula"))
-            t["description"] = strip_source_refs(t.get("description"))
-            t["concentration_notes"] = clean_concentration_notes(t.get("concentration_notes"))
-
-        for s in processed["symptoms"]:
-            s["name"] = clean_name(strip_trailing_period(strip_source_refs(s.get("name"))), 150)
-            s["severity"] = normalize_severity(s.get("severity")) or "moderate"
-            s["body_system"] = s.get("body_system", "Metabolic")
-            s["onset"] = clean_onset(s.get("onset"))
-            s["notes"] = strip_source_refs(s.get("notes"))
-
-        for t in processed["treatments"]:
-            t["name"] = clean_name(strip_trailing_period(strip_source_refs(t.get("name"))), 200)
-            t["description"] = strip_source_refs(t.get("description"))
-            t["notes"] = strip_source_refs(t.get("notes"))
-
-        out_fp = os.path.join(OUTPUT_DIR, os.path.basename(fp))
-        _atomic_write_json(out_fp, processed)
-
-        if validator is None:
-            passed += 1
-            continue
-        errors = sorted(validator.iter_errors(processed), key=lambda e: list(e.absolute_path))
-        if errors:
-            first = errors[0]
-            loc = "/".join(str(p) for p in first.absolute_path) or "<root>"
-            print(f"  WARN {os.path.basename(fp)}: {loc}: {first.message}")
-            failed += 1
-        else:
-            passed += 1
-
-    print(f"\nSummary: {passed} passed validation, {failed} failed")
-    print(f"✅ Processed output written to {OUTPUT_DIR}/")
+def main():
+    process_engine.run(CATEGORY)
 
 if __name__ == "__main__":
     main()
@@ -1,42 +1,23 @@
-import json
-import os
-import re
-import glob
-import sys
-
-try:
-    from jsonschema import Draft7Validator
-except ImportError:
-    Draft7Validator = None
-
-from paths import RAW_PLANTS_DIR, PROCESSED_PLANTS_DIR, TOXIN_DISK_SCHEMA
-
-INPUT_DIR = str(RAW_PLANTS_DIR)
-OUTPUT_DIR = str(PROCESSED_PLANTS_DIR)
-
-_schema_validator = None
-
-
-def _get_validator():
-    global _schema_validator
-    if _schema_validator is not None:
-        return _schema_validator
-    if Draft7Validator is None:
-        print("jsonschema not installed; validation disabled. pip install jsonschema", file=sys.stderr)
-        return None
-    if not TOXIN_DISK_SCHEMA.exists():
-        print(f"schema not found at {TOXIN_DISK_SCHEMA}; validation disabled", file=sys.stderr)
-        return None
-    with open(TOXIN_DISK_SCHEMA, "r") as fh:
-        _schema_validator = Draft7Validator(json.load(fh))
-    return _schema_validator
+"""Plant category for the processing engine: vocabulary, overrides and parsers.
 
+Run it to process ``data/plants/`` into ``data/plants_processed/``; see
+``process_engine.py`` for the shared driver and its flags.
+"""
+import re
 
-def _atomic_write_json(target_path: str, payload: dict) -> None:
-    tmp_path = target_path + ".tmp"
-    with open(tmp_path, "w") as fh:
-        json.dump(payload, fh, indent=2)
-    os.replace(tmp_path, target_path)
+import memo
+import overrides
+import process_engine
+import profiling
+import section_cache
+import source_refs
+import vocab_matcher
+from process_engine import clean_name, clean_text, normalize_severity, strip_header, strip_trailing_period
+from vocab_matcher import WordMatcher
+from paths import (
+    PLANT_OVERRIDES, RAW_PLANTS_DIR, PROCESSED_PLANTS_DIR,
+    PROCESS_PLANTS_MANIFEST, PROCESS_PLANTS_QUARANTINE, PROCESS_PLANTS_SECTIONS,
+)
 
 # Known toxic parts keys to search for if extraction fails
 KNOWN_PARTS = [
@@ -47,11 +28,6 @@ KNOWN_PARTS = [
 
 # --- Post-processing cleanup ---
 
-VALID_SEVERITIES = {"mild", "moderate", "severe", "fatal"}
-
-# Severity ranking for picking the highest from ranges like "Mild to Severe"
-SEVERITY_RANK = {"mild": 1, "moderate": 2, "severe": 3, "fatal": 4}
-
 # Header labels that should never be used as actual values
 HEADER_LABELS = {
     "botanical family", "brief description", "description",
@@ -91,130 +67,17 @@ BODY_SYSTEM_MAP = {
     "multisystem": "Metabolic"
 }
 
+TOXIC_PART_MATCHER = WordMatcher(KNOWN_PARTS)
+normalize_body_system = process_engine.body_system_normalizer(BODY_SYSTEM_MAP)
 
-# Manual overrides for plants where source data is consistently missing or poor
-MANUAL_FAMILIES = {
-    "Crassula arborescens": "Crassulaceae",
-    "Crassula arborescens or Crassula": "Crassulaceae",
-    "Asparagus densiflorus": "Asparagaceae",
-    "Celastrus scandens": "Celastraceae",
-    "Dianthus caryophyllus": "Caryophyllaceae",
-    "Scadoxus spp.": "Amaryllidaceae",
-    "Hyacinthoides non-scripta": "Asparagaceae",
-    "Alocasia reginula": "Araceae",
-    "Capsicum annuum": "Solanaceae",
-    "Ricinus communis": "Euphorbiaceae",
-    "Matricaria chamomilla": "Asteraceae",
-    "Allium schoenoprasum": "Amaryllidaceae",
-    "Helleborus niger": "Ranunculaceae",
-    "Cinnamomum verum": "Lauraceae",
-    "Citrus spp.": "Rutaceae",
-    "Syzygium aromaticum": "Myrtaceae",
-    "Darlingtonia californica": "Sarraceniaceae",
-    "Eucalyptus spp.": "Myrtaceae",
-    "Rumex spp.": "Polygonaceae",
-    "Clivia miniata": "Amaryllidaceae",
-    "Allium sativum": "Amaryllidaceae",
-    "Digitalis purpurea": "Plantaginaceae",
-    "Gardenia jasminoides": "Rubiaceae",
-    "Lyonia spp.": "Ericaceae",
-    "Gladiolus spp.": "Iridaceae",
-    "Lonicera spp.": "Caprifoliaceae",
-    "Agastache spp.": "Lamiaceae",
-    "Hydrangea spp.": "Hydrangeaceae",
-    "Nandina spp.": "Berberidaceae",
-    "Asclepias spp.": "Apocynaceae",
-    "Kalmia latifolia": "Ericaceae",
-    "Monstera deliciosa or Monstera adansonii": "Araceae",
-    "Ipomoea spp.": "Convolvulaceae",
-    "Phoradendron spp. or Viscum": "Santalaceae",
-    "Allium cepa": "Amaryllidaceae",
-    "Cercocarpus spp.": "Rosaceae",
-    "Nerium oleander": "Apocynaceae",
-    "Solanum spp.": "Solanaceae",
-    "Mentha citrata": "Lamiaceae",
-    "Spathiphyllum spp. or Spathiphyllum wallisii": "Araceae",
-    "Tradescantia spathacea": "Commelinaceae",
-    "Alstroemeria spp.": "Alstroemeriaceae",
-    "Paeonia spp.": "Paeoniaceae",
-    "Nandina Photina spp.": "Rosaceae",
-    "Pinus spp.": "Pinaceae",
-    "Papaver spp.": "Papaveraceae",
-    "Chrysanthemum morifolium": "Asteraceae",
-    "Solanum tuberosum": "Solanaceae",
-    "Solanum lycopersicum": "Solanaceae",
-    "Zephyranthes drummondii": "Amaryllidaceae",
-    "Rheum rhabarbarum": "Polygonaceae",
-    "Senecio jacobaea or Tanacetum vulgare": "Asteraceae",
-    "Brunfelsia pauciflora floribunda": "Solanaceae",
-    "Zamioculcas zamiifolia": "Araceae"
-}
-
-MANUAL_DESCRIPTIONS = {
-    "Hyacinthoides non-scripta": "Bulbous perennial plant with bell-shaped blue flowers, native to western Europe.",
-    "Asparagus densiflorus": "An evergreen perennial plant with fern-like foliage, commonly used as a houseplant. Toxic to cats.",
-    "Celastrus scandens": "A woody vine known as American Bittersweet, producing orange-yellow berries. All parts are toxic.",
-    "Dianthus caryophyllus": "Carnations are popular herbaceous flowering plants, often used in bouquets, with ruffled petals.",
-    "Scadoxus spp.": "Also known as Blood Lily, a bulbous plant with large spherical flower heads. Highly toxic.",
-    "Matricaria chamomilla": "An aromatic herb in the daisy family (Asteraceae). Contains volatile oils and other compounds that can be toxic to cats.",
-    "Cinnamomum verum": "A small evergreen tree native to Sri Lanka, its inner bark is used to make cinnamon spice. Contains essential oils.",
-    "Darlingtonia californica": "Carnivorous pitcher plant native to Northern California and Oregon, resembling a cobra.",
-    "Eucalyptus spp.": "Fast-growing evergreen trees and shrubs native to Australia, known for their aromatic leaves containing essential oils.",
-    "Rumex spp.": "Perennial flowering plant in the family Polygonaceae, commonly known as curly dock or yellow dock.",
-    "Clivia miniata": "A flowering plant native to South Africa, popular as a houseplant for its vibrant orange or yellow flowers.",
-    "Allium sativum": "Bulbous flowering plant in the onion genus. Highly toxic to cats due to N-propyl disulfide.",
-    "Digitalis purpurea": "Common biennial plant known as Foxglove, containing cardiac glycosides.",
-    "Gardenia jasminoides": "Evergreen flowering plant of the coffee family, known for its fragrant white flowers.",
-    "Lyonia spp.": "Woody shrubs in the heath family, containing gryanotoxins.",
-    "Gladiolus spp.": "Perennial cormous flowering plants in the iris family, known for tall flower spikes.",
-    "Lonicera spp.": "Arching shrubs or twining vines with fragrant, tubular flowers and red or black berries.",
-    "Agastache spp.": "Aromatic herbaceous perennials in the mint family, known for spikes of tubular flowers.",
-    "Hydrangea spp.": "Deciduous shrubs known for large flower heads in shades of pink, blue, or white.",
-    "Kalmia latifolia": "A broadleaved evergreen shrub in the heath family, native to the eastern United States. Contains grayanotoxins.",
-    "Ipomoea spp.": "Fast-growing climbing vines with trumpet-shaped flowers. Seeds contain lysergic acid amides.",
-    "Cercocarpus spp.": "Mountain mahogany; a genus of shrubs and small trees in the rose family, native to the western United States and northern Mexico.",
-    "Spathiphyllum spp. or Spathiphyllum wallisii": "Evergreen herbaceous perennial plant with large leaves and white spathe flowers, commonly grown as a houseplant.",
-    "Tradescantia spathacea": "A herbaceous perennial plant with dark green leaves that are purple underneath, commonly known as Oyster Plant.",
-    "Paeonia spp.": "Herbaceous perennial plants and woody shrubs known for large, showy, often fragrant flowers. Commonly grown in gardens.",
-    "Nandina Photina spp.": "Evergreen shrubs known for their bright red new foliage and clusters of small white flowers.",
-    "Pinus spp.": "Evergreen coniferous resinous trees growing across the Northern Hemisphere. Toxic to cats."
-}
 
-MANUAL_TOXIC_PARTS = {
-    "Aglaonema modestum": ["Entire Plant", "Leaf", "Stem"],
-    "Monstera adansonii": ["Leaf", "Stem"],
-    "Prunus serotina": ["Stem", "Leaf", "Seed"],
-    "Prunus laurocerasus": ["Leaf", "Seed", "Berry"],
-    "Cinnamomum verum": ["Sap", "Bark"],
-    "Darlingtonia californica": ["Leaf"],
-    "Paeonia spp.": ["Root", "Bark", "Flower", "Seed"],
-    "Zephyranthes drummondii": ["Bulb", "Leaf", "Stem", "Flower"],
-    "Zamioculcas zamiifolia": ["Entire Plant"]
-}
+# Manual overrides for plants where source data is consistently missing or
+# poor (families, descriptions, toxic parts), keyed by scientific name
+OVERRIDES = overrides.Overrides(PLANT_OVERRIDES, genus_wide=("families",))
 
 def strip_source_refs(text):
     """Remove trailing source references like '\n• Sources:1,2,3' or 'Source:1'."""
-    if not text:
-        return text
-    # Remove patterns like: \n  • Source:1,2,3  or  Sources:1,2  or  ◦ Source:1...
-    text = re.sub(r'[\n\r]\s*[•◦\u2022\u25e6\-\*\u25aa]?\s*Sources?\s*:\s*[\d,\s\.]+\s*$', '', text, flags=re.IGNORECASE)
-    # Also inline at end: "...some text. Sources:1,2,3" or "Source:1,2"
-    text = re.sub(r'\s*Sources?\s*:\s*[\d,\s\.]+\s*$', '', text, flags=re.IGNORECASE)
-    # Remove trailing citation numbers (e.g. "...text1,2,3" or "...text1")
-    text = re.sub(r'(?<=[a-zA-Z\)\]])[\d,]+\s*$', '', text)
-    # Remove lines that are just citation refs: "\n  ◦ Sources:1,2,3"
-    text = re.sub(r'[\n\r]\s*[•◦\u2022\u25e6\u25aa\-\*]?\s*Sources?\s*:\s*[\d,\s\.]+', '', text, flags=re.IGNORECASE)
-    # Remove "Would you like me to..." chatbot questions
-    text = re.sub(r"Would you like me to.*", "", text, flags=re.IGNORECASE)
-    # Remove ◦-prefixed continuation lines (source artifacts in concentration_notes)
-    text = re.sub(r'[\n\r]\s*◦\s*(?:Highest |Distribution|Concentration).*$', '', text, flags=re.DOTALL)
-    # Remove horizontal rules and everything after
-    text = re.sub(r'\n\s*-{3,}.*$', '', text, flags=re.DOTALL)
-    # Remove trailing citation+period combos like "identified1." or "text1,2...."
-    text = re.sub(r'[\d,]+\.+\s*$', '', text.rstrip())
-    text = re.sub(r'The provided text does not contain.*$', '', text, flags=re.IGNORECASE | re.DOTALL)
-    
-    return text.strip()
+    return source_refs.strip_source_refs(text, source_refs.PLANT_RULES)
 
 
 def clean_toxin_name(val):
@@ -240,93 +103,7 @@ def clean_concentration_notes(val):
     return strip_source_refs(val)
 
 
-def strip_trailing_period(val):
-    if not val:
-        return val
-    # Standardize ellipsis to dots
-    val = val.replace('…', '...').replace('．', '.')
-    # Strip citation refs again just in case
-    val = re.sub(r'[\d,]+\.+\s*$', '', val.rstrip())
-    # Strip everything non-word at end except ')'
-    return re.sub(r'[^\w)]+$', '', val).strip()
-
-
-def clean_name(name, max_len=150):
-    """Truncate a name that exceeds max_len by cutting at a natural boundary."""
-    if not name or len(name) <= max_len:
-        return name
-    # Try to cut at a parenthetical or comma
-    truncated = name[:max_len]
-    # Find last natural break point
-    for sep in [' (', ', ', ' — ', ' - ']:
-        idx = truncated.rfind(sep)
-        if idx > 20:  # Don't truncate too aggressively
-            return truncated[:idx].rstrip()
-    return truncated.rstrip()
-
-
-def normalize_severity(val):
-    """Normalize a severity value to one of: mild, moderate, severe, fatal.
-    
-    Handles cases like 'Mild to Severe.', 'Moderate to Severe.', 'Potentially Severe.'
-    by extracting valid severity words and picking the highest.
-    """
-    if not val:
-        return None
-    cleaned = val.strip().lower().rstrip('.')
-    
-    # Direct match
-    if cleaned in VALID_SEVERITIES:
-        return cleaned
-    
-    # Find all valid severity words in the string
-    found = []
-    for sev in VALID_SEVERITIES:
-        if sev in cleaned:
-            found.append(sev)
-    
-    if found:
-        # Pick the highest severity mentioned
-        return max(found, key=lambda s: SEVERITY_RANK[s])
-    
-    return None  # Can't determine — will be flagged by verify
-
-
-def normalize_body_system(val):
-    """Normalize body system to a recognized single value.
-    
-    Handles compound values like 'Dermal (Skin).' or 'Gastrointestinal / Neuromuscular.'
-    by finding the first recognized system.
-    """
-    if not val:
-        return None
-    cleaned = val.strip().rstrip('.')
-    
-    # Try direct match first
-    if cleaned.lower() in BODY_SYSTEM_MAP:
-        return BODY_SYSTEM_MAP[cleaned.lower()]
-    
-    # Split on / and try each part
-    for part in re.split(r'[/,]', cleaned):
-        part_clean = part.strip().lower()
-        # Strip parenthetical
-        part_clean = re.sub(r'\(.*?\)', '', part_clean).strip()
-        if part_clean in BODY_SYSTEM_MAP:
-            return BODY_SYSTEM_MAP[part_clean]
-        # Try word-level matching
-        for key, canonical in BODY_SYSTEM_MAP.items():
-            if key in part_clean:
-                return canonical
-    
-    # Last resort: search the whole string for any known keyword
-    lower_val = cleaned.lower()
-    for key, canonical in BODY_SYSTEM_MAP.items():
-        if key in lower_val:
-            return canonical
-    
-    return cleaned  # Return as-is if nothing matches
-
-
+@memo.memoized
 def clean_family(val):
     """Validate family field: extract actual family name from prose if needed."""
     if not val:
@@ -393,6 +170,7 @@ def clean_chemical_formula(val):
     return cleaned
 
 
+@memo.memoized
 def clean_onset(val):
     """Truncate onset at trailing numbered items like '\n5. Additional'."""
     if not val:
@@ -414,16 +192,13 @@ def clean_onset(val):
     return val
 
 
-def postprocess(processed):
-    """Apply all cleanup transformations to a processed plant dict."""
-    # --- Plant-level fields ---
-    plant = processed.get("plant", {})
-    
-    # Fix Honeysuckle scientific name (Must be before manual family check)
+def fix_scientific_name(plant):
+    """Fill in scientific names the raw answers leave blank for some common names."""
+    # Fix Honeysuckle scientific name
     if plant.get("common_name") == "Honeysuckle" and not plant.get("scientific_name"):
         plant["scientific_name"] = "Lonicera spp."
     
-    # Fix Hummingbird Mint scientific name (Must be before manual family check)
+    # Fix Hummingbird Mint scientific name
     if plant.get("common_name") == "Hummingbird Mint" and not plant.get("scientific_name"):
         plant["scientific_name"] = "Agastache spp."
 
@@ -498,7 +273,16 @@ def postprocess(processed):
     # Fix ZZ Plant scientific name
     if plant.get("common_name") == "ZZ Plant" and (not plant.get("scientific_name") or str(plant.get("scientific_name")).lower() in ["none", "n/a", "unknown", "zamioculcas"]):
         plant["scientific_name"] = "Zamioculcas zamiifolia"
+    return plant
+
 
+def postprocess(processed):
+    """Apply all cleanup transformations to a processed plant dict."""
+    # --- Plant-level fields ---
+    plant = processed.get("plant", {})
+
+    # Must come before the override lookups, which go by scientific name
+    fix_scientific_name(plant)
     plant["family"] = clean_family(plant.get("family"))
     
     # --- Description Cleaning ---
@@ -515,19 +299,22 @@ def postprocess(processed):
     sci_name = plant.get("scientific_name", "")
     current_desc = plant.get("description", "")
     
-    if sci_name in MANUAL_FAMILIES and not plant.get("family"):
-        plant["family"] = MANUAL_FAMILIES[sci_name]
-    
-    if sci_name in MANUAL_DESCRIPTIONS:
-        # Override if missing, short, or technically unhelpful
-        if not current_desc or len(current_desc) < 20 or "limited information" in current_desc.lower() or "does not contain" in current_desc.lower():
-            plant["description"] = MANUAL_DESCRIPTIONS[sci_name]
-
-    # Manual Toxic Parts
-    if sci_name in MANUAL_TOXIC_PARTS:
-        # Use override if empty or if we trust the manual list more
-        if not processed.get("toxic_parts"):
-            processed["toxic_parts"] = MANUAL_TOXIC_PARTS[sci_name]
+    if not plant.get("family"):
+        family = OVERRIDES.get("families", sci_name)
+        if family:
+            plant["family"] = family
+
+    # Override if missing, short, or technically unhelpful
+    if not current_desc or len(current_desc) < 20 or "limited information" in current_desc.lower() or "does not contain" in current_desc.lower():
+        description = OVERRIDES.get("descriptions", sci_name)
+        if description:
+            plant["description"] = description
+
+    # Manual Toxic Parts: only when extraction found none
+    if not processed.get("toxic_parts"):
+        toxic_parts = OVERRIDES.get("toxic_parts", sci_name)
+        if toxic_parts:
+            processed["toxic_parts"] = list(toxic_parts)
 
     # Handle Non-Toxic / Mechanical Irritants
     if sci_name == "Schlumbergera spp.":
@@ -776,27 +563,6 @@ def postprocess(processed):
     return processed
 
 
-def clean_text(text):
-    if not text:
-        return None
-    text = text.strip()
-    # Remove leading/trailing quotes
-    text = re.sub(r'^["\']|["\']$', '', text)
-    return text
-
-def strip_header(text):
-    if not text:
-        return ""
-    # Look for the standard separator used by ask_question.py
-    separator = "============================================================"
-    if separator in text:
-        # Take the part AFTER the last separator
-        parts = text.split(separator)
-        return parts[-1].strip()
-    return text
-
-
-
 def parse_basics(text):
     text = strip_header(text)
     data = {}
@@ -831,139 +597,222 @@ def parse_toxic_parts(text):
     found_parts = set()
     lower_text = text.lower()
     
-    for part in KNOWN_PARTS:
-        # Simple word match
-        if re.search(r"\b" + re.escape(part) + r"\b", lower_text):
-            # Normalize
-            if part in ["leaves"]: part = "Leaf"
-            elif part in ["bulbs"]: part = "Bulb"
-            elif part in ["flowers"]: part = "Flower"
-            elif part in ["stems"]: part = "Stem"
-            elif part in ["roots"]: part = "Root"
-            elif part in ["seeds"]: part = "Seed"
-            elif part in ["fruits", "berries", "berry"]: part = "Fruit"
-            elif part in ["whole plant"]: part = "Entire Plant"
-            else: part = part.title()
-            found_parts.add(part)
+    # Whole-word matches, reported in KNOWN_PARTS order
+    for part in TOXIC_PART_MATCHER.matches(lower_text):
+        # Normalize
+        if part in ["leaves"]: part = "Leaf"
+        elif part in ["bulbs"]: part = "Bulb"
+        elif part in ["flowers"]: part = "Flower"
+        elif part in ["stems"]: part = "Stem"
+        elif part in ["roots"]: part = "Root"
+        elif part in ["seeds"]: part = "Seed"
+        elif part in ["fruits", "berries", "berry"]: part = "Fruit"
+        elif part in ["whole plant"]: part = "Entire Plant"
+        else: part = part.title()
+        found_parts.add(part)
             
     return list(found_parts)
 
+# Field maps for parse_list_items: target_key -> label regexes, in priority order.
+TOXIN_FIELD_MAPS = {
+    "name": [r"Name of the compound:?", r"1\.\s*Name:?", r"•\s*Name(?: of the compound)?:?"],
+    "chemical_formula": [r"Chemical formula:?", r"2\.\s*Chemical formula:?", r"•\s*Chemical formula:?"],
+    "description": [r"mechanism of action:?", r"3\.\s*Brief description:?", r"•\s*Brief description:?", r"•\s*Mechanism(?: of action)?:?"],
+    "concentration_notes": [r"concentration or potency:?", r"4\.\s*Any notes:?", r"•\s*Any notes:?", r"•\s*Toxicity notes:?", r"•\s*Notes on concentration:?"]
+}
+
+SYMPTOM_FIELD_MAPS = {
+    "name": [r"Symptom name:?", r"1\.\s*Symptom name:?", r"•\s*Symptom name:?"],
+    "body_system": [r"Affected body system:?", r"2\.\s*Affected body system:?", r"•\s*Affected body system:?"],
+    "severity": [r"Severity:?", r"3\.\s*Severity:?", r"•\s*Severity:?"],
+    "onset": [r"Typical onset time:?", r"4\.\s*Typical onset time:?", r"•\s*Typical onset time:?", r"•\s*Onset:?"],
+    "notes": [r"clinical notes:?", r"5\.\s*Any additional:?", r"•\s*Additional:?", r"•\s*Notes:?", r"•\s*Clinical notes:?"]
+}
+
+TREATMENT_FIELD_MAPS = {
+    "name": [r"Treatment name:?", r"1\.\s*Treatment name:?", r"•\s*Treatment name:?"],
+    "description": [r"description of the procedure:?", r"2\.\s*Brief description:?", r"•\s*Brief description:?", r"•\s*Procedure:?", r"•\s*Description:?"],
+    "notes": [r"situation-specific notes:?", r"3\.\s*Any situation:?", r"•\s*Situation:?", r"•\s*Notes:?", r"•\s*Situation-specific notes:?"]
+}
+
+NUMBERED_ITEM_RE = re.compile(r"(?:\n|^)\d+\.\s+")
+NUMBERED_FIRST_LINE_RE = re.compile(r"\d+\.\s*(.*)(?:\n|$)")
+LEADING_PUNCT_RE = re.compile(r"^[:\-\.]\s*")
+
+
+def _label_alternation(pats):
+    return re.compile("|".join(f"(?:{p})" for p in pats), re.IGNORECASE)
+
+
+def compile_field_maps(field_maps):
+    """Compile a field map into the label scanner used by parse_list_items.
+
+    Every label pattern is compiled once. For each key we also build a single
+    alternation of all *other* keys' labels: one search from the end of a
+    label gives the leftmost point where any other field starts, which is the
+    same boundary the old per-pattern rescans found.
+    """
+    keys = list(field_maps.keys())
+    patterns = {key: [re.compile(p, re.IGNORECASE) for p in pats] for key, pats in field_maps.items()}
+    boundaries = {}
+    fallback_boundaries = {}
+    for key in keys:
+        others = [p for k in keys if k != key for p in field_maps[k]]
+        boundaries[key] = _label_alternation(others) if others else None
+        others = [p for k in keys if k not in (key, "name") for p in field_maps[k]]
+        fallback_boundaries[key] = _label_alternation(others) if others else None
+    return {
+        "keys": keys,
+        "first_key": keys[0],
+        "patterns": patterns,
+        "boundaries": boundaries,
+        "fallback_boundaries": fallback_boundaries,
+    }
+
+
+_compiled_field_maps = {}
+
+
+def _get_field_scanner(field_maps):
+    cache_key = tuple((key, tuple(pats)) for key, pats in field_maps.items())
+    scanner = _compiled_field_maps.get(cache_key)
+    if scanner is None:
+        scanner = _compiled_field_maps[cache_key] = compile_field_maps(field_maps)
+    return scanner
+
+
+for _maps in (TOXIN_FIELD_MAPS, SYMPTOM_FIELD_MAPS, TREATMENT_FIELD_MAPS):
+    _get_field_scanner(_maps)
+
+
+def _scan_field(chunk, pats, boundary):
+    """Return the value for the first label in ``pats`` that yields one."""
+    for pat in pats:
+        m = pat.search(chunk)
+        if not m:
+            continue
+        val_start = m.end()
+        # Value runs until the nearest label of any other field in this chunk
+        min_end = len(chunk)
+        if boundary is not None:
+            om = boundary.search(chunk, val_start)
+            if om:
+                min_end = om.start()
+        val = chunk[val_start:min_end].strip()
+        val = LEADING_PUNCT_RE.sub("", val)
+        if val:
+            return clean_text(val)
+    return None
+
+
 def parse_list_items(text, field_maps):
     """
     Generic parser for lists of items (toxins, symptoms, treatments).
     text: input text
     field_maps: dict mapping target_key -> list of regex patterns
     """
+    scanner = _get_field_scanner(field_maps)
     items = []
     
     # Strategy: Find all occurrences of the FIRST field key.
-    first_key = list(field_maps.keys())[0]
-    patterns = field_maps[first_key]
-    
-    # Find all start indices
-    starts = []
-    for pat in patterns:
-        for match in re.finditer(pat, text, re.IGNORECASE):
-            starts.append(match.start())
-    
-    starts.sort()
+    # Duplicate positions would only produce empty chunks, so a set is enough.
+    starts = sorted({
+        match.start()
+        for pat in scanner["patterns"][scanner["first_key"]]
+        for match in pat.finditer(text)
+    })
     
     # MAIN LOGIC: If keys found, split by keys
     if starts:
-        chunks = []
-        for i in range(len(starts)):
-            start = starts[i]
+        for i, start in enumerate(starts):
             end = starts[i+1] if i+1 < len(starts) else len(text)
-            chunks.append(text[start:end])
-            
-        for chunk in chunks:
+            chunk = text[start:end]
             item = {}
-            for key, pats in field_maps.items():
-                # Find start of this value
-                val = None
-                for pat in pats:
-                     m = re.search(pat, chunk, re.IGNORECASE)
-                     if not m:
-                         continue
-                     val_start = m.end()
-                     # Find nearest start of ANY other key in this chunk
-                     min_end = len(chunk)
-                     for other_key, other_pats in field_maps.items():
-                         if other_key == key: continue 
-                         for op in other_pats:
-                             om = re.search(op, chunk[val_start:], re.IGNORECASE)
-                             if om:
-                                 if val_start + om.start() < min_end:
-                                     min_end = val_start + om.start()
-                     val = chunk[val_start:min_end].strip()
-                     val = re.sub(r"^[:\-\.]\s*", "", val)
-                     if val:
-                         item[key] = clean_text(val)
-                         break
+            for key in scanner["keys"]:
+                val = _scan_field(chunk, scanner["patterns"][key], scanner["boundaries"][key])
+                if val is not None:
+                    item[key] = val
             if item:
                 items.append(item)
 
     # FALLBACK LOGIC: If no key-based items found, try numbered list extraction
     if not items:
-         # Regex for numbered items: ^\d+\.\s+
-         item_starts = [m.start() for m in re.finditer(r"(?:\n|^)\d+\.\s+", text)]
+         item_starts = [m.start() for m in NUMBERED_ITEM_RE.finditer(text)]
          
-         if item_starts:
-             chunks = []
-             for i in range(len(item_starts)):
-                 start = item_starts[i]
-                 end = item_starts[i+1] if i+1 < len(item_starts) else len(text)
-                 if text[start] == '\n': start += 1
-                 chunks.append(text[start:end])
+         for i, start in enumerate(item_starts):
+             end = item_starts[i+1] if i+1 < len(item_starts) else len(text)
+             if text[start] == '\n': start += 1
+             chunk = text[start:end]
+
+             # "1. Name of Thing" -> "Name of Thing"
+             first_line_match = NUMBERED_FIRST_LINE_RE.match(chunk)
+             if not first_line_match: continue
+             
+             name = first_line_match.group(1).strip()
+             # check if it's just a label
+             if "symptom name" in name.lower() or "treatment name" in name.lower() or "name of the compound" in name.lower():
+                 continue 
                  
-             for chunk in chunks:
-                 # "1. Name of Thing" -> "Name of Thing"
-                 first_line_match = re.match(r"\d+\.\s*(.*)(?:\n|$)", chunk)
-                 if not first_line_match: continue
-                 
-                 name = first_line_match.group(1).strip()
-                 # check if it's just a label
-                 if "symptom name" in name.lower() or "treatment name" in name.lower() or "name of the compound" in name.lower():
-                     continue 
-                     
-                 item = {"name": clean_text(name)}
-                 
-                 # Now try to find other fields in the rest of the chunk
-                 for key, pats in field_maps.items():
-                     if key == "name": continue
-                     for pat in pats:
-                         m = re.search(pat, chunk, re.IGNORECASE)
-                         if m:
-                             val_start = m.end()
-                             min_end = len(chunk)
-                             for other_key, other_pats in field_maps.items():
-                                 if other_key == key or other_key == "name": continue
-                                 for op in other_pats:
-                                     om = re.search(op, chunk[val_start:], re.IGNORECASE)
-                                     if om:
-                                         if val_start + om.start() < min_end:
-                                             min_end = val_start + om.start()
-                             
-                             val = chunk[val_start:min_end].strip()
-                             val = re.sub(r"^[:\-\.]\s*", "", val)
-                             if val:
-                                 item[key] = clean_text(val)
-                                 break
-                 items.append(item)
+             item = {"name": clean_text(name)}
+             
+             # Now try to find other fields in the rest of the chunk
+             for key in scanner["keys"]:
+                 if key == "name": continue
+                 val = _scan_field(chunk, scanner["patterns"][key], scanner["fallback_boundaries"][key])
+                 if val is not None:
+                     item[key] = val
+             items.append(item)
             
     return items
 
-def process_file(filepath):
-    with open(filepath, "r") as f:
-        data = json.load(f)
-        
+def parse_toxins(text):
+    return parse_list_items(strip_header(text), TOXIN_FIELD_MAPS)
+
+
+def parse_symptoms(text):
+    return parse_list_items(strip_header(text), SYMPTOM_FIELD_MAPS)
+
+
+def parse_treatments(text):
+    return parse_list_items(strip_header(text), TREATMENT_FIELD_MAPS)
+
+
+# Raw response sections, each cached on its own parser's fingerprint
+LIST_PARSER_CODE = (parse_list_items, _scan_field, _get_field_scanner, compile_field_maps, _label_alternation)
+LIST_PARSER_RULES = {
+    "NUMBERED_ITEM_RE": NUMBERED_ITEM_RE.pattern,
+    "NUMBERED_FIRST_LINE_RE": NUMBERED_FIRST_LINE_RE.pattern,
+    "LEADING_PUNCT_RE": LEADING_PUNCT_RE.pattern,
+}
+BASICS = process_engine.section("basics", parse_basics)
+TOXIC_PARTS = process_engine.section(
+    "toxic_parts", parse_toxic_parts, code=(vocab_matcher,), rules={"KNOWN_PARTS": KNOWN_PARTS}
+)
+TOXINS = process_engine.section(
+    "toxins", parse_toxins, code=LIST_PARSER_CODE, rules=dict(LIST_PARSER_RULES, FIELD_MAPS=TOXIN_FIELD_MAPS)
+)
+SYMPTOMS = process_engine.section(
+    "symptoms", parse_symptoms, code=LIST_PARSER_CODE, rules=dict(LIST_PARSER_RULES, FIELD_MAPS=SYMPTOM_FIELD_MAPS)
+)
+TREATMENTS = process_engine.section(
+    "treatments", parse_treatments, code=LIST_PARSER_CODE,
+    rules=dict(LIST_PARSER_RULES, FIELD_MAPS=TREATMENT_FIELD_MAPS),
+)
+
+
+def parse_raw(data):
+    """Parse one raw NotebookLM entry into the processed record (no I/O)."""
     raw = data.get("raw_responses", {})
     plant_info = data.get("plant", {})
     
+    with profiling.stage("parse_basics"):
+        basics = section_cache.parse(BASICS, raw.get("basics", ""))
+    with profiling.stage("parse_toxic_parts"):
+        toxic_parts = section_cache.parse(TOXIC_PARTS, raw.get("toxic_parts", ""))
     processed = {
         "plant": plant_info,
-        "basics": parse_basics(raw.get("basics", "")),
-        "toxic_parts": parse_toxic_parts(raw.get("toxic_parts", "")),
+        "basics": basics,
+        "toxic_parts": toxic_parts,
         "toxins": [],
         "symptoms": [],
         "treatments": []
@@ -976,69 +825,61 @@ def process_file(filepath):
         processed["plant"]["description"] = processed["basics"]["description"]
         
     # Toxins
-    toxin_maps = {
-        "name": [r"Name of the compound:?", r"1\.\s*Name:?", r"•\s*Name(?: of the compound)?:?"],
-        "chemical_formula": [r"Chemical formula:?", r"2\.\s*Chemical formula:?", r"•\s*Chemical formula:?"],
-        "description": [r"mechanism of action:?", r"3\.\s*Brief description:?", r"•\s*Brief description:?", r"•\s*Mechanism(?: of action)?:?"],
-        "concentration_notes": [r"concentration or potency:?", r"4\.\s*Any notes:?", r"•\s*Any notes:?", r"•\s*Toxicity notes:?", r"•\s*Notes on concentration:?"]
-    }
-    processed["toxins"] = parse_list_items(strip_header(raw.get("toxins", "")), toxin_maps)
+    with profiling.stage("parse_list_items[toxins]"):
+        processed["toxins"] = section_cache.parse(TOXINS, raw.get("toxins", ""))
     
     # Symptoms
-    symptom_maps = {
-        "name": [r"Symptom name:?", r"1\.\s*Symptom name:?", r"•\s*Symptom name:?"],
-        "body_system": [r"Affected body system:?", r"2\.\s*Affected body system:?", r"•\s*Affected body system:?"],
-        "severity": [r"Severity:?", r"3\.\s*Severity:?", r"•\s*Severity:?"],
-        "onset": [r"Typical onset time:?", r"4\.\s*Typical onset time:?", r"•\s*Typical onset time:?", r"•\s*Onset:?"],
-        "notes": [r"clinical notes:?", r"5\.\s*Any additional:?", r"•\s*Additional:?", r"•\s*Notes:?", r"•\s*Clinical notes:?"]
-    }
-    processed["symptoms"] = parse_list_items(strip_header(raw.get("symptoms", "")), symptom_maps)
+    with profiling.stage("parse_list_items[symptoms]"):
+        processed["symptoms"] = section_cache.parse(SYMPTOMS, raw.get("symptoms", ""))
     
     # Treatments
-    treatment_maps = {
-        "name": [r"Treatment name:?", r"1\.\s*Treatment name:?", r"•\s*Treatment name:?"],
-        "description": [r"description of the procedure:?", r"2\.\s*Brief description:?", r"•\s*Brief description:?", r"•\s*Procedure:?", r"•\s*Description:?"],
-        "notes": [r"situation-specific notes:?", r"3\.\s*Any situation:?", r"•\s*Situation:?", r"•\s*Notes:?", r"•\s*Situation-specific notes:?"]
-    }
-    processed["treatments"] = parse_list_items(strip_header(raw.get("treatments", "")), treatment_maps)
+    with profiling.stage("parse_list_items[treatments]"):
+        processed["treatments"] = section_cache.parse(TREATMENTS, raw.get("treatments", ""))
     # Add priority based on order
     for i, t in enumerate(processed["treatments"]):
         t["priority"] = i + 1
         
     # Post-process: clean all fields
-    processed = postprocess(processed)
-        
-    # Save + validate (validation is advisory; legacy output pre-dates the
-    # Firestore-shaped schema, so failures are expected until PR 6 aligns).
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    out_name = os.path.basename(filepath)
-    out_path = os.path.join(OUTPUT_DIR, out_name)
-
-    _atomic_write_json(out_path, processed)
-    print(f"Processed {out_name}")
-
-    validator = _get_validator()
-    if validator is None:
-        return True
-    errors = sorted(validator.iter_errors(processed), key=lambda e: list(e.absolute_path))
-    if errors:
-        first = errors[0]
-        loc = "/".join(str(p) for p in first.absolute_path) or "<root>"
-        print(f"  WARN {out_name}: {loc}: {first.message}")
-        return False
-    return True
+    with profiling.stage("postprocess"):
+        return postprocess(processed)
+
+
+def overrides_for(data):
+    """The overrides ``postprocess`` would look up for one raw entry."""
+    plant = fix_scientific_name(dict(data.get("plant") or {}))
+    return OVERRIDES.resolved(plant.get("scientific_name", ""))
+
+
+CATEGORY = process_engine.Category(
+    "plant",
+    parse_raw,
+    input_dir=RAW_PLANTS_DIR,
+    output_dir=PROCESSED_PLANTS_DIR,
+    manifest_path=PROCESS_PLANTS_MANIFEST,
+    quarantine_report=PROCESS_PLANTS_QUARANTINE,
+    section_cache=PROCESS_PLANTS_SECTIONS,
+    normalizers=(normalize_body_system, clean_family, clean_onset),
+    rules={
+        "KNOWN_PARTS": KNOWN_PARTS,
+        "HEADER_LABELS": sorted(HEADER_LABELS),
+        "BODY_SYSTEM_MAP": BODY_SYSTEM_MAP,
+        "OVERRIDES_FORMAT": overrides.FORMAT_VERSION,
+        "TOXIN_FIELD_MAPS": TOXIN_FIELD_MAPS,
+        "SYMPTOM_FIELD_MAPS": SYMPTOM_FIELD_MAPS,
+        "TREATMENT_FIELD_MAPS": TREATMENT_FIELD_MAPS,
+    },
+    sources=[__file__, overrides.__file__],
+    overrides_for=overrides_for,
+)
+
+
+def process_record(data, max_field_chars=0, time_budget=0):
+    """Parse and validate one raw entry in memory; see process_engine.process_record."""
+    return process_engine.process_record(CATEGORY, data, max_field_chars, time_budget)
 
 
 def main():
-    files = glob.glob(os.path.join(INPUT_DIR, "*.json"))
-    passed = 0
-    failed = 0
-    for f in files:
-        if process_file(f):
-            passed += 1
-        else:
-            failed += 1
-    print(f"\nSummary: {passed} passed validation, {failed} failed")
+    process_engine.run(CATEGORY)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,113 @@
+"""Per-stage timing for the processing scripts (``--profile`` / ``--cprofile``).
+
+``stage(name)`` wraps one step of ``process_file`` — loading the raw JSON,
+each parser, postprocessing, the write, validation. While profiling is off
+it hands back a shared no-op context, so the instrumented code costs next to
+nothing in a normal run.
+
+Under ``--jobs`` every worker enables profiling in its pool initializer.
+"""
+import cProfile
+import time
+
+_enabled = False
+_stages = {}
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        slot = _stages.get(self.name)
+        if slot is None:
+            _stages[self.name] = [1, elapsed]
+        else:
+            slot[0] += 1
+            slot[1] += elapsed
+        return False
+
+
+def enable():
+    """Start recording stage timings in this process."""
+    global _enabled
+    _enabled = True
+
+
+def stage(name):
+    """Context manager timing one stage; a no-op unless profiling is enabled."""
+    return _Stage(name) if _enabled else _NULL_STAGE
+
+
+def snapshot():
+    return {name: tuple(slot) for name, slot in _stages.items()}
+
+
+def delta(after, before):
+    """Stage (calls, seconds) accumulated between two snapshots."""
+    out = {}
+    for name, (calls, seconds) in after.items():
+        prev_calls, prev_seconds = before.get(name, (0, 0.0))
+        if calls != prev_calls:
+            out[name] = (calls - prev_calls, seconds - prev_seconds)
+    return out
+
+
+def merge(total, part):
+    """Add the stage counts in ``part`` into ``total`` in place."""
+    for name, (calls, seconds) in part.items():
+        prev_calls, prev_seconds = total.get(name, (0, 0.0))
+        total[name] = (prev_calls + calls, prev_seconds + seconds)
+    return total
+
+
+def format_report(stages, file_seconds, slowest=10):
+    """Report lines for ``--profile``: a per-stage table, then the slowest files.
+
+    ``file_seconds`` is a list of (seconds, file name) covering every file
+    that was processed.
+    """
+    lines = ["Stage profile:"]
+    total = sum(seconds for _calls, seconds in stages.values())
+    width = max((len(name) for name in stages), default=5)
+    lines.append(f"  {'stage':<{width}}  {'calls':>7}  {'total ms':>10}  {'mean ms':>8}  {'share':>6}")
+    for name, (calls, seconds) in sorted(stages.items(), key=lambda item: -item[1][1]):
+        share = 100.0 * seconds / total if total else 0.0
+        lines.append(
+            f"  {name:<{width}}  {calls:>7}  {seconds * 1000:>10.1f}  {seconds * 1000 / calls:>8.3f}  {share:>5.1f}%"
+        )
+    if file_seconds:
+        lines.append(f"Slowest {min(slowest, len(file_seconds))} files:")
+        for seconds, name in sorted(file_seconds, reverse=True)[:slowest]:
+            lines.append(f"  {seconds * 1000:>9.1f} ms  {name}")
+    return lines
+
+
+def start_cprofile():
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+
+def dump_cprofile(profiler, path):
+    """Stop ``profiler`` and write its stats to ``path`` (readable with pstats/snakeviz)."""
+    profiler.disable()
+    profiler.dump_stats(path)
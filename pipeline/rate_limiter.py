@@ -0,0 +1,149 @@
+"""Adaptive token-bucket rate limiter shared by every LLM-backed script.
+
+The collectors used to sleep a fixed two seconds between entries: time
+wasted while the backend is idle, and still no protection when it starts
+refusing. A ``RateLimiter`` paces calls instead:
+
+* a token bucket refilled at ``qps`` tokens per second and holding up to
+  ``burst`` of them, so idle time is banked and a queue of callers is
+  spread out evenly; callers reserve their token under a lock and sleep
+  outside it, so it is safe to share between threads;
+* after a failure the bucket stops refilling for an exponential backoff
+  with jitter (``base_backoff`` doubling per consecutive failure, capped
+  at ``max_backoff``). Callers that arrive meanwhile queue up behind it
+  and are let through one refill interval apart once it has passed, not
+  all at once;
+* failures and noisy answers (empty, truncated, unparseable) also halve
+  the refill rate, down to ``min_factor`` of ``qps``; every
+  ``recover_after`` consecutive clean calls double it back up to ``qps``.
+
+``call`` wraps one backend call with all of the above and optional
+retries; ``stats`` reports what the pacing cost for the run summary.
+"""
+import random
+import threading
+import time
+
+
+class RateLimiter:
+    """Token bucket with failure backoff and adaptive slow-down."""
+
+    def __init__(self, qps, burst=1, *, base_backoff=2.0, max_backoff=300.0, min_factor=0.125,
+                 recover_after=5, clock=time.monotonic, sleep=time.sleep, rng=random.random):
+        if qps <= 0:
+            raise ValueError("qps must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.qps = qps
+        self.burst = burst
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.min_factor = min_factor
+        self.recover_after = recover_after
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        # Refill time of ``_tokens``; a failure pushes it into the future
+        self._updated = clock()
+        self._factor = 1.0
+        self._failures = 0
+        self._clean = 0
+        self._stats = {"calls": 0, "failures": 0, "noisy": 0, "waited_seconds": 0.0}
+
+    @property
+    def rate(self):
+        """Current refill rate in calls per second (``qps`` when the backend is healthy)."""
+        return self.qps * self._factor
+
+    def _refill(self, now):
+        if now > self._updated:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def acquire(self):
+        """Block until this caller may make one call."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            # Reserve a token; a negative balance is the queue of earlier reservations
+            self._tokens -= 1
+            wait = max(self._updated - now, 0.0) + max(-self._tokens / self.rate, 0.0)
+            self._stats["calls"] += 1
+            self._stats["waited_seconds"] += wait
+        if wait:
+            self._sleep(wait)
+
+    def success(self):
+        with self._lock:
+            self._failures = 0
+            self._clean += 1
+            if self._clean >= self.recover_after and self._factor < 1.0:
+                self._factor = min(1.0, self._factor * 2)
+                self._clean = 0
+
+    def _slow_down(self, now):
+        self._refill(now)
+        self._factor = max(self.min_factor, self._factor / 2)
+        self._clean = 0
+
+    def noisy(self):
+        """The call went through but the answer was junk: slow down, without a pause."""
+        with self._lock:
+            self._stats["noisy"] += 1
+            self._slow_down(self._clock())
+
+    def failure(self):
+        """The call failed: slow down and queue every later caller behind a jittered backoff."""
+        with self._lock:
+            now = self._clock()
+            self._stats["failures"] += 1
+            self._failures += 1
+            self._slow_down(now)
+            cap = min(self.max_backoff, self.base_backoff * 2 ** (self._failures - 1))
+            # "Equal jitter": at least half the backoff, so retries still spread out
+            backoff = cap / 2 + self._rng() * cap / 2
+            # Banked tokens would let a burst hit the backend the moment it recovers
+            self._tokens = min(self._tokens, 1.0)
+            self._updated = max(self._updated, now + backoff)
+
+    def call(self, fn, *args, retries=0, is_noisy=None, **kwargs):
+        """Run ``fn`` under the limiter, retrying up to ``retries`` times when it raises.
+
+        A result for which ``is_noisy(result)`` is true counts against the
+        rate but is returned as is; the caller decides what to do with it.
+        """
+        for attempt in range(retries + 1):
+            self.acquire()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception:
+                self.failure()
+                if attempt == retries:
+                    raise
+                continue
+            if is_noisy is not None and is_noisy(result):
+                self.noisy()
+            else:
+                self.success()
+            return result
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, rate=self.rate)
+
+    def summary(self):
+        stats = self.stats()
+        return (
+            f"Rate limiter: {stats['calls']} calls, {stats['failures']} failures, {stats['noisy']} noisy; "
+            f"waited {stats['waited_seconds']:.1f}s; ending at {stats['rate']:.3g}/s of {self.qps:g}/s"
+        )
+
+
+def add_arguments(parser, qps, burst=1, prefix=""):
+    """Add ``--[prefix]qps`` and ``--[prefix]burst`` with these defaults to an argparse parser."""
+    parser.add_argument(f"--{prefix}qps", type=float, default=qps,
+                        help=f"Calls per second the backend may receive (default: {qps:g})")
+    parser.add_argument(f"--{prefix}burst", type=int, default=burst,
+                        help=f"Calls that may go out back to back after an idle spell (default: {burst})")
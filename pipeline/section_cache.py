@@ -0,0 +1,172 @@
+"""Persistent cache of parsed ``raw_responses`` sections.
+
+A raw entry has five sections (basics, toxic_parts, toxins, symptoms,
+treatments), each parsed on its own. Most parser changes touch one of them,
+yet any change to a category module rebuilds every file and re-parses all
+five. Each section is therefore declared as a ``Section``: its parse
+function, the helpers it calls and the rule tables it reads. Their source
+and values make up the section's fingerprint, and the parsed result is
+cached under (section name, that fingerprint, SHA-256 of the raw text).
+Changing the treatment parser then only re-parses treatment sections.
+
+Every process (the serial run or a pool worker) loads the cache file once
+and hands the entries it added or used back with each file's stats. The
+parent merges them into a ``Store``, evicts the least recently used entries
+beyond ``max_entries`` and saves it under ``data/.build/``. Like the build
+manifest it is only a cache — deleting it just means re-parsing.
+"""
+import copy
+import hashlib
+import inspect
+import json
+import os
+
+import build_manifest
+
+CACHE_VERSION = 1
+DEFAULT_MAX_ENTRIES = 10000
+
+
+class Section:
+    """One raw response field and the parser that turns it into data.
+
+    ``code`` lists the functions (or modules) ``parse`` relies on and
+    ``rules`` the tables and patterns it reads; both go into the fingerprint,
+    so anything left out will not invalidate cached results when it changes.
+    """
+
+    def __init__(self, name, parse, *, code=(), rules=None):
+        self.name = name
+        self.parse = parse
+        self.code = (parse,) + tuple(code)
+        self.rules = rules or {}
+        self._fingerprint = None
+
+    @property
+    def fingerprint(self):
+        if self._fingerprint is None:
+            self._fingerprint = build_manifest.sha256_json({
+                "version": CACHE_VERSION,
+                "code": [inspect.getsource(obj) for obj in self.code],
+                "rules": self.rules,
+            })
+        return self._fingerprint
+
+    def key(self, text):
+        return f"{self.name}:{self.fingerprint}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+
+
+# --- Lookups (every process) ---
+
+_path = None  # active cache file; None = caching off
+_refresh = False  # re-parse every section, but still record the results
+_values = {}
+_counts = {"hits": 0, "misses": 0}
+_added = {}
+_used = set()
+
+
+def _load_entries(path):
+    try:
+        with open(path, "r") as fh:
+            data = json.load(fh)
+    except (FileNotFoundError, json.JSONDecodeError):
+        data = None
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        data = {"version": CACHE_VERSION, "run": 0, "entries": {}}
+    return data
+
+
+def activate(path, refresh=False):
+    """Serve ``parse`` from the cache file at ``path`` (None turns caching off)."""
+    global _path, _refresh, _values
+    path = None if path is None else str(path)
+    if path != _path:
+        _values = {} if path is None else {
+            key: entry["value"] for key, entry in _load_entries(path)["entries"].items()
+        }
+        _path = path
+    _refresh = refresh
+
+
+def parse(section, text):
+    """``section.parse(text)``, from the cache when an identical section was parsed before."""
+    if _path is None:
+        return section.parse(text)
+    key = section.key(text or "")
+    if not _refresh and key in _values:
+        _counts["hits"] += 1
+        _used.add(key)
+        return copy.deepcopy(_values[key])
+    _counts["misses"] += 1
+    value = section.parse(text)
+    # Callers post-process the result in place, so the cache keeps its own copy
+    _values[key] = _added[key] = copy.deepcopy(value)
+    return value
+
+
+def snapshot():
+    return dict(_counts)
+
+
+def take(before):
+    """Counts since ``before`` plus the entries added or used since the last take."""
+    global _added, _used
+    stats = {
+        "hits": _counts["hits"] - before.get("hits", 0),
+        "misses": _counts["misses"] - before.get("misses", 0),
+        "added": _added,
+        "used": sorted(_used),
+    }
+    _added = {}
+    _used = set()
+    return stats
+
+
+# --- The cache file (parent process) ---
+
+class Store:
+    """The cache file as the parent sees it: merged worker results, LRU-bounded on save."""
+
+    def __init__(self, path, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        data = _load_entries(path)
+        self.run = data.get("run", 0) + 1
+        self.entries = data["entries"]
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    def merge(self, stats):
+        """Fold one file's ``take()`` result into the store."""
+        self.hits += stats["hits"]
+        self.misses += stats["misses"]
+        for key, value in stats["added"].items():
+            self.entries[key] = {"used": self.run, "value": value}
+        for key in stats["used"]:
+            if key in self.entries:
+                self.entries[key]["used"] = self.run
+
+    def save(self):
+        excess = len(self.entries) - self.max_entries
+        if excess > 0:
+            oldest = sorted(self.entries, key=lambda key: (self.entries[key]["used"], key))[:excess]
+            for key in oldest:
+                del self.entries[key]
+            self.evicted += excess
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp, "w") as fh:
+            # No sort_keys: the order of keys in a parsed item is part of the output
+            json.dump({"version": CACHE_VERSION, "run": self.run, "entries": self.entries}, fh, ensure_ascii=False)
+            fh.write("\n")
+        os.replace(tmp, self.path)
+
+    def summary(self):
+        lookups = self.hits + self.misses
+        rate = 100.0 * self.hits / lookups if lookups else 0.0
+        return (
+            f"Section cache: {self.hits} hits, {self.misses} misses ({rate:.0f}% hit); "
+            f"{len(self.entries)} entries, {self.evicted} evicted"
+        )
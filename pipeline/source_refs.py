@@ -0,0 +1,127 @@
+r"""Source-reference stripping shared by the plant and food processors.
+
+``strip_source_refs`` used to run about ten ``re.sub`` passes over every
+string field, each scanning the whole string and allocating a new one. Most
+fields contain none of what those passes look for, so each pass here is
+guarded by a cheap check on the current text (a substring test on its
+lowercased form, or a look at its last character). A pass only runs its
+regex when the guard says a match is possible; the order and the regexes
+themselves are unchanged, so the output is identical;
+``check_source_refs.py`` compares it against the original passes.
+
+Several of the original patterns went quadratic (or worse) on long, odd
+answers: a ``[\n\r]\s*`` prefix retried at every newline of a long blank
+run, and ``[\d,]+\.+\s*$`` retried at every digit of a long citation run.
+Those are written here in an equivalent linear form — possessive
+quantifiers, a lookbehind so a whitespace run is entered only at its first
+character (keeping the text before the newline via ``\1``), and a plain
+scan for the citation tail — and still produce the original output.
+"""
+import functools
+import re
+
+_TAIL_DIGIT = "tail_digit"
+_TAIL_DOT = "tail_dot"
+
+
+def _folded(text):
+    # IGNORECASE also folds these onto ASCII letters; str.lower() leaves 'ı'
+    # and 'ſ' alone and turns 'İ' into 'i' plus a combining dot
+    return text.replace("İ", "i").lower().replace("ı", "i").replace("ſ", "s")
+
+
+def strip_citation_tail(text):
+    r"""Linear-time ``re.sub(r'[\d,]+\.+\s*$', '', text)``."""
+    end = len(text.rstrip())
+    dots = end
+    while dots > 0 and text[dots - 1] == ".":
+        dots -= 1
+    start = dots
+    while start > 0 and (text[start - 1] == "," or text[start - 1].isdecimal()):
+        start -= 1
+    if dots == end or start == dots:
+        return text
+    return text[:start]
+
+
+def _rule(pattern, flags=0, repl="", needle=None, contains=None, tail=None, rstrip=False, sub=None):
+    """One stripping pass and the guard that must hold for it to match."""
+    return {
+        "sub": sub or functools.partial(re.compile(pattern, flags).sub, repl),
+        "needle": needle,
+        "contains": contains,
+        "tail": tail,
+        "rstrip": rstrip,
+    }
+
+
+def _may_match(rule, text, lower):
+    if rule["needle"] is not None and rule["needle"] not in lower:
+        return False
+    if rule["contains"] is not None and rule["contains"] not in text:
+        return False
+    if rule["tail"] is not None:
+        stripped = text.rstrip()
+        if not stripped:
+            return False
+        last = stripped[-1]
+        if rule["tail"] == _TAIL_DIGIT and not (last == "," or last.isdecimal()):
+            return False
+        if rule["tail"] == _TAIL_DOT and last != ".":
+            return False
+    return True
+
+
+def strip_source_refs(text, rules):
+    """Apply ``rules`` in order, skipping passes whose guard rules out a match."""
+    if not text:
+        return text
+    lower = _folded(text)
+    for rule in rules:
+        if rule["rstrip"]:
+            text = text.rstrip()
+        if not _may_match(rule, text, lower):
+            continue
+        stripped = rule["sub"](text)
+        if len(stripped) != len(text):
+            # Removing text from the middle can create a new needle, so
+            # refresh the folded copy whenever a pass changed something
+            text = stripped
+            lower = _folded(text)
+    return text.strip()
+
+
+# Leading "[\n\r]\s*" of the original patterns, entered only at the start of a
+# whitespace run; group 1 keeps whatever precedes the first newline of the run
+_NEWLINE_RUN = r'(?<!\s)([^\S\n\r]*+)[\n\r]\s*+'
+
+PLANT_RULES = [
+    # Remove patterns like: \n  • Source:1,2,3  or  Sources:1,2  or  ◦ Source:1...
+    _rule(_NEWLINE_RUN + r'[•◦\u2022\u25e6\-\*\u25aa]?\s*+Sources?\s*+:[\d,\s\.]++$', re.IGNORECASE, r'\1', needle="source"),
+    # Also inline at end: "...some text. Sources:1,2,3" or "Source:1,2"
+    _rule(r'(?<!\s)\s*+Sources?\s*+:[\d,\s\.]++$', re.IGNORECASE, needle="source"),
+    # Remove trailing citation numbers (e.g. "...text1,2,3" or "...text1")
+    _rule(r'(?<=[a-zA-Z\)\]])[\d,]++\s*+$', tail=_TAIL_DIGIT),
+    # Remove lines that are just citation refs: "\n  ◦ Sources:1,2,3"
+    _rule(_NEWLINE_RUN + r'[•◦\u2022\u25e6\u25aa\-\*]?\s*+Sources?\s*+:[\d,\s\.]++', re.IGNORECASE, r'\1', needle="source"),
+    # Remove "Would you like me to..." chatbot questions
+    _rule(r"Would you like me to.*", re.IGNORECASE, needle="would you like me to"),
+    # Remove ◦-prefixed continuation lines (source artifacts in concentration_notes)
+    _rule(_NEWLINE_RUN + r'◦\s*+(?:Highest |Distribution|Concentration).*$', re.DOTALL, r'\1', contains="◦"),
+    # Remove horizontal rules and everything after
+    _rule(r'(?<!\s)([^\S\n]*+)\n\s*+-{3,}.*$', re.DOTALL, r'\1', contains="---"),
+    # Remove trailing citation+period combos like "identified1." or "text1,2...."
+    _rule(None, sub=strip_citation_tail, tail=_TAIL_DOT, rstrip=True),
+    _rule(r'The provided text does not contain.*$', re.IGNORECASE | re.DOTALL, needle="the provided text does not contain"),
+]
+
+FOOD_RULES = [
+    _rule(_NEWLINE_RUN + r'[•◦\-\*]?\s*+Sources?\s*+:[\d,\s\.]++$', re.IGNORECASE, r'\1', needle="source"),
+    _rule(r'(?<!\s)\s*+Sources?\s*+:[\d,\s\.]++$', re.IGNORECASE, needle="source"),
+    _rule(r'(?<=[a-zA-Z\)\]])[\d,]++\s*+$', tail=_TAIL_DIGIT),
+    _rule(r"Would you like me to.*", re.IGNORECASE, needle="would you like me to"),
+    _rule(r'(?<!\s)([^\S\n]*+)\n\s*+-{3,}.*$', re.DOTALL, r'\1', contains="---"),
+    _rule(_NEWLINE_RUN + r'◦\s*+(?:Highest |Distribution|Concentration).*$', re.DOTALL, r'\1', contains="◦"),
+    _rule(r'The provided text does not contain.*$', re.IGNORECASE | re.DOTALL, needle="the provided text does not contain"),
+    _rule(None, sub=strip_citation_tail, tail=_TAIL_DOT, rstrip=True),
+]
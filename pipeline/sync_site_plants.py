@@ -21,6 +21,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+import disk_writer
+import rate_limiter
 from paths import DATA_DIR, PROCESSED_PLANTS_DIR, REPO_ROOT
 
 
@@ -58,21 +60,12 @@ def read_json(path: Path) -> Any:
         return json.load(fh)
 
 
-def atomic_write_json(path: Path, payload: Any) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    tmp = path.with_suffix(path.suffix + ".tmp")
-    with open(tmp, "w") as fh:
-        json.dump(payload, fh, indent=2, ensure_ascii=False, sort_keys=True)
-        fh.write("\n")
-    os.replace(tmp, path)
+def atomic_write_json(path: Path, payload: Any) -> bool:
+    return atomic_write_text(path, json.dumps(payload, indent=2, ensure_ascii=False, sort_keys=True) + "\n")
 
 
-def atomic_write_text(path: Path, text: str) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    tmp = path.with_suffix(path.suffix + ".tmp")
-    with open(tmp, "w") as fh:
-        fh.write(text)
-    os.replace(tmp, path)
+def atomic_write_text(path: Path, text: str) -> bool:
+    return disk_writer.write_text_if_changed(path, text)
 
 
 def canonical_hash(payload: Any) -> str:
@@ -458,6 +451,8 @@ def translate_pending(
     gemini_bin: str,
     timeout_seconds: int,
     model: Optional[str],
+    limiter: Optional[rate_limiter.RateLimiter] = None,
+    retries: int = 0,
 ) -> Dict[str, int]:
     ZH_DIR.mkdir(parents=True, exist_ok=True)
     glossary = load_glossary()
@@ -482,7 +477,11 @@ def translate_pending(
         batch_id = int(time.time() * 1000)
         prompt = build_translation_prompt(batch_payloads, glossary)
         started_at = utc_now()
-        try:
+        raw_response = ""
+
+        def translate_batch() -> Tuple[Any, str, int]:
+            # Keep the raw text for the .error file even when the checks below reject it
+            nonlocal raw_response
             translated, raw_response, duration_ms = run_gemini(
                 gemini_bin=gemini_bin,
                 prompt=prompt,
@@ -491,11 +490,17 @@ def translate_pending(
             )
             if not isinstance(translated, list) or len(translated) != len(chunk):
                 raise ValueError("Gemini response must be an array matching the batch length")
+            return translated, raw_response, duration_ms
+
+        try:
+            if limiter is None:
+                translated, raw_response, duration_ms = translate_batch()
+            else:
+                translated, raw_response, duration_ms = limiter.call(translate_batch, retries=retries)
         except Exception as exc:
             failed_count += len(chunk)
-            raw = locals().get("raw_response", "")
             for status, payload, _source_hash in chunk:
-                write_error(payload["slug"], raw, str(exc))
+                write_error(payload["slug"], raw_response, str(exc))
                 append_translation_log(
                     {
                         "ts": utc_now(),
@@ -508,6 +513,7 @@ def translate_pending(
                 )
             continue
 
+        batch_failed = failed_count
         for index, (status, payload, source_hash) in enumerate(chunk):
             try:
                 zh_payload = validate_translated_entry(payload, translated[index], source_hash, model_name)
@@ -538,6 +544,9 @@ def translate_pending(
                         "batch_id": batch_id,
                     }
                 )
+        if limiter is not None and failed_count > batch_failed:
+            # Some entries came back unusable: Gemini is degrading, ease off
+            limiter.noisy()
 
     return {
         "pending_before_limit": len(pending),
@@ -666,6 +675,8 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--gemini-bin", default=shutil.which("gemini") or "/opt/homebrew/bin/gemini")
     parser.add_argument("--gemini-model", default=None, help="Optional Gemini model name to pass to the CLI.")
     parser.add_argument("--gemini-timeout", type=int, default=300, help="Per-batch timeout in seconds.")
+    parser.add_argument("--gemini-retries", type=int, default=0, help="Retries of a failed batch, with backoff.")
+    rate_limiter.add_arguments(parser, 0.2, prefix="gemini-")
     return parser.parse_args()
 
 
@@ -692,6 +703,7 @@ def main() -> int:
         if not Path(args.gemini_bin).exists() and shutil.which(args.gemini_bin) is None:
             print(f"Gemini CLI not found: {args.gemini_bin}", file=sys.stderr)
             return 2
+        limiter = rate_limiter.RateLimiter(args.gemini_qps, args.gemini_burst)
         translation_result = translate_pending(
             payloads=payloads,
             limit=args.translate_limit,
@@ -699,7 +711,10 @@ def main() -> int:
             gemini_bin=args.gemini_bin,
             timeout_seconds=args.gemini_timeout,
             model=args.gemini_model,
+            limiter=limiter,
+            retries=args.gemini_retries,
         )
+        print(limiter.summary())
 
     if args.emit_site:
         emit_site_plants(payloads)
@@ -726,6 +741,7 @@ def main() -> int:
     if args.emit_site:
         print(f"Site plants emitted: {SITE_PLANTS_TS}")
     print(f"Progress: {SYNC_PROGRESS}")
+    print(f"Files: {disk_writer.format_counts(disk_writer.snapshot())}")
     return 0
 
 
@@ -1,19 +1,77 @@
+"""Tick off collected plants in data/collection_status.md.
+
+Reads what the collectors recorded in the collection state store
+(data/.build/collection_state.sqlite) and only rewrites the rows of plants
+finished since the last run. --rebuild (or an empty store) seeds it from
+the raw files first.
+"""
+import argparse
 import json
 import os
 import re
 
-from paths import PLANT_LIST, STATUS_FILE as STATUS_PATH, RAW_PLANTS_DIR
+import collection_state
+import disk_writer
+from paths import PLANT_LIST, STATUS_FILE as STATUS_PATH, RAW_PLANTS_DIR, COLLECTION_STATE
 
 PLANT_LIST_FILE = str(PLANT_LIST)
 STATUS_FILE = str(STATUS_PATH)
 PLANTS_DIR = str(RAW_PLANTS_DIR)
+CATEGORY = "plant"  # batch_collect.COLLECTION's name
+ROW_RE = re.compile(r"^\|\s*(\d+)\s*\|")
 
 def to_snake_case(text):
     text = re.sub(r'[^\w\s-]', '', text.lower())
     text = re.sub(r'[\s-]+', '_', text).strip('_')
     return text
 
+def candidate_files(plant):
+    """Raw file names a plant-list entry may have been collected under."""
+    # Filename logic from batch_collect.py:
+    # scientific_name if not N/A, else common_name
+    sci_name = plant.get("scientific_name")
+    com_name = plant.get("common_name")
+
+    target_name = sci_name if sci_name and sci_name != "N/A" else com_name
+
+    # Check both common and scientific just in case
+    return [to_snake_case(target_name) + ".json", to_snake_case(com_name) + ".json"]
+
+def seed(store, plants):
+    """Rebuild the store's plant entries from the raw files on disk."""
+    if not os.path.exists(PLANTS_DIR):
+        print(f"Error: {PLANTS_DIR} not found")
+        return False
+
+    existing_files = set(os.listdir(PLANTS_DIR))
+    print(f"Found {len(existing_files)} files in {PLANTS_DIR}")
+
+    finished = {}
+    for idx, plant in enumerate(plants, 1):
+        for filename in candidate_files(plant):
+            if filename in existing_files:
+                finished.setdefault(filename, (filename, idx, plant.get("common_name")))
+                break
+    store.seed(CATEGORY, list(finished.values()))
+    return True
+
+def mark_done(line):
+    """The status table row ``line`` with R1-R6 and Done checked."""
+    parts = [p.strip() for p in line.strip().split("|")]
+    # Columns R1-R6 are indices 5-10. Done is 11.
+    for col in range(5, 12):
+        parts[col] = "[x]"
+    # split("|") on "| a | b |" gives ["", "a", "b", ""]
+    return "| " + " | ".join(parts[1:-1]) + " |\n"
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Tick off collected plants in the collection status table.")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Re-seed the collection state from the raw files and re-render every row")
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
     if not os.path.exists(PLANT_LIST_FILE):
         print(f"Error: {PLANT_LIST_FILE} not found")
         return
@@ -21,96 +79,53 @@ def main():
     with open(PLANT_LIST_FILE, "r") as f:
         plants = json.load(f)
 
-    # Map name -> existing file
-    if not os.path.exists(PLANTS_DIR):
-        print(f"Error: {PLANTS_DIR} not found")
-        return
-        
-    existing_files = set(os.listdir(PLANTS_DIR))
-    print(f"Found {len(existing_files)} files in {PLANTS_DIR}")
-    
-    # Read status file lines
-    with open(STATUS_FILE, "r") as f:
-        lines = f.readlines()
-        
-    new_lines = []
-    header_idx = -1
-    for i, line in enumerate(lines):
-        if "| # | Plant |" in line:
-            header_idx = i
-        new_lines.append(line)
-        
-    if header_idx == -1:
-        print("Error: Could not find table header")
-        return
+    store = collection_state.StateStore(COLLECTION_STATE)
+    try:
+        if args.rebuild or not store.has_entries(CATEGORY):
+            if not seed(store, plants):
+                return
+
+        # Only entries the collectors (or the seed) touched since the last render
+        touched = store.changed_entries(CATEGORY)
+        changed = [entry for entry in touched if entry["done"]]
+        if not changed:
+            print("Status file up to date.")
+            return
+
+        # Read status file lines
+        with open(STATUS_FILE, "r") as f:
+            lines = f.readlines()
 
-    # Process each plant row
-    # The table rows start after the separator line (header + 2)
-    start_row = header_idx + 2
-    
-    for i in range(start_row, len(lines)):
-        line = lines[i].strip()
-        if not line.startswith("|") or len(line.split("|")) < 12:
-            continue
-            
-        parts = [p.strip() for p in line.split("|")]
-        # parts[0] is empty, parts[1] is #, parts[2] is Plant ...
-        try:
-            # Check if parts[1] is a number
-            if not parts[1].isdigit():
+        rows = {}
+        header_idx = -1
+        for i, line in enumerate(lines):
+            if header_idx == -1:
+                if "| # | Plant |" in line:
+                    header_idx = i
                 continue
-                
-            idx = int(parts[1])
-            # Find corresponding plant in plant_list (1-based index)
-            if idx <= len(plants):
-                plant = plants[idx-1]
-                
-                # Check file existence
-                # Filename logic from batch_collect.py:
-                # scientific_name if not N/A, else common_name
-                sci_name = plant.get("scientific_name")
-                com_name = plant.get("common_name")
-                
-                target_name = sci_name if sci_name and sci_name != "N/A" else com_name
-                
-                # Check both common and scientific just in case
-                filename_sci = to_snake_case(target_name) + ".json"
-                filename_com = to_snake_case(com_name) + ".json"
-                
-                found = False
-                if filename_sci in existing_files:
-                    found = True
-                elif filename_com in existing_files:
-                    found = True
-                
-                if found:
-                    # Update row: check R1-R6 and Done
-                    # Columns R1-R6 are indices 5-10. Done is 11.
-                    for col in range(5, 12):
-                        parts[col] = "[x]"
-                    
-                    # Reconstruct line
-                    # Join with " | " and add leading/trailing "|"
-                    # parts has empty first and last element due to split("|") ?
-                    # split("|") on "| a | b |" gives ["", "a", "b", ""]
-                    # so parts[1] is "a".
-                    # My parts logic:
-                    # parts = [p.strip() for p in line.split("|")]
-                    # parts[0] = ""
-                    # parts[1] = "#"
-                    # ...
-                    # parts[-1] = ""
-                    
-                    new_line = "| " + " | ".join(parts[1:-1]) + " |"
-                    new_lines[i] = new_line + "\n"
-                    # print(f"Updated status for #{idx} {com_name}")
-                    
-        except ValueError:
-            continue
-
-    with open(STATUS_FILE, "w") as f:
-        f.writelines(new_lines)
-    print("Status file updated.")
+            match = ROW_RE.match(line)
+            if match and len(line.split("|")) >= 12:
+                rows[int(match.group(1))] = i
+
+        if header_idx == -1:
+            print("Error: Could not find table header")
+            return
+
+        # Several list entries can share one raw file (e.g. the Prunus species)
+        numbers = {}
+        for idx, plant in enumerate(plants, 1):
+            for filename in candidate_files(plant):
+                numbers.setdefault(filename, set()).add(idx)
+        for entry in changed:
+            for number in numbers.get(entry["file"], set()) | {entry["number"]}:
+                if number in rows:
+                    lines[rows[number]] = mark_done(lines[rows[number]])
+
+        disk_writer.write_text_if_changed(STATUS_FILE, "".join(lines))
+        store.mark_rendered(CATEGORY, touched[-1]["seq"])
+        print(f"Status file updated ({len(changed)} rows).")
+    finally:
+        store.close()
 
 if __name__ == "__main__":
     main()
@@ -1,12 +1,24 @@
+"""Tick off collected foods in data/collection_status_food.md.
+
+Reads what the collectors recorded in the collection state store
+(data/.build/collection_state.sqlite) and only rewrites the rows of foods
+finished since the last run. --rebuild (or an empty store) seeds it from
+the raw files first.
+"""
+import argparse
 import json
 import os
 import re
 
-from paths import FOOD_LIST, STATUS_FILE_FOOD, RAW_FOODS_DIR
+import collection_state
+import disk_writer
+from paths import FOOD_LIST, STATUS_FILE_FOOD, RAW_FOODS_DIR, COLLECTION_STATE
 
 FOOD_LIST_FILE = str(FOOD_LIST)
 STATUS_FILE = str(STATUS_FILE_FOOD)
 FOODS_DIR = str(RAW_FOODS_DIR)
+CATEGORY = "food"  # batch_collect_food.COLLECTION's name
+ROW_RE = re.compile(r"^\|\s*(\d+)\s*\|")
 
 def to_snake_case(s):
     if not s:
@@ -14,40 +26,69 @@ def to_snake_case(s):
     s = re.sub(r'[^a-zA-Z0-9_\s]', '', s)
     return s.lower().replace(" ", "_")
 
+def seed(store, foods):
+    existing_files = set(os.listdir(FOODS_DIR))
+    finished = {}
+    for idx, food in enumerate(foods, 1):
+        filename = to_snake_case(food.get("name")) + ".json"
+        if filename in existing_files:
+            finished.setdefault(filename, (filename, idx, food.get("name")))
+    store.seed(CATEGORY, list(finished.values()))
+
+def mark_done(line):
+    parts = [p.strip() for p in line.strip().split("|")]
+    for col in range(3, 10): parts[col] = "[x]" # Updated logic to cover correct columns
+    return "| " + " | ".join(parts[1:-1]) + " |\n"
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Tick off collected foods in the collection status table.")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Re-seed the collection state from the raw files and re-render every row")
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
     if not os.path.exists(FOOD_LIST_FILE) or not os.path.exists(STATUS_FILE) or not os.path.exists(FOODS_DIR):
         print("Error: Missing prerequisites.")
         return
 
     with open(FOOD_LIST_FILE, "r") as f: foods = json.load(f)
-    existing_files = set(os.listdir(FOODS_DIR))
-    
-    with open(STATUS_FILE, "r") as f: lines = f.readlines()
-        
-    for i, line in enumerate(lines):
-        if "| # | Food |" in line:
-            header_idx = i
-            break
-    else: return
-
-    for i in range(header_idx + 2, len(lines)):
-        line = lines[i].strip()
-        if not line.startswith("|") or len(line.split("|")) < 11: continue
-            
-        parts = [p.strip() for p in line.split("|")]
-        try:
-            if not parts[1].isdigit(): continue
-            idx = int(parts[1])
-            if idx <= len(foods):
-                food = foods[idx-1]
-                target_name = food.get("name")
-                if to_snake_case(target_name) + ".json" in existing_files:
-                    for col in range(3, 10): parts[col] = "[x]" # Updated logic to cover correct columns
-                    lines[i] = "| " + " | ".join(parts[1:-1]) + " |\n"
-        except ValueError: continue
-
-    with open(STATUS_FILE, "w") as f: f.writelines(lines)
-    print("Status file updated.")
+
+    store = collection_state.StateStore(COLLECTION_STATE)
+    try:
+        if args.rebuild or not store.has_entries(CATEGORY):
+            seed(store, foods)
+
+        touched = store.changed_entries(CATEGORY)
+        changed = [entry for entry in touched if entry["done"]]
+        if not changed:
+            print("Status file up to date.")
+            return
+
+        with open(STATUS_FILE, "r") as f: lines = f.readlines()
+
+        rows = {}
+        header_idx = -1
+        for i, line in enumerate(lines):
+            if header_idx == -1:
+                if "| # | Food |" in line: header_idx = i
+                continue
+            match = ROW_RE.match(line)
+            if match and len(line.split("|")) >= 11: rows[int(match.group(1))] = i
+        if header_idx == -1: return
+
+        numbers = {}
+        for idx, food in enumerate(foods, 1):
+            numbers.setdefault(to_snake_case(food.get("name")) + ".json", set()).add(idx)
+        for entry in changed:
+            for number in numbers.get(entry["file"], set()) | {entry["number"]}:
+                if number in rows: lines[rows[number]] = mark_done(lines[rows[number]])
+
+        disk_writer.write_text_if_changed(STATUS_FILE, "".join(lines))
+        store.mark_rendered(CATEGORY, touched[-1]["seq"])
+        print(f"Status file updated ({len(changed)} rows).")
+    finally:
+        store.close()
 
 if __name__ == "__main__":
     main()
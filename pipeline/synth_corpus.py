@@ -0,0 +1,117 @@
+"""
+synth_corpus.py — Generate synthetic NotebookLM raw files for benchmarking.
+
+Each synthetic entry has the same ``{"plant": ..., "raw_responses": {...}}``
+shape ``batch_collect.py`` writes. Every section is taken from a real raw
+file in ``data/plants/`` (so the CLI chatter, headers, numbered lists and
+citation digits look like the real thing), renamed to the synthetic plant,
+and then varied: bullet characters are reshuffled and some answers get a
+``Sources:`` trailer, a "Would you like me to…" follow-up or a ``---`` rule
+appended — the artifacts ``process_plants.py`` has to strip.
+
+Output is deterministic for a given ``--seed``.
+
+Usage:
+    python3 pipeline/synth_corpus.py --count 1000 --out /tmp/synth_plants
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import re
+
+from batch_collect import snake_case
+from paths import RAW_PLANTS_DIR
+
+SECTIONS = ("basics", "toxic_parts", "toxins", "symptoms", "treatments")
+
+BULLETS = ("•", "◦", "-", "*")
+BULLET_RE = re.compile(r"(?m)^(\s*)[•◦\-\*] ")
+
+TRAILERS = (
+    "\nSources: 1, 2, 3",
+    "\n  • Sources:1,2",
+    " Sources:1,2,3",
+    "\n  ◦ Source:4",
+    "\nWould you like me to put these findings into a table for quick reference?",
+    "\n\nWould you like me to explain how these compare with other toxic plants?",
+    "\n---\nSource:\n• Houseplants and Ornamentals Toxic to Animals - Merck Veterinary Manual",
+)
+TRAILER_RATE = 0.35
+
+EPITHETS = ("synthetica", "benchmarkii", "artificialis", "generata", "simulata")
+
+
+def load_seeds(raw_dir=RAW_PLANTS_DIR):
+    """Real raw entries with every section answered, in a stable order."""
+    seeds = []
+    for path in sorted(glob.glob(os.path.join(str(raw_dir), "*.json"))):
+        with open(path, "r") as f:
+            data = json.load(f)
+        raw = data.get("raw_responses", {})
+        if all(raw.get(section) for section in SECTIONS):
+            seeds.append(data)
+    if not seeds:
+        raise SystemExit(f"no complete raw files to seed from in {raw_dir}")
+    return seeds
+
+
+def _rename(text, source_plant, plant):
+    for key in ("scientific_name", "common_name"):
+        old = source_plant.get(key)
+        if old:
+            text = text.replace(old, plant[key])
+    return text
+
+
+def synthesize(index, seeds, rng):
+    """One synthetic raw entry; sections are drawn from independent seeds."""
+    genus_seed = rng.choice(seeds)["plant"]
+    genus = (genus_seed.get("scientific_name") or "Plantae").split()[0]
+    plant = {
+        "common_name": f"{genus_seed.get('common_name', 'Plant')} No. {index}",
+        "scientific_name": f"{genus} {rng.choice(EPITHETS)} {index}",
+    }
+    raw = {}
+    for section in SECTIONS:
+        source = rng.choice(seeds)
+        text = _rename(source["raw_responses"][section], source["plant"], plant)
+        text = BULLET_RE.sub(lambda m: m.group(1) + rng.choice(BULLETS) + " ", text)
+        if rng.random() < TRAILER_RATE:
+            text = text.rstrip() + rng.choice(TRAILERS)
+        raw[section] = text
+    return {"plant": plant, "raw_responses": raw}
+
+
+def generate(out_dir, count, seed=0, seeds=None):
+    """Write ``count`` synthetic raw files to ``out_dir``; returns their paths."""
+    seeds = seeds if seeds is not None else load_seeds()
+    rng = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for index in range(count):
+        data = synthesize(index, seeds, rng)
+        path = os.path.join(out_dir, snake_case(data["plant"]["scientific_name"]) + ".json")
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+        paths.append(path)
+    return paths
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate synthetic NotebookLM raw plant files.")
+    parser.add_argument("--count", type=int, required=True, help="Number of raw files to write")
+    parser.add_argument("--out", required=True, help="Directory to write them to")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    paths = generate(args.out, args.count, args.seed)
+    print(f"✅ Wrote {len(paths)} synthetic raw files to {args.out}/")
+
+
+if __name__ == "__main__":
+    main()
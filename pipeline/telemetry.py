@@ -0,0 +1,56 @@
+"""JSON-lines telemetry of every NotebookLM call the collectors make.
+
+One line per backend call (cache hits are not calls), appended to
+``data/.build/collect_telemetry.jsonl`` as the call finishes::
+
+    {"category": "plant", "entry": "Mint", "file": "mint.json", "section": "toxins",
+     "notebook": "https://notebooklm.google.com/notebook/...", "backend": "worker",
+     "start": 1760000000.1, "end": 1760000042.7, "duration_ms": 42600, "ok": true,
+     "answer_chars": 1830, "retries": 0, "exit_code": 0, "marker_found": true, "error": null}
+
+``section`` is ``"combined"`` for a ``--combined`` prompt, with the sections it
+stood for in ``sections``. ``exit_code`` is the ``ask_question.py`` exit code,
+or 0/1 for a worker's ok/error reply; it is null when the call raised.
+``marker_found`` tells whether the answer ended with the skill's follow-up
+prompt, i.e. was not cut short. ``notebook`` is the URL or id of the
+notebook asked, which tells the notebooks of a ``--notebook`` pool apart.
+
+``collect_report.py`` summarizes the file.
+"""
+import json
+import os
+import threading
+
+
+class Telemetry:
+    """Appends one JSON line per call; shared by the collector threads."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._fh = open(self.path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def record(self, **fields):
+        line = json.dumps(fields, ensure_ascii=False)
+        with self._lock:
+            self._fh.write(line + "\n")
+            self._fh.flush()
+
+    def close(self):
+        self._fh.close()
+
+
+def load(path):
+    """Every complete record in ``path``; a line torn by a crash is skipped."""
+    records = []
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return records
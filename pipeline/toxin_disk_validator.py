@@ -0,0 +1,227 @@
+# AUTO-GENERATED by schemas/build-schemas.ts from schemas/toxin.disk.schema.json. Do not edit manually.
+"""Specialized validator for the ToxinDisk schema.
+
+Same constraints and messages as jsonschema's Draft7Validator on
+toxin.disk.schema.json, unrolled into plain type and set checks.
+"""
+
+_PROPERTIES_TOXIN_DISK = frozenset({'name', 'scientific_name', 'family', 'aliases', 'category', 'toxicParts', 'symptoms', 'chemicals', 'treatments', 'severity', 'description', 'safetyNotes', 'emergencyNote', 'isToxic', 'toxicityLevel'})
+_ENUM_TOXIN_DISK_CATEGORY = frozenset({'plant', 'food'})
+_PROPERTIES_TOXIN_DISK_CHEMICALS_ITEM = frozenset({'name', 'chemical_formula', 'description', 'concentration_notes'})
+_ENUM_TOXIN_DISK_SEVERITY = frozenset({'safe', 'cautious', 'toxic'})
+_PROPERTIES_TOXIN_DISK_SYMPTOMS_ITEM = frozenset({'name', 'body_system', 'severity', 'onset', 'notes'})
+_ENUM_TOXIN_DISK_SYMPTOMS_ITEM_SEVERITY = frozenset({'mild', 'moderate', 'severe', 'fatal'})
+_PROPERTIES_TOXIN_DISK_TREATMENTS_ITEM = frozenset({'name', 'description', 'notes', 'priority'})
+
+
+def _additional_properties(extras):
+    extras = sorted(extras, key=str)
+    verb = "was" if len(extras) == 1 else "were"
+    return f"Additional properties are not allowed ({', '.join(repr(each) for each in extras)} {verb} unexpected)"
+
+
+def _check_toxin_disk_chemicals_item(value, path):
+    if not isinstance(value, dict):
+        yield path, f"{value!r} is not of type 'object'"
+        return
+    if 'name' not in value:
+        yield path, "'name' is a required property"
+    if not value.keys() <= _PROPERTIES_TOXIN_DISK_CHEMICALS_ITEM:
+        yield path, _additional_properties(value.keys() - _PROPERTIES_TOXIN_DISK_CHEMICALS_ITEM)
+    if 'chemical_formula' in value:
+        child = value['chemical_formula']
+        if not (isinstance(child, str) or child is None):
+            yield path + ('chemical_formula',), f"{child!r} is not of type 'string', 'null'"
+    if 'concentration_notes' in value:
+        child = value['concentration_notes']
+        if not (isinstance(child, str) or child is None):
+            yield path + ('concentration_notes',), f"{child!r} is not of type 'string', 'null'"
+    if 'description' in value:
+        child = value['description']
+        if not (isinstance(child, str) or child is None):
+            yield path + ('description',), f"{child!r} is not of type 'string', 'null'"
+    if 'name' in value:
+        child = value['name']
+        if not isinstance(child, str):
+            yield path + ('name',), f"{child!r} is not of type 'string'"
+
+
+def _check_toxin_disk_symptoms_item(value, path):
+    if not isinstance(value, dict):
+        yield path, f"{value!r} is not of type 'object'"
+        return
+    if 'name' not in value:
+        yield path, "'name' is a required property"
+    if 'body_system' not in value:
+        yield path, "'body_system' is a required property"
+    if 'severity' not in value:
+        yield path, "'severity' is a required property"
+    if not value.keys() <= _PROPERTIES_TOXIN_DISK_SYMPTOMS_ITEM:
+        yield path, _additional_properties(value.keys() - _PROPERTIES_TOXIN_DISK_SYMPTOMS_ITEM)
+    if 'body_system' in value:
+        child = value['body_system']
+        if not isinstance(child, str):
+            yield path + ('body_system',), f"{child!r} is not of type 'string'"
+    if 'name' in value:
+        child = value['name']
+        if not isinstance(child, str):
+            yield path + ('name',), f"{child!r} is not of type 'string'"
+    if 'notes' in value:
+        child = value['notes']
+        if not isinstance(child, str):
+            yield path + ('notes',), f"{child!r} is not of type 'string'"
+    if 'onset' in value:
+        child = value['onset']
+        if not isinstance(child, str):
+            yield path + ('onset',), f"{child!r} is not of type 'string'"
+    if 'severity' in value:
+        child = value['severity']
+        if not isinstance(child, str):
+            yield path + ('severity',), f"{child!r} is not of type 'string'"
+        if not (isinstance(child, str) and child in _ENUM_TOXIN_DISK_SYMPTOMS_ITEM_SEVERITY):
+            yield path + ('severity',), f"{child!r} is not one of ['mild', 'moderate', 'severe', 'fatal']"
+
+
+def _check_toxin_disk_treatments_item(value, path):
+    if not isinstance(value, dict):
+        yield path, f"{value!r} is not of type 'object'"
+        return
+    if 'name' not in value:
+        yield path, "'name' is a required property"
+    if 'priority' not in value:
+        yield path, "'priority' is a required property"
+    if not value.keys() <= _PROPERTIES_TOXIN_DISK_TREATMENTS_ITEM:
+        yield path, _additional_properties(value.keys() - _PROPERTIES_TOXIN_DISK_TREATMENTS_ITEM)
+    if 'description' in value:
+        child = value['description']
+        if not (isinstance(child, str) or child is None):
+            yield path + ('description',), f"{child!r} is not of type 'string', 'null'"
+    if 'name' in value:
+        child = value['name']
+        if not isinstance(child, str):
+            yield path + ('name',), f"{child!r} is not of type 'string'"
+    if 'notes' in value:
+        child = value['notes']
+        if not (isinstance(child, str) or child is None):
+            yield path + ('notes',), f"{child!r} is not of type 'string', 'null'"
+    if 'priority' in value:
+        child = value['priority']
+        if not (isinstance(child, (int, float)) and not isinstance(child, bool)):
+            yield path + ('priority',), f"{child!r} is not of type 'number'"
+
+
+def _check_toxin_disk(value, path):
+    if not isinstance(value, dict):
+        yield path, f"{value!r} is not of type 'object'"
+        return
+    if 'name' not in value:
+        yield path, "'name' is a required property"
+    if 'aliases' not in value:
+        yield path, "'aliases' is a required property"
+    if 'category' not in value:
+        yield path, "'category' is a required property"
+    if 'toxicParts' not in value:
+        yield path, "'toxicParts' is a required property"
+    if 'symptoms' not in value:
+        yield path, "'symptoms' is a required property"
+    if 'severity' not in value:
+        yield path, "'severity' is a required property"
+    if 'description' not in value:
+        yield path, "'description' is a required property"
+    if not value.keys() <= _PROPERTIES_TOXIN_DISK:
+        yield path, _additional_properties(value.keys() - _PROPERTIES_TOXIN_DISK)
+    if 'aliases' in value:
+        child = value['aliases']
+        if not isinstance(child, list):
+            yield path + ('aliases',), f"{child!r} is not of type 'array'"
+        else:
+            for index2, item2 in enumerate(child):
+                if not isinstance(item2, str):
+                    yield path + ('aliases', index2), f"{item2!r} is not of type 'string'"
+    if 'category' in value:
+        child = value['category']
+        if not isinstance(child, str):
+            yield path + ('category',), f"{child!r} is not of type 'string'"
+        if not (isinstance(child, str) and child in _ENUM_TOXIN_DISK_CATEGORY):
+            yield path + ('category',), f"{child!r} is not one of ['plant', 'food']"
+    if 'chemicals' in value:
+        child = value['chemicals']
+        if not isinstance(child, list):
+            yield path + ('chemicals',), f"{child!r} is not of type 'array'"
+        else:
+            for index2, item2 in enumerate(child):
+                yield from _check_toxin_disk_chemicals_item(item2, path + ('chemicals', index2))
+    if 'description' in value:
+        child = value['description']
+        if not isinstance(child, str):
+            yield path + ('description',), f"{child!r} is not of type 'string'"
+    if 'emergencyNote' in value:
+        child = value['emergencyNote']
+        if not isinstance(child, str):
+            yield path + ('emergencyNote',), f"{child!r} is not of type 'string'"
+    if 'family' in value:
+        child = value['family']
+        if not isinstance(child, str):
+            yield path + ('family',), f"{child!r} is not of type 'string'"
+    if 'isToxic' in value:
+        child = value['isToxic']
+        if not (isinstance(child, bool) or child is None):
+            yield path + ('isToxic',), f"{child!r} is not of type 'boolean', 'null'"
+    if 'name' in value:
+        child = value['name']
+        if not isinstance(child, str):
+            yield path + ('name',), f"{child!r} is not of type 'string'"
+    if 'safetyNotes' in value:
+        child = value['safetyNotes']
+        if not isinstance(child, list):
+            yield path + ('safetyNotes',), f"{child!r} is not of type 'array'"
+        else:
+            for index2, item2 in enumerate(child):
+                if not isinstance(item2, str):
+                    yield path + ('safetyNotes', index2), f"{item2!r} is not of type 'string'"
+    if 'scientific_name' in value:
+        child = value['scientific_name']
+        if not isinstance(child, str):
+            yield path + ('scientific_name',), f"{child!r} is not of type 'string'"
+    if 'severity' in value:
+        child = value['severity']
+        if not isinstance(child, str):
+            yield path + ('severity',), f"{child!r} is not of type 'string'"
+        if not (isinstance(child, str) and child in _ENUM_TOXIN_DISK_SEVERITY):
+            yield path + ('severity',), f"{child!r} is not one of ['safe', 'cautious', 'toxic']"
+    if 'symptoms' in value:
+        child = value['symptoms']
+        if not isinstance(child, list):
+            yield path + ('symptoms',), f"{child!r} is not of type 'array'"
+        else:
+            for index2, item2 in enumerate(child):
+                yield from _check_toxin_disk_symptoms_item(item2, path + ('symptoms', index2))
+    if 'toxicParts' in value:
+        child = value['toxicParts']
+        if not isinstance(child, list):
+            yield path + ('toxicParts',), f"{child!r} is not of type 'array'"
+        else:
+            for index2, item2 in enumerate(child):
+                if not isinstance(item2, str):
+                    yield path + ('toxicParts', index2), f"{item2!r} is not of type 'string'"
+    if 'toxicityLevel' in value:
+        child = value['toxicityLevel']
+        if not (isinstance(child, str) or child is None):
+            yield path + ('toxicityLevel',), f"{child!r} is not of type 'string', 'null'"
+    if 'treatments' in value:
+        child = value['treatments']
+        if not isinstance(child, list):
+            yield path + ('treatments',), f"{child!r} is not of type 'array'"
+        else:
+            for index2, item2 in enumerate(child):
+                yield from _check_toxin_disk_treatments_item(item2, path + ('treatments', index2))
+
+
+def iter_errors(instance):
+    """Yield ``(path, message)`` per violation, sorted by path as the pipeline sorts Draft7Validator errors."""
+    return _check_toxin_disk(instance, ())
+
+
+def first_error(instance):
+    """The first ``(path, message)`` from ``iter_errors``, or None; stops at the first violation."""
+    return next(_check_toxin_disk(instance, ()), None)
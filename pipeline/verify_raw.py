@@ -2,20 +2,34 @@
 """
 verify_raw.py — Audit raw plant collection files for incomplete queries.
 
-Scans data/plants/ and checks that every plant has all 5 raw responses
-present and non-trivial. Answers: "which plants need re-querying?"
+Scans data/plants/ (or data/foods/ with --category foods) and checks that
+every entry has all 5 raw responses present and non-trivial. Answers:
+"which plants need re-querying?"
 
-Output: human-readable summary to stdout.
+Output: human-readable summary to stdout. With --queue, also a work queue
+of (entry, sections to re-ask), highest priority first, that the
+collectors consume with --queue (or build themselves with --gaps):
+
+  python3 pipeline/verify_raw.py --queue
+  python3 pipeline/batch_collect.py --queue data/.build/recollect_plants.queue.json
 """
 
+import argparse
 import json
 import os
 import glob
 import sys
+from pathlib import Path
 
-from paths import RAW_PLANTS_DIR
+import disk_writer
+from paths import RAW_PLANTS_DIR, RAW_FOODS_DIR, RECOLLECT_PLANTS_QUEUE, RECOLLECT_FOODS_QUEUE
 
 RAW_DIR = str(RAW_PLANTS_DIR)
+CATEGORIES = {
+    "plants": (RAW_PLANTS_DIR, RECOLLECT_PLANTS_QUEUE),
+    "foods": (RAW_FOODS_DIR, RECOLLECT_FOODS_QUEUE),
+}
+QUEUE_VERSION = 1
 REQUIRED_KEYS = ["basics", "toxic_parts", "toxins", "symptoms", "treatments"]
 MIN_RESPONSE_LENGTH = 50  # responses shorter than this are likely errors
 
@@ -61,11 +75,80 @@ def verify_raw_file(filepath):
     }
 
 
+def missing_sections(raw):
+    """``{key: priority}`` for the REQUIRED_KEYS of ``raw`` that need re-querying.
+
+    An absent, null or non-string answer weighs 2, a suspiciously short
+    one 1, so entries with nothing to go on are re-collected first.
+    """
+    missing = {}
+    for key in REQUIRED_KEYS:
+        val = raw.get(key)
+        if not isinstance(val, str):
+            missing[key] = 2
+        elif len(val.strip()) < MIN_RESPONSE_LENGTH:
+            missing[key] = 1
+    return missing
+
+
+def build_queue(raw_dir):
+    """Work queue items for every raw file in ``raw_dir`` with sections to re-ask, highest priority first.
+
+    Unparseable files have no ``plant`` header to ask about and are left
+    to the audit output.
+    """
+    items = []
+    for filepath in sorted(glob.glob(os.path.join(str(raw_dir), "*.json"))):
+        try:
+            with open(filepath, "r") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            continue
+        if not isinstance(data, dict) or not isinstance(data.get("plant"), dict):
+            continue
+        missing = missing_sections(data.get("raw_responses") or {})
+        if missing:
+            items.append({
+                "file": os.path.basename(filepath),
+                "plant": data["plant"],
+                "missing": list(missing),
+                "priority": sum(missing.values()),
+            })
+    items.sort(key=lambda item: (-item["priority"], item["file"]))
+    return items
+
+
+def write_queue(path, raw_dir, items):
+    queue = {"version": QUEUE_VERSION, "raw_dir": str(raw_dir), "items": items}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    disk_writer.write_text_if_changed(path, json.dumps(queue, indent=2, ensure_ascii=False) + "\n")
+
+
+def load_queue(path):
+    """The ``(raw_dir, items)`` of a queue written by ``--queue``."""
+    with open(path, "r") as f:
+        queue = json.load(f)
+    if queue.get("version") != QUEUE_VERSION:
+        raise ValueError(f"{path}: unsupported queue version {queue.get('version')!r}")
+    return queue["raw_dir"], queue["items"]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Audit raw collection files for incomplete queries.")
+    parser.add_argument("--category", choices=sorted(CATEGORIES), default="plants")
+    parser.add_argument("--queue", nargs="?", const="", metavar="PATH",
+                        help="Also write the re-collection work queue "
+                             "(default: data/.build/recollect_<category>.queue.json)")
+    return parser.parse_args(argv)
+
+
 def main():
-    files = sorted(glob.glob(os.path.join(RAW_DIR, "*.json")))
+    args = parse_args()
+    raw_dir, queue_path = CATEGORIES[args.category]
+    files = sorted(glob.glob(os.path.join(str(raw_dir), "*.json")))
 
     if not files:
-        print(f"⚠️  No files found in {RAW_DIR}/")
+        print(f"⚠️  No files found in {raw_dir}/")
         sys.exit(1)
 
     results = []
@@ -104,6 +187,13 @@ def main():
         for p in requery_plants:
             print(f"   • {p}")
 
+    if args.queue is not None:
+        items = build_queue(raw_dir)
+        path = args.queue or queue_path
+        write_queue(Path(path), raw_dir, items)
+        sections = sum(len(item["missing"]) for item in items)
+        print(f"\n📋 Work queue: {sections} sections to re-ask across {len(items)} files → {path}")
+
     sys.exit(1 if fail_count > 0 else 0)
 
 
@@ -0,0 +1,105 @@
+"""Prebuilt keyword matchers shared by the plant and food processors.
+
+Both processors used to test a vocabulary one entry at a time — a
+``re.search(r"\\b" + part + r"\\b")`` per toxic part, a substring test per
+body-system key — so every new synonym added another full scan of the text.
+The matchers here are built once per vocabulary and report every hit in a
+single pass, in vocabulary order, so callers that picked "the first key in
+the table" or built a set in table order get exactly the same answer.
+"""
+import re
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _trie_pattern(words):
+    """Regex for ``words`` factored into a character trie, longest match first."""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return "(?:" + body + ")?" if "" in node else body
+
+    return build(trie)
+
+
+class SubstringMatcher:
+    """Find which vocabulary entries occur anywhere in a text (``key in text``).
+
+    One scan with a trie-shaped lookahead yields the longest entry starting
+    at each position; every shorter entry matching there is a prefix of it,
+    so those are added from a precomputed table. Overlapping hits
+    ("seed" inside "seeds") are reported just like the ``in`` loop did.
+    """
+
+    def __init__(self, vocabulary):
+        self.vocabulary = list(dict.fromkeys(vocabulary))
+        self._index = {word: i for i, word in enumerate(self.vocabulary)}
+        self._prefixes = {
+            word: [self._index[other] for other in self.vocabulary if word.startswith(other)]
+            for word in self.vocabulary
+        }
+        self._re = re.compile("(?=(" + _trie_pattern(self.vocabulary) + "))") if self.vocabulary else None
+
+    def _hit_indices(self, text):
+        hits = set()
+        if self._re is None or not text:
+            return hits
+        for m in self._re.finditer(text):
+            hits.update(self._prefixes[m.group(1)])
+        return hits
+
+    def matches(self, text):
+        """Every entry found in ``text``, in vocabulary order."""
+        return [self.vocabulary[i] for i in sorted(self._hit_indices(text))]
+
+    def first(self, text):
+        """The earliest vocabulary entry found in ``text``, or None."""
+        hits = self._hit_indices(text)
+        return self.vocabulary[min(hits)] if hits else None
+
+
+class WordMatcher:
+    """Find which vocabulary entries occur as whole words (``\\bkey\\b``).
+
+    The text is split into ``\\w+`` tokens once; entries are indexed by their
+    first token, so each token costs one dict lookup however large the
+    vocabulary grows. Multi-word entries are confirmed against the text, so
+    the separators must match exactly, as they did in the regex.
+    """
+
+    def __init__(self, vocabulary):
+        self.vocabulary = list(dict.fromkeys(vocabulary))
+        self._by_first_word = {}
+        for i, word in enumerate(self.vocabulary):
+            first = _WORD_RE.match(word)
+            if first is None or not _WORD_RE.fullmatch(word[-1]):
+                raise ValueError(f"entry must start and end with a word character: {word!r}")
+            self._by_first_word.setdefault(first.group(0), []).append((i, word))
+
+    def _hit_indices(self, text):
+        hits = set()
+        for token in _WORD_RE.finditer(text):
+            candidates = self._by_first_word.get(token.group(0))
+            if not candidates:
+                continue
+            start = token.start()
+            for i, word in candidates:
+                end = start + len(word)
+                if i in hits or not text.startswith(word, start):
+                    continue
+                if end == len(text) or not _WORD_RE.match(text, end):
+                    hits.add(i)
+        return hits
+
+    def matches(self, text):
+        """Every entry found in ``text`` as a whole word, in vocabulary order."""
+        return [self.vocabulary[i] for i in sorted(self._hit_indices(text))]
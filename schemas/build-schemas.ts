@@ -4,6 +4,7 @@ import { fileURLToPath } from 'node:url'
 import { zodToJsonSchema } from 'zod-to-json-schema'
 import { ToxinDiskSchema, ToxinSchema } from './toxin.zod'
 import { GlossarySchema } from './glossary.zod'
+import { buildPythonValidator } from './python-validator'
 
 const __dirname = dirname(fileURLToPath(import.meta.url))
 const CHECK_ONLY = process.argv.includes('--check')
@@ -12,6 +13,7 @@ const typesPath = resolve(__dirname, 'toxin.types.ts')
 const jsonSchemaPath = resolve(__dirname, 'toxin.schema.json')
 const diskJsonSchemaPath = resolve(__dirname, 'toxin.disk.schema.json')
 const glossaryJsonSchemaPath = resolve(__dirname, 'glossary.schema.json')
+const diskPythonValidatorPath = resolve(__dirname, '../pipeline/toxin_disk_validator.py')
 
 const generatedTypes = `// AUTO-GENERATED by schemas/build-schemas.ts. Do not edit manually.
 import { z } from 'zod'
@@ -51,6 +53,10 @@ function buildJsonSchema(schema: Parameters<typeof zodToJsonSchema>[0], name: st
 const generatedJsonSchema = buildJsonSchema(ToxinSchema, 'Toxin')
 const generatedDiskJsonSchema = buildJsonSchema(ToxinDiskSchema, 'ToxinDisk')
 const generatedGlossaryJsonSchema = buildJsonSchema(GlossarySchema, 'Glossary')
+const generatedDiskPythonValidator = buildPythonValidator(
+  JSON.parse(generatedDiskJsonSchema),
+  'toxin.disk.schema.json',
+)
 
 function apply(path: string, next: string): boolean {
   let current = ''
@@ -77,6 +83,7 @@ const changed = [
   apply(jsonSchemaPath, generatedJsonSchema),
   apply(diskJsonSchemaPath, generatedDiskJsonSchema),
   apply(glossaryJsonSchemaPath, generatedGlossaryJsonSchema),
+  apply(diskPythonValidatorPath, generatedDiskPythonValidator),
 ].some(Boolean)
 
 if (CHECK_ONLY && changed) {
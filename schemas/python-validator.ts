@@ -0,0 +1,204 @@
+// Emits a dependency-free Python validator for a generated JSON Schema.
+//
+// The pipeline validates every processed file against toxin.disk.schema.json.
+// jsonschema's Draft7Validator is generic: it walks the schema for every
+// document, collects every error, and callers sort them just to print the
+// first. The module emitted here unrolls the schema into plain isinstance /
+// set checks and yields errors lazily, already in path order and with the
+// same messages as Draft7Validator, so `first_error` stops at the first one.
+//
+// Only the keywords the disk schema uses are supported; anything else throws
+// so a schema change cannot silently drop a constraint from the Python side.
+
+type Schema = Record<string, unknown>
+
+const OBJECT_KEYWORDS = new Set(['type', 'properties', 'required', 'additionalProperties'])
+const ARRAY_KEYWORDS = new Set(['type', 'items'])
+const LEAF_KEYWORDS = new Set(['type', 'enum'])
+
+const TYPE_CHECKS: Record<string, (v: string) => string> = {
+  string: (v) => `isinstance(${v}, str)`,
+  number: (v) => `isinstance(${v}, (int, float)) and not isinstance(${v}, bool)`,
+  boolean: (v) => `isinstance(${v}, bool)`,
+  null: (v) => `${v} is None`,
+  object: (v) => `isinstance(${v}, dict)`,
+  array: (v) => `isinstance(${v}, list)`,
+}
+
+const SAFE_LITERAL = /^[A-Za-z0-9_ .\-]*$/
+
+function pyStr(value: unknown): string {
+  if (typeof value !== 'string' || !SAFE_LITERAL.test(value)) {
+    throw new Error(`unsupported literal in schema: ${JSON.stringify(value)}`)
+  }
+  // Matches Python's repr() for these characters, so it can go into messages too
+  return `'${value}'`
+}
+
+function pySet(members: string[]): string {
+  return `frozenset({${members.join(', ')}})`
+}
+
+function pathExpr(parts: string[]): string {
+  if (parts.length === 0) return 'path'
+  return parts.length === 1 ? `path + (${parts[0]},)` : `path + (${parts.join(', ')})`
+}
+
+function snake(name: string): string {
+  return name.replace(/([a-z0-9])([A-Z])/g, '$1_$2').replace(/[^A-Za-z0-9]+/g, '_').toLowerCase()
+}
+
+function checkKeywords(schema: Schema, allowed: Set<string>, where: string) {
+  for (const key of Object.keys(schema)) {
+    if (!allowed.has(key)) throw new Error(`unsupported keyword "${key}" at ${where}`)
+  }
+}
+
+function typesOf(schema: Schema, where: string): string[] {
+  const types = Array.isArray(schema.type) ? (schema.type as string[]) : [schema.type as string]
+  for (const type of types) {
+    if (!(type in TYPE_CHECKS)) throw new Error(`unsupported type "${type}" at ${where}`)
+  }
+  return types
+}
+
+class Emitter {
+  private functions: string[][] = []
+  private constants: string[] = []
+
+  // Returns the name of a generator function checking `schema`, an object schema.
+  objectFunction(schema: Schema, name: string): string {
+    const fn = `_check_${name}`
+    checkKeywords(schema, OBJECT_KEYWORDS, name)
+    const properties = (schema.properties ?? {}) as Record<string, Schema>
+    const required = (schema.required ?? []) as string[]
+    const lines = [
+      `def ${fn}(value, path):`,
+      `    if not isinstance(value, dict):`,
+      `        yield path, f"{value!r} is not of type 'object'"`,
+      `        return`,
+    ]
+    // Errors on this object sort before errors inside it; at the same path
+    // Draft7Validator reports them in schema keyword order
+    for (const keyword of Object.keys(schema)) {
+      if (keyword === 'required') {
+        for (const key of required) {
+          lines.push(`    if ${pyStr(key)} not in value:`)
+          lines.push(`        yield path, "${pyStr(key)} is a required property"`)
+        }
+      } else if (keyword === 'additionalProperties') {
+        if (schema.additionalProperties !== false) {
+          throw new Error(`unsupported additionalProperties at ${name}`)
+        }
+        const allowed = `_PROPERTIES_${name.toUpperCase()}`
+        this.constants.push(
+          `${allowed} = ${pySet(Object.keys(properties).map(pyStr))}`,
+        )
+        lines.push(`    if not value.keys() <= ${allowed}:`)
+        lines.push(`        yield path, _additional_properties(value.keys() - ${allowed})`)
+      }
+    }
+    // Then each property, in the order their paths sort
+    for (const key of Object.keys(properties).sort()) {
+      lines.push(`    if ${pyStr(key)} in value:`)
+      lines.push(`        child = value[${pyStr(key)}]`)
+      lines.push(...this.node(properties[key], 'child', [pyStr(key)], `${name}_${snake(key)}`, 2))
+    }
+    this.functions.push(lines)
+    return fn
+  }
+
+  private node(schema: Schema, value: string, parts: string[], name: string, depth: number): string[] {
+    const pad = '    '.repeat(depth)
+    const path = pathExpr(parts)
+    const types = typesOf(schema, name)
+    if (types.length === 1 && types[0] === 'object') {
+      return [`${pad}yield from ${this.objectFunction(schema, name)}(${value}, ${path})`]
+    }
+    if (types.length === 1 && types[0] === 'array') {
+      checkKeywords(schema, ARRAY_KEYWORDS, name)
+      const item = `item${depth}`
+      const index = `index${depth}`
+      const lines = [
+        `${pad}if not isinstance(${value}, list):`,
+        `${pad}    yield ${path}, f"{${value}!r} is not of type 'array'"`,
+      ]
+      if (schema.items !== undefined) {
+        lines.push(`${pad}else:`)
+        lines.push(`${pad}    for ${index}, ${item} in enumerate(${value}):`)
+        lines.push(
+          ...this.node(schema.items as Schema, item, [...parts, index], `${name}_item`, depth + 2),
+        )
+      }
+      return lines
+    }
+
+    checkKeywords(schema, LEAF_KEYWORDS, name)
+    const lines: string[] = []
+    for (const keyword of Object.keys(schema)) {
+      if (keyword === 'type') {
+        const tests = types.map((type) => TYPE_CHECKS[type](value))
+        const test =
+          tests.length === 1
+            ? tests[0]
+            : tests.map((t) => (t.includes(' and ') ? `(${t})` : t)).join(' or ')
+        const expected = types.map(pyStr).join(', ')
+        const compound = tests.length > 1 || test.includes(' and ')
+        lines.push(`${pad}if not ${compound ? `(${test})` : test}:`)
+        lines.push(`${pad}    yield ${path}, f"{${value}!r} is not of type ${expected}"`)
+      } else if (keyword === 'enum') {
+        const members = (schema.enum as unknown[]).map(pyStr)
+        const constant = `_ENUM_${name.toUpperCase()}`
+        this.constants.push(`${constant} = ${pySet(members)}`)
+        lines.push(`${pad}if not (isinstance(${value}, str) and ${value} in ${constant}):`)
+        lines.push(`${pad}    yield ${path}, f"{${value}!r} is not one of [${members.join(', ')}]"`)
+      }
+    }
+    return lines
+  }
+
+  render(header: string, root: string): string {
+    const body = this.functions.map((lines) => lines.join('\n')).join('\n\n\n')
+    return `${header}
+
+${this.constants.join('\n')}
+
+
+def _additional_properties(extras):
+    extras = sorted(extras, key=str)
+    verb = "was" if len(extras) == 1 else "were"
+    return f"Additional properties are not allowed ({', '.join(repr(each) for each in extras)} {verb} unexpected)"
+
+
+${body}
+
+
+def iter_errors(instance):
+    """Yield \`\`(path, message)\`\` per violation, sorted by path as the pipeline sorts Draft7Validator errors."""
+    return ${root}(instance, ())
+
+
+def first_error(instance):
+    """The first \`\`(path, message)\`\` from \`\`iter_errors\`\`, or None; stops at the first violation."""
+    return next(${root}(instance, ()), None)
+`
+  }
+}
+
+export function buildPythonValidator(jsonSchema: Schema, sourceFile: string): string {
+  const ref = jsonSchema.$ref as string
+  const match = /^#\/definitions\/(\w+)$/.exec(ref ?? '')
+  if (!match) throw new Error(`expected a top-level $ref into definitions, got ${JSON.stringify(ref)}`)
+  const definitionName = match[1]
+  const definition = (jsonSchema.definitions as Record<string, Schema>)[definitionName]
+
+  const emitter = new Emitter()
+  const root = emitter.objectFunction(definition, snake(definitionName))
+  const header = `# AUTO-GENERATED by schemas/build-schemas.ts from schemas/${sourceFile}. Do not edit manually.
+"""Specialized validator for the ${definitionName} schema.
+
+Same constraints and messages as jsonschema's Draft7Validator on
+${sourceFile}, unrolled into plain type and set checks.
+"""`
+  return emitter.render(header, root)
+}